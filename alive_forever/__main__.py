@@ -0,0 +1,9 @@
+"""Allow ``python -m alive_forever`` to start the app or run its command-line tools."""
+
+import sys
+
+from alive_forever.cli import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
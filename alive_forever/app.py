@@ -1,98 +1,285 @@
 """Application entrypoint and tray runtime."""
 
-import ctypes
+import queue
 import sys
 import threading
 import time
-from datetime import datetime
+from dataclasses import fields
+from datetime import datetime, timedelta
 
 try:
-    import pystray
     from PIL import Image, ImageDraw
 except ImportError:
     import subprocess
 
     subprocess.check_call([sys.executable, "-m", "pip", "install", "pystray", "pillow"])
-    import pystray
     from PIL import Image, ImageDraw
 
-import tkinter as tk
-
-from alive_forever.core.config import load_app_config, save_app_config
-from alive_forever.core.scheduler import format_transition, get_next_transition, is_schedule_active
-from alive_forever.system.windows import (
-    APP_NAME,
-    LOG_DIR,
-    MUTEX_NAME,
-    ROOT_DIR,
-    SingleInstance,
-    build_startup_command,
-    is_startup_enabled,
-    set_startup_enabled,
-    setup_logging,
-    show_message_box,
+from alive_forever.core.clock import ClockJumpDetector, SystemClock
+from alive_forever.core.config import VALID_ACTIVITY_TYPES, RuntimeStats, load_app_state, save_app_config
+from alive_forever.core.notifications import NotificationDispatcher, parse_quiet_hours
+from alive_forever.core.profiles import ProfileLibrary
+from alive_forever.core.profiling import ProfilingSession
+from alive_forever.core.scheduler import (
+    compile_schedule,
+    format_duration,
+    format_transition,
+    get_next_transition,
+    is_schedule_active,
+    parse_time_string,
+    seconds_until,
+    wall_clock,
 )
-from alive_forever.ui.settings import ModernStyle, SettingsWindow
+from alive_forever.core.targets import TargetProcessGate
+from alive_forever.core.watchdog import ActivityWatchdog
+from alive_forever.system.host import APP_NAME, LOG_DIR, MUTEX_NAME, PROFILES_DIR, ROOT_DIR, get_host_platform, setup_logging
+from alive_forever.system.logs import LOG_FILE_NAME, ROUTINE_ACTIVITY, set_activity_summary
+from alive_forever.system.metrics import MetricsSnapshot, MetricsTextfileExporter
+from alive_forever.system.presence import AWAY_STATUSES, PresenceVerifier, regex_presence_parser
+from alive_forever.ui.style import ModernStyle
 
 
 LOGGER = setup_logging()
 
 
 class KeepAliveApp:
-    def __init__(self):
-        self.logger = LOGGER
-        self.config = load_app_config(self.logger)
-        self.manual_paused = False
+    TICK_SECONDS = 1
+    PROFILE_MINUTES = 5
+    RUNTIME_STATES = ("active", "scheduled_off", "manual_paused", "no_target", "loop_failed")
+    PAUSE_PRESETS_MINUTES = (15, 30, 60, 120)
+    # Config fields that move the next activity deadline, and those shown in the tray status.
+    CADENCE_FIELDS = ("interval", "schedule")
+    STATUS_FIELDS = ("interval", "activity_type", "schedule", "target_processes")
+    # Seconds after the settings window closes before the Tk interpreter is destroyed; None keeps it.
+    TK_IDLE_TEARDOWN_SECONDS = 300
+
+    def __init__(self, config=None, clock=None, input_backend=None, logger=None, profiles=None, stats=None, process_enumerator=None):
+        self.logger = logger or LOGGER
+        self.clock = clock or SystemClock()
+        if config is None:
+            config, loaded_stats = load_app_state(self.logger)
+            stats = stats or loaded_stats
+        # Configs are immutable snapshots: publishing one is a single reference swap, never a partial update.
+        self.config = config
+        self.stats = stats or RuntimeStats()
+        self.host = get_host_platform()
+        self.input_backend = input_backend or self.host.create_input_backend()
+        self.profiles = profiles or ProfileLibrary(PROFILES_DIR, self.logger)
+        self.targets = TargetProcessGate(process_enumerator or self.host.create_process_enumerator(), self.clock, self.logger)
+        self.targets.set_targets(self.config.target_processes)
+        # A timed pause saved before a restart still holds until it expires.
+        pause_until = self.stats.pause_until
+        self.manual_paused = pause_until is not None and seconds_until(pause_until, self.now_provider()) > 0
+        if not self.manual_paused:
+            self.stats.pause_until = None
         self.shutdown_event = threading.Event()
         self.thread = None
+        self.watchdog_thread = None
         self.icon = None
         self.root = None
         self.settings_window = None
-        self.instance = SingleInstance(MUTEX_NAME)
+        # Tk work waits here until the main thread has an interpreter to run it on.
+        self._ui_requests = queue.Queue()
+        self._ui_lock = threading.Lock()
+        self._ui_pending = 0
+        self._serving_ui = False
+        self._tk_teardown_job = None
+        self.instance = self.host.create_instance_lock(MUTEX_NAME)
 
-        self.activity_count = 0
         self.start_time = None
+        self.next_run = None
+        self.cadence_anchor = None
+        self.last_heartbeat = None
+        self._cadence = None
+        # Guards next_run between the activity loop and config applies from the UI thread.
+        self._deadline_lock = threading.Lock()
+        # Bumped when a config apply or clock jump moves the deadline, so a tick in flight knows its result is stale.
+        self._deadline_version = 0
+        self._loop_generation = 0
+        self.clock_jumps = ClockJumpDetector(self.clock)
+        self.last_clock_jump = None
+        self.watchdog = ActivityWatchdog(self)
+        set_activity_summary(self.logger, not self.config.verbose_activity_log)
         self._last_status = None
+        self._icon_cache = {}
         self._shutdown_complete = False
+        self.profiler = None
+        self.metrics = self._build_metrics_exporter(self.config)
+        self.presence = self._build_presence_verifier(self.config)
+        self.notifier = NotificationDispatcher(
+            self._show_notification, self.clock, self.logger, parse_quiet_hours(self.config.quiet_hours), now_provider=self.quiet_hours_now
+        )
 
     def now_provider(self):
-        return datetime.now()
+        return self.clock.now()
+
+    def quiet_hours_now(self):
+        """Quiet hours are wall-clock times in the schedule's time zone, like its windows."""
+        return wall_clock(self.config.schedule, self.now_provider())
 
     def apply_config(self, config):
+        """Publish ``config`` and do only the runtime work its changed fields call for; return their names."""
+        previous = self.config
+        changed = {item.name for item in fields(config) if getattr(config, item.name) != getattr(previous, item.name)}
+        if not changed:
+            return changed
+
         self.config = config
-        save_app_config(self.config, self.logger)
-        self.refresh_runtime_state(notify=False)
+        if "metrics_textfile_dir" in changed:
+            self.metrics = self._build_metrics_exporter(config)
+        if "verbose_activity_log" in changed:
+            set_activity_summary(self.logger, not config.verbose_activity_log)
+        if changed.intersection(("presence_log_path", "presence_pattern")):
+            self.presence = self._build_presence_verifier(config)
+        if "target_processes" in changed:
+            self.targets.set_targets(config.target_processes)
+        if "quiet_hours" in changed:
+            self.notifier.quiet_hours = parse_quiet_hours(config.quiet_hours)
+        if "schedule" in changed:
+            transition = get_next_transition(config.schedule, now=self.now_provider())
+            self.logger.info("Schedule changed. %s", format_transition(transition) or "No upcoming transition.")
+        if changed.intersection(self.CADENCE_FIELDS):
+            self.reanchor_cadence()
+        if changed.intersection(self.STATUS_FIELDS):
+            self.refresh_runtime_state(notify=False)
+        self.save_config()
+        return changed
+
+    def reanchor_cadence(self):
+        """Count the pending deadline from the last activity under the interval now in effect.
+
+        Without this, raising the interval would still fire at the old, earlier deadline.
+        """
+        with self._deadline_lock:
+            if self.cadence_anchor is None or self.next_run is None:
+                return
+            self._deadline_version += 1
+            self.next_run = self.cadence_anchor + self.effective_cadence()[0]
+
+    def switch_profile(self, name):
+        profile = self.profiles.get(name)
+        if profile is None:
+            self.logger.warning("Profile %s is not available", name)
+            return False
+        self.logger.info("Switching to profile %s", name)
+        self.apply_config(profile.apply_to(self.config))
+        return True
+
+    def _profile_menu_items(self):
+        import pystray
+
+        def make_item(name):
+            return pystray.MenuItem(
+                name,
+                lambda icon, item: self.switch_profile(name),
+                checked=lambda item: self.config.profile_name == name,
+                radio=True,
+            )
+
+        return [make_item(name) for name in self.profiles.names() if name != "Custom"]
 
     def save_config(self):
-        save_app_config(self.config, self.logger)
+        save_app_config(self.config, self.logger, self.stats)
 
     def is_startup_enabled(self):
-        return is_startup_enabled()
+        return self.host.is_startup_enabled()
 
     def set_startup_enabled(self, enabled):
         script_path = ROOT_DIR / "keep_alive.py"
-        set_startup_enabled(enabled, build_startup_command(script_path), self.logger)
+        self.host.set_startup_enabled(enabled, self.host.build_startup_command(script_path), self.logger)
 
     def get_runtime_state(self, now=None):
-        if self.manual_paused:
+        now = now or self.now_provider()
+        if self.is_activity_loop_failed():
+            return "loop_failed"
+        if self.manual_paused and (self.stats.pause_until is None or seconds_until(self.stats.pause_until, now) > 0):
             return "manual_paused"
-        return "active" if is_schedule_active(self.config.schedule, now=now or self.now_provider()) else "scheduled_off"
+        if not is_schedule_active(self.config.schedule, now=now):
+            return "scheduled_off"
+        return "no_target" if self.targets.is_missing() else "active"
+
+    def is_activity_loop_failed(self):
+        """True once the watchdog gave up on a stalled loop, or while a started loop thread is dead."""
+        if self.watchdog.gave_up:
+            return True
+        return self.thread is not None and not self.thread.is_alive() and not self.shutdown_event.is_set()
+
+    def pause_seconds_remaining(self, now=None):
+        """Seconds left in a timed pause, or None when there is none (or it has expired)."""
+        pause_until = self.stats.pause_until if self.manual_paused else None
+        if pause_until is None:
+            return None
+        remaining = seconds_until(pause_until, now or self.now_provider())
+        return remaining if remaining > 0 else None
+
+    def effective_cadence(self, now=None):
+        """Return ``(interval, activity_type, until)`` for the windows active at ``now``.
+
+        The latest-starting active window that sets a field wins; otherwise the app-wide
+        value applies. The result is cached with its config snapshot from the time it was
+        worked out until the next window boundary, so ticks inside one segment never scan the
+        schedule, and a wall clock set back before that time asks again.
+        """
+        config = self.config
+        now = now or self.now_provider()
+        cached = self._cadence
+        if (
+            cached is not None
+            and cached[0] is config
+            and seconds_until(cached[1], now) <= 0
+            and (cached[2] is None or seconds_until(cached[2], now) > 0)
+        ):
+            return cached[3]
+
+        windows, until = compile_schedule(config.schedule).active_segment(now)
+        interval = next((window.interval for window in reversed(windows) if window.interval), config.interval)
+        activity_type = next(
+            (window.activity_type for window in reversed(windows) if window.activity_type in VALID_ACTIVITY_TYPES),
+            config.activity_type,
+        )
+        cadence = (interval, activity_type, until)
+        self._cadence = (config, now, until, cadence)
+        return cadence
 
     def get_status_presentation(self):
         state = self.get_runtime_state()
         transition = format_transition(get_next_transition(self.config.schedule, now=self.now_provider()))
 
+        if state == "loop_failed":
+            if self.watchdog.gave_up:
+                detail = "The activity loop stopped responding and {0} restarts did not help; no activity is being sent. Restart Alive Forever.".format(
+                    self.watchdog.consecutive_restarts
+                )
+            else:
+                detail = "The activity loop stopped; it is restarted within {0} seconds.".format(self.watchdog.check_interval)
+            return "Activity Stopped", ModernStyle.WARNING, detail
         if state == "manual_paused":
-            return "Manually Paused", ModernStyle.TEXT_DIM, "Presence activity is paused until you resume it."
+            remaining = self.pause_seconds_remaining()
+            if remaining is None:
+                return "Manually Paused", ModernStyle.TEXT_DIM, "Presence activity is paused until you resume it."
+            return (
+                "Paused ({0} left)".format(format_duration(remaining)),
+                ModernStyle.TEXT_DIM,
+                "Presence activity resumes at {0}.".format(self.stats.pause_until.astimezone().strftime("%a %H:%M")),
+            )
         if state == "scheduled_off":
             detail = "Outside the scheduled active windows."
             if transition:
                 detail = "{0} {1}".format(detail, transition)
             return "Scheduled Off", ModernStyle.WARNING, detail
+        if state == "no_target":
+            detail = "None of {0} is running; activity resumes when one starts.".format(", ".join(self.config.target_processes))
+            if transition:
+                detail = "{0} {1}".format(detail, transition)
+            return "Waiting for Target", ModernStyle.TEXT_DIM, detail
 
-        detail = "Simulating activity every {0} seconds using {1}.".format(self.config.interval, self.config.activity_type)
+        interval, activity_type, _ = self.effective_cadence()
+        detail = "Simulating activity every {0} seconds using {1}.".format(interval, activity_type)
         if transition:
             detail = "{0} {1}".format(detail, transition)
+        incident = self.watchdog.describe_incident()
+        if incident:
+            return "Active (Recovered)", ModernStyle.SUCCESS, "{0} {1}".format(detail, incident)
         return "Active", ModernStyle.SUCCESS, detail
 
     def get_tray_title(self):
@@ -101,13 +288,22 @@ class KeepAliveApp:
         suffix = " | {0}".format(transition) if transition else ""
         return "{0} - {1}{2}".format(APP_NAME, status_name, suffix)
 
-    def notify(self, message, title=None):
+    def notify(self, message, title=None, kind=None):
+        """Queue a tray notification; messages of the same ``kind`` coalesce while they wait."""
         if not self.config.notifications_enabled or not self.icon:
             return
-        try:
-            self.icon.notify(message, title or APP_NAME)
-        except Exception:
-            self.logger.debug("Tray notification not available", exc_info=True)
+        self.notifier.submit(title or APP_NAME, message, kind)
+
+    def _show_notification(self, title, message):
+        if self.icon:
+            self.icon.notify(message, title)
+
+    def get_icon_image(self, state):
+        image = self._icon_cache.get(state)
+        if image is None:
+            image = self.create_icon_image(state)
+            self._icon_cache[state] = image
+        return image
 
     def create_icon_image(self, state):
         size = 64
@@ -124,6 +320,8 @@ class KeepAliveApp:
             "active": (0, 128, 0, 255),
             "scheduled_off": (128, 0, 0, 255),
             "manual_paused": (96, 96, 96, 255),
+            "no_target": (128, 128, 0, 255),
+            "loop_failed": (255, 0, 0, 255),
         }
 
         outer = (8, 8, 56, 56)
@@ -143,6 +341,12 @@ class KeepAliveApp:
             draw.ellipse((23, 26, 41, 40), outline=light, width=2)
             draw.line([(32, 33), (32, 29)], fill=light, width=2)
             draw.line([(32, 33), (36, 35)], fill=light, width=2)
+        elif state == "no_target":
+            draw.line([(25, 27), (39, 39)], fill=light, width=3)
+            draw.line([(25, 39), (39, 27)], fill=light, width=3)
+        elif state == "loop_failed":
+            draw.rectangle((30, 26, 33, 35), fill=light)
+            draw.rectangle((30, 37, 33, 40), fill=light)
         else:
             draw.rectangle((25, 27, 29, 39), fill=light)
             draw.rectangle((34, 27, 38, 39), fill=light)
@@ -157,14 +361,21 @@ class KeepAliveApp:
         if not self.icon:
             return
         state = self.get_runtime_state()
-        self.icon.icon = self.create_icon_image(state)
-        self.icon.title = self.get_tray_title()
+        image = self.get_icon_image(state)
+        if self.icon.icon is not image:
+            self.icon.icon = image
+        title = self.get_tray_title()
+        if self.icon.title != title:
+            self.icon.title = title
         try:
             self.icon.update_menu()
         except Exception:
             self.logger.debug("Could not refresh tray menu", exc_info=True)
 
     def refresh_runtime_state(self, notify=True):
+        if self.manual_paused and self.stats.pause_until is not None and self.pause_seconds_remaining() is None:
+            self.logger.info("Timed pause ended")
+            self._set_pause(False)
         state = self.get_runtime_state()
         if state == self._last_status:
             self.update_icon()
@@ -175,79 +386,443 @@ class KeepAliveApp:
         self.logger.info("State changed to %s", status_name)
         self.update_icon()
         if notify and self.start_time:
-            self.notify(detail, title=status_name)
+            self.notify(detail, title=status_name, kind="state")
+        else:
+            self.notifier.remember("state", status_name)
 
-    def simulate_activity(self):
+    def simulate_activity(self, activity_type=None):
+        activity_type = activity_type or self.config.activity_type
         try:
-            if self.config.activity_type in ("F15 Key (Recommended)", "Both"):
-                virtual_key = 0x7E
-                key_up = 0x0002
-                ctypes.windll.user32.keybd_event(virtual_key, 0, 0, 0)
-                ctypes.windll.user32.keybd_event(virtual_key, 0, key_up, 0)
-
-            if self.config.activity_type in ("Mouse Jiggle", "Both"):
-                mouse_move = 0x0001
-                ctypes.windll.user32.mouse_event(mouse_move, 1, 0, 0, 0)
-                time.sleep(0.05)
-                ctypes.windll.user32.mouse_event(mouse_move, -1, 0, 0, 0)
-
-            self.activity_count += 1
-            self.config.lifetime_activity_count += 1
-            self.config.last_activity_at = self.now_provider()
-            self.logger.info("Simulated activity #%s using %s", self.config.lifetime_activity_count, self.config.activity_type)
+            self.input_backend.send_activity(activity_type)
+            lifetime_count = self.stats.record_activity(self.now_provider())
+            self.logger.info(
+                "Simulated activity #%s using %s",
+                lifetime_count,
+                activity_type,
+                extra=ROUTINE_ACTIVITY,
+            )
             return True
         except Exception:
+            self.stats.record_failure()
             self.logger.exception("Activity simulation failed")
             return False
 
-    def activity_loop(self):
-        next_run = time.monotonic()
-        self.refresh_runtime_state(notify=False)
+    def _build_metrics_exporter(self, config):
+        if not config.metrics_textfile_dir:
+            return None
+        return MetricsTextfileExporter(config.metrics_textfile_dir, self.RUNTIME_STATES, self.clock)
+
+    def _build_presence_verifier(self, config):
+        if not config.presence_log_path:
+            return None
+        return PresenceVerifier(config.presence_log_path, self.clock, self.logger, regex_presence_parser(config.presence_pattern))
+
+    def check_presence(self, now_monotonic=None):
+        """Read new presence changes from the Teams log and alert when it shows Away despite our activity."""
+        verifier = self.presence
+        if verifier is None:
+            return
+        for change in verifier.poll(now_monotonic):
+            self.logger.info("Teams presence changed to %s", change.status)
+            if change.status not in AWAY_STATUSES or self.get_runtime_state() != "active":
+                continue
+            last_activity_at = self.stats.last_activity_at
+            if last_activity_at is None or (self.now_provider() - last_activity_at).total_seconds() > 2 * self.effective_cadence()[0]:
+                continue
+            message = "Teams shows you as {0} although activity was sent at {1}.".format(change.status, last_activity_at.strftime("%H:%M:%S"))
+            self.logger.warning("%s", message)
+            self.notify(message, title="Presence Not Kept", kind="presence")
+
+    def describe_presence(self, now_monotonic=None):
+        """Return the Teams presence line for the settings panel, or None when verification is off."""
+        verifier = self.presence
+        if verifier is None:
+            return None
+        if verifier.status is None:
+            return "Teams presence: not seen yet"
+        lag = verifier.lag_seconds(now_monotonic)
+        if lag is None:
+            return "Teams presence: {0} (logged before start)".format(verifier.status)
+        age = "{0:.0f} s".format(lag) if lag < 60 else format_duration(lag)
+        return "Teams presence: {0} (confirmed {1} ago)".format(verifier.status, age)
+
+    def export_metrics(self, tick_seconds):
+        exporter = self.metrics
+        if exporter is None:
+            return
+        exporter.record_tick(tick_seconds)
+        transition = get_next_transition(self.config.schedule, now=self.now_provider())
+        snapshot = MetricsSnapshot(
+            self.get_runtime_state(),
+            self.stats.session_activity_count,
+            self.stats.lifetime_activity_count,
+            self.stats.skipped_activity_count,
+            self.stats.failed_activity_count,
+            transition[1].timestamp() if transition else None,
+            self.start_time.timestamp() if self.start_time else None,
+        )
+        try:
+            exporter.export(snapshot)
+        except OSError:
+            self.logger.debug("Could not write metrics to %s", exporter.path, exc_info=True)
+
+    def activity_loop(self, generation=0):
+        try:
+            self.heartbeat()
+            if self.next_run is None:
+                self.next_run = self.clock.monotonic()
+            self.clock_jumps.reset()
+            self.refresh_runtime_state(notify=False)
+
+            while not self.shutdown_event.is_set() and generation == self._loop_generation:
+                if self.profiler is not None:
+                    self.profiler.attach_current_thread("activity")
+                self.run_loop_iteration(generation, self.TICK_SECONDS)
+                self.clock.wait(self.shutdown_event, self.TICK_SECONDS)
+        except Exception:
+            self.logger.exception("Activity loop crashed")
+
+    def run_loop_iteration(self, generation=None, expected_elapsed=None):
+        """Run the body of one activity loop pass; ``AppSimulator`` calls it too."""
+        self.check_clock_jump(expected_elapsed)
+        tick_started = time.perf_counter()
+        self.run_activity_tick(generation)
+        self.heartbeat()
+        self.export_metrics(time.perf_counter() - tick_started)
+
+    def check_clock_jump(self, expected_elapsed=None):
+        jump = self.clock_jumps.check(expected_elapsed)
+        if jump is not None:
+            self.handle_clock_jump(jump)
+        return jump
+
+    def handle_clock_jump(self, jump):
+        """Resync after sleep or a clock change instead of waiting out the old deadline."""
+        self.last_clock_jump = (jump, self.now_provider())
+        if jump.kind == "suspend":
+            self.logger.warning("Resumed after the app was suspended for %.0f seconds; resyncing", jump.seconds)
+        else:
+            self.logger.warning("Wall clock moved %+.0f seconds against the monotonic clock; resyncing", jump.seconds)
+
+        # Cadence runs on the monotonic clock, so a backwards wall jump leaves next_run alone.
+        if jump.kind == "suspend" or jump.seconds > 0:
+            current_time = self.clock.monotonic()
+            with self._deadline_lock:
+                self._deadline_version += 1
+                if self.config.resume_catch_up == "Immediately":
+                    self.next_run = current_time
+                else:
+                    self.cadence_anchor = current_time
+                    self.next_run = current_time + self.effective_cadence()[0]
+        self.refresh_runtime_state()
+
+    def heartbeat(self):
+        self.last_heartbeat = self.clock.monotonic()
 
-        while not self.shutdown_event.is_set():
-            next_run = self.process_activity_tick(next_run)
-            self.shutdown_event.wait(1)
+    def is_activity_thread_alive(self):
+        return bool(self.thread and self.thread.is_alive())
+
+    def activity_loop_generation(self):
+        return self._loop_generation
+
+    def start_activity_thread(self):
+        self._loop_generation += 1
+        self.heartbeat()
+        self.thread = threading.Thread(target=self.activity_loop, args=(self._loop_generation,), daemon=True)
+        self.thread.start()
+
+    def restart_activity_loop(self, reason, stall_seconds):
+        # A hung thread sees the bumped generation when it wakes up and exits on its own.
+        self.start_activity_thread()
+        self.update_icon()
+        self.notify(
+            "The activity loop {0} for {1:.0f} seconds and was restarted.".format(reason, stall_seconds),
+            title="Activity Recovered",
+        )
+
+    def activity_due_at(self, next_run, interval):
+        """Return the monotonic deadline for the next activity under the cadence ``interval``.
+
+        ``next_run`` was set with the interval in effect at the last activity; when a
+        tighter window starts, the new interval counted from ``cadence_anchor`` (the last
+        activity, or a resume) takes over.
+        """
+        if self.cadence_anchor is None:
+            return next_run
+        return min(next_run, self.cadence_anchor + interval)
+
+    def seconds_until_next_deadline(self, next_run, now_monotonic=None):
+        current_time = self.clock.monotonic() if now_monotonic is None else now_monotonic
+        delays = []
+        now = self.now_provider()
+        state = self.get_runtime_state(now)
+        if state == "active":
+            interval, _, until = self.effective_cadence(now)
+            delays.append(self.activity_due_at(next_run, interval) - current_time)
+            if until is not None:
+                delays.append(seconds_until(until, now))
+        elif state == "no_target":
+            delays.append(self.targets.seconds_until_stale(current_time))
+
+        transition = get_next_transition(self.config.schedule, now=now)
+        if transition:
+            delays.append(seconds_until(transition[1], now))
+        pause_remaining = self.pause_seconds_remaining(now)
+        if pause_remaining is not None:
+            delays.append(pause_remaining)
+
+        if not delays:
+            return None
+        return max(0.0, min(delays))
+
+    def run_activity_tick(self, generation=None):
+        """Run one tick outside the deadline lock, then publish the deadline it computed.
+
+        Input injection, presence checks and process listing can stall, so the lock only
+        covers reading and writing ``next_run``. A tick from a loop the watchdog has since
+        replaced publishes nothing, and one that overlapped a config apply counts the
+        deadline again from the last activity.
+        """
+        with self._deadline_lock:
+            next_run, version = self.next_run, self._deadline_version
+        next_run = self.process_activity_tick(next_run)
+        with self._deadline_lock:
+            if generation is not None and generation != self._loop_generation:
+                return
+            if version != self._deadline_version and self.cadence_anchor is not None:
+                next_run = self.cadence_anchor + self.effective_cadence()[0]
+            self.next_run = next_run
+
+    def refresh_targets(self, next_run, current_time):
+        """Enumerate processes again only on a deadline: the next activity, or a stale answer while waiting for a target."""
+        if not self.targets.is_stale(current_time):
+            return
+        state = self.get_runtime_state()
+        if state == "no_target" or (state == "active" and current_time >= self.activity_due_at(next_run, self.effective_cadence()[0])):
+            self.targets.refresh(current_time)
 
     def process_activity_tick(self, next_run, now_monotonic=None):
-        current_time = time.monotonic() if now_monotonic is None else now_monotonic
+        current_time = self.clock.monotonic() if now_monotonic is None else now_monotonic
+        self.refresh_targets(next_run, current_time)
         current_state = self.get_runtime_state()
         self.refresh_runtime_state()
+        self.check_presence(current_time)
 
         if current_state != "active":
             return current_time
 
-        if current_time < next_run:
+        interval, activity_type, _ = self.effective_cadence()
+        if current_time < self.activity_due_at(next_run, interval):
             return next_run
 
         if self.get_runtime_state() != "active":
+            self.stats.record_skipped()
             return current_time
 
-        self.simulate_activity()
-        return current_time + self.config.interval
+        if self.presence is not None and self.presence.is_confirmed_present(current_time):
+            # Teams already counts the user as present, so this activity would add nothing.
+            self.stats.record_skipped()
+            self.cadence_anchor = current_time
+            return current_time + interval
+
+        self.simulate_activity(activity_type)
+        self.cadence_anchor = current_time
+        return current_time + interval
+
+    def start_profiling(self, minutes=PROFILE_MINUTES):
+        if self.profiler is not None and self.profiler.is_running:
+            return self.profiler
+
+        self.profiler = ProfilingSession(LOG_DIR, minutes * 60, self.clock, on_finished=self._on_profiling_finished).start()
+        self.logger.info("Profiling started for %s minute(s)", minutes)
+        with self._ui_lock:
+            if self.root:
+                self.root.after(0, self._profile_tk_thread)
+        self.update_icon()
+        return self.profiler
 
-    def toggle_state(self, icon=None, item=None):
-        self.manual_paused = not self.manual_paused
-        self.logger.info("Manual pause toggled: %s", self.manual_paused)
+    def stop_profiling(self):
+        if self.profiler is not None:
+            self.profiler.stop()
+
+    def toggle_profiling(self, icon=None, item=None):
+        if self.profiler is not None and self.profiler.is_running:
+            self.stop_profiling()
+        else:
+            self.start_profiling()
+
+    def _profile_tk_thread(self):
+        session = self.profiler
+        if session is not None and session.attach_current_thread("tk") and self.root:
+            self.root.after(self.TICK_SECONDS * 1000, self._profile_tk_thread)
+
+    def _on_profiling_finished(self, session):
+        if self.profiler is session:
+            self.profiler = None
+        self.logger.info("Profiling finished: %s", ", ".join(str(path) for path in session.output_files))
+        self.notify("Profile saved to {0}".format(session.output_dir), title="Profiling Finished")
+        self.update_icon()
+
+    def _set_pause(self, paused, until=None):
+        was_timed = self.stats.pause_until is not None
+        self.manual_paused = paused
+        self.stats.pause_until = until.astimezone() if paused and until is not None else None
+        # Only timed pauses outlive a restart, so open-ended ones need no write.
+        if was_timed or self.stats.pause_until is not None:
+            try:
+                self.save_config()
+            except Exception:
+                self.logger.exception("Could not save the pause state")
+
+    def pause(self, until=None):
+        """Pause activity until the wall-clock moment ``until``, or until resumed when it is None."""
+        self._set_pause(True, until)
+        if until is None:
+            self.logger.info("Manual pause toggled: True")
+        else:
+            self.logger.info("Paused until %s", self.stats.pause_until.isoformat(timespec="minutes"))
         self.refresh_runtime_state()
 
+    def pause_for(self, minutes):
+        self.pause(self.now_provider().astimezone() + timedelta(minutes=minutes))
+
+    def pause_until_clock_time(self, value):
+        """Pause until the next occurrence of the local ``HH:MM`` time ``value``."""
+        now = self.now_provider().astimezone()
+        until = datetime.combine(now.date(), parse_time_string(value)).astimezone()
+        if until <= now:
+            until = datetime.combine(now.date() + timedelta(days=1), parse_time_string(value)).astimezone()
+        self.pause(until)
+
+    def pause_until_next_transition(self, icon=None, item=None):
+        transition = get_next_transition(self.config.schedule, now=self.now_provider())
+        if not transition:
+            return False
+        self.pause(transition[1])
+        return True
+
+    def resume(self):
+        self._set_pause(False)
+        self.logger.info("Manual pause toggled: False")
+        self.refresh_runtime_state()
+
+    def toggle_state(self, icon=None, item=None):
+        if self.get_runtime_state() == "manual_paused":
+            self.resume()
+        else:
+            self.pause()
+
+    def _pause_menu_items(self):
+        import pystray
+
+        def make_item(minutes):
+            return pystray.MenuItem("For {0}".format(format_duration(minutes * 60)), lambda icon, item: self.pause_for(minutes))
+
+        items = [make_item(minutes) for minutes in self.PAUSE_PRESETS_MINUTES]
+        items.append(
+            pystray.MenuItem(
+                "Until Next Schedule Change",
+                self.pause_until_next_transition,
+                enabled=lambda item: get_next_transition(self.config.schedule, now=self.now_provider()) is not None,
+            )
+        )
+        return items
+
     def open_settings(self, icon=None, item=None):
-        if self.root:
-            self.root.after(0, self._show_settings_window)
+        if not self._serving_ui:
+            self._show_settings_window()
             return
-        self._show_settings_window()
+        self._call_in_tk(self._show_settings_window)
+
+    def _call_in_tk(self, callback):
+        """Run ``callback`` on the Tk thread, asking the main thread to start Tk if it is not running."""
+        with self._ui_lock:
+            root = self.root
+            if root is None:
+                self._ui_requests.put(callback)
+                return
+            # A pending callback keeps the interpreter from being torn down under it.
+            self._ui_pending += 1
+
+        def run_pending():
+            with self._ui_lock:
+                self._ui_pending -= 1
+            callback()
+
+        root.after(0, run_pending)
 
     def _show_settings_window(self):
         if self.settings_window is None:
-            self.settings_window = SettingsWindow(self)
+            from alive_forever.ui.settings import SettingsWindow
+
+            self.settings_window = SettingsWindow(self, on_close=self._schedule_tk_teardown)
         self.settings_window.show()
 
-    def quit_app(self, icon=None, item=None):
-        self.shutdown()
-        if self.root:
+    def _serve_ui_requests(self):
+        """Block the main thread until Tk is needed, then run a Tk main loop until it is torn down."""
+        try:
+            while not self.shutdown_event.is_set():
+                callback = self._ui_requests.get()
+                if callback is None:
+                    break
+                self._run_tk(callback)
+        finally:
+            self._serving_ui = False
+
+    def _run_tk(self, callback):
+        import tkinter as tk
+
+        root = tk.Tk()
+        root.withdraw()
+        with self._ui_lock:
+            self.root = root
+        self.logger.info("Tk interpreter started")
+        root.after(0, callback)
+        if self.profiler is not None and self.profiler.is_running:
+            root.after(0, self._profile_tk_thread)
+        try:
+            root.mainloop()
+        finally:
+            with self._ui_lock:
+                self.root = None
+            # Dropping the settings window releases its Tk variables, which hold the interpreter.
+            self.settings_window = None
+            self._tk_teardown_job = None
             try:
-                self.root.after(0, self.root.quit)
-            except Exception:
+                root.destroy()
+            except tk.TclError:
                 pass
+            self.logger.info("Tk interpreter stopped")
+
+    def _schedule_tk_teardown(self):
+        if self.TK_IDLE_TEARDOWN_SECONDS is None or self.root is None:
+            return
+        if self._tk_teardown_job is not None:
+            self.root.after_cancel(self._tk_teardown_job)
+        self._tk_teardown_job = self.root.after(int(self.TK_IDLE_TEARDOWN_SECONDS * 1000), self._teardown_tk_if_idle)
+
+    def _teardown_tk_if_idle(self):
+        self._tk_teardown_job = None
+        if self.profiler is not None and self.profiler.is_running:
+            # A profiling session checks in from this thread until it ends.
+            self._schedule_tk_teardown()
+            return
+        with self._ui_lock:
+            if self.root is None or self._ui_pending or (self.settings_window is not None and self.settings_window.is_open):
+                return
+            root = self.root
+            # From here new requests queue for the main thread, which starts a fresh interpreter.
+            self.root = None
+        root.quit()
+
+    def quit_app(self, icon=None, item=None):
+        self.shutdown()
+        with self._ui_lock:
+            if self.root:
+                try:
+                    self.root.after(0, self.root.quit)
+                except Exception:
+                    pass
 
     def shutdown(self):
         if self._shutdown_complete:
@@ -256,8 +831,13 @@ class KeepAliveApp:
 
         self.logger.info("Shutting down application")
         self.shutdown_event.set()
+        self.notifier.stop()
+        self._ui_requests.put(None)
         if self.thread and self.thread.is_alive() and self.thread is not threading.current_thread():
             self.thread.join(timeout=2)
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.finish_overdue(force=True)
 
         try:
             self.save_config()
@@ -272,28 +852,44 @@ class KeepAliveApp:
 
         self.instance.release()
 
-    def run(self):
+    def run(self, profile_minutes=None):
         if not self.instance.acquire():
-            show_message_box("Alive Forever is already running. Check the system tray.")
+            self.host.show_message_box("Alive Forever is already running. Check the system tray.")
             return 1
 
         self.start_time = self.now_provider()
-        self.root = tk.Tk()
-        self.root.withdraw()
+        # From now on settings open on the main thread's Tk loop, even if the tray is clicked before it starts.
+        self._serving_ui = True
 
-        self.thread = threading.Thread(target=self.activity_loop, daemon=True)
-        self.thread.start()
+        self.start_activity_thread()
+        self.watchdog_thread = threading.Thread(target=self.watchdog.run, daemon=True)
+        self.watchdog_thread.start()
+        threading.Thread(target=self.notifier.run, name="notifications", daemon=True).start()
+
+        # pystray needs a desktop session just to import on Linux, so only the tray itself loads it.
+        import pystray
 
         menu = pystray.Menu(
             pystray.MenuItem(lambda _: "Resume" if self.manual_paused else "Pause", self.toggle_state, default=True),
+            pystray.MenuItem("Pause Timer", pystray.Menu(self._pause_menu_items)),
             pystray.Menu.SEPARATOR,
+            pystray.MenuItem("Profile", pystray.Menu(self._profile_menu_items)),
             pystray.MenuItem("Settings", self.open_settings),
+            pystray.MenuItem(
+                "Diagnostics",
+                pystray.Menu(
+                    pystray.MenuItem(
+                        lambda _: "Stop Profiling" if self.profiler else "Profile for {0} Minutes".format(self.PROFILE_MINUTES),
+                        self.toggle_profiling,
+                    ),
+                ),
+            ),
             pystray.MenuItem("Quit", self.quit_app),
         )
 
         self.icon = pystray.Icon(
             "alive_forever",
-            self.create_icon_image(self.get_runtime_state()),
+            self.get_icon_image(self.get_runtime_state()),
             self.get_tray_title(),
             menu,
         )
@@ -301,24 +897,26 @@ class KeepAliveApp:
         icon_thread = threading.Thread(target=self.icon.run, daemon=True)
         icon_thread.start()
 
-        if not self.config.start_minimized:
-            self.root.after(400, self._show_settings_window)
-
         self.logger.info("Alive Forever started")
+        if profile_minutes:
+            self.start_profiling(profile_minutes)
+        # Tk is only created when settings are first opened, so an idle tray app never loads it.
+        if not self.config.start_minimized:
+            self._ui_requests.put(self._show_settings_window)
         try:
-            self.root.mainloop()
+            self._serve_ui_requests()
         finally:
             self.shutdown()
         return 0
 
 
-def main():
+def main(profile_minutes=None):
     print("=" * 50)
     print("  {0} - MS Teams Status Keeper".format(APP_NAME))
     print("=" * 50)
     print("The app runs in your system tray.")
-    print("Logs: {0}".format(LOG_DIR / "alive_forever.log"))
+    print("Logs: {0}".format(LOG_DIR / LOG_FILE_NAME))
     print("-" * 50)
 
     app = KeepAliveApp()
-    return app.run()
\ No newline at end of file
+    return app.run(profile_minutes=profile_minutes)
\ No newline at end of file
@@ -0,0 +1,226 @@
+"""Command-line entrypoint with schedule queries that run without the tray or Tk."""
+
+import argparse
+import csv
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from alive_forever.core.config import VALID_ACTIVITY_TYPES, config_from_raw
+from alive_forever.core.notifications import parse_quiet_hours
+from alive_forever.core.scheduler import (
+    MAX_INTERVAL_SECONDS,
+    MIN_INTERVAL_SECONDS,
+    TimeWindow,
+    format_transition,
+    is_schedule_active,
+    iter_transitions,
+    resolve_timezone,
+)
+from alive_forever.core.targets import parse_process_names
+from alive_forever.system.host import CONFIG_FILE
+from alive_forever.system.presence import compile_presence_pattern
+
+
+def parse_moment(value):
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("Expected an ISO date or datetime, got {0!r}".format(value))
+
+
+def read_raw_config(path):
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError("Config file not found: {0}".format(path))
+    with open(path, "r", encoding="utf-8") as handle:
+        raw_config = json.load(handle)
+    if not isinstance(raw_config, dict):
+        raise ValueError("Config file must contain a JSON object.")
+    return raw_config
+
+
+def find_config_problems(raw_config):
+    problems = []
+    interval = raw_config.get("interval", 60)
+    try:
+        number = float(interval)
+    except (TypeError, ValueError):
+        number = None
+    try:
+        seconds = int(interval)
+    except (TypeError, ValueError):
+        seconds = None
+    # ``clamp_interval`` reads the interval with ``int()``; anything that would change is refused.
+    if number is not None and seconds != number:
+        problems.append("interval: {0!r} must be a whole number of seconds".format(interval))
+    elif seconds is None or not MIN_INTERVAL_SECONDS <= seconds <= MAX_INTERVAL_SECONDS:
+        problems.append("interval: {0!r} is outside {1}-{2} seconds".format(interval, MIN_INTERVAL_SECONDS, MAX_INTERVAL_SECONDS))
+
+    activity_type = raw_config.get("activity_type", VALID_ACTIVITY_TYPES[0])
+    if activity_type not in VALID_ACTIVITY_TYPES:
+        problems.append("activity_type: {0!r} is not one of {1}".format(activity_type, ", ".join(VALID_ACTIVITY_TYPES)))
+
+    quiet_hours = raw_config.get("quiet_hours")
+    if quiet_hours is not None:
+        try:
+            if not isinstance(quiet_hours, str):
+                raise ValueError("Quiet hours must look like 22:00-07:00")
+            parse_quiet_hours(quiet_hours)
+        except ValueError as error:
+            problems.append("quiet_hours: {0}".format(error))
+
+    presence_pattern = raw_config.get("presence_pattern")
+    if presence_pattern is not None:
+        try:
+            if not isinstance(presence_pattern, str):
+                raise ValueError("Presence pattern must be a string")
+            compile_presence_pattern(presence_pattern)
+        except ValueError as error:
+            problems.append("presence_pattern: {0}".format(error))
+
+    try:
+        parse_process_names(raw_config.get("target_processes", ()))
+    except ValueError as error:
+        problems.append("target_processes: {0}".format(error))
+
+    raw_schedule = raw_config.get("schedule", {})
+    if not isinstance(raw_schedule, dict):
+        return problems + ["schedule: expected an object"]
+
+    try:
+        resolve_timezone(raw_schedule.get("timezone"))
+    except ValueError as error:
+        problems.append("schedule.timezone: {0}".format(error))
+
+    raw_windows = raw_schedule.get("windows", [])
+    if not isinstance(raw_windows, list):
+        return problems + ["schedule.windows: expected a list"]
+    for index, raw_window in enumerate(raw_windows):
+        if not isinstance(raw_window, dict):
+            problems.append("schedule.windows[{0}]: expected an object".format(index))
+            continue
+        try:
+            TimeWindow(
+                start=raw_window.get("start", "09:00"),
+                end=raw_window.get("end", "17:00"),
+                days=raw_window.get("days"),
+                interval=raw_window.get("interval"),
+                rule=raw_window.get("rule"),
+            )
+        except (TypeError, ValueError) as error:
+            problems.append("schedule.windows[{0}]: {1}".format(index, error))
+        window_activity_type = raw_window.get("activity_type")
+        if window_activity_type is not None and window_activity_type not in VALID_ACTIVITY_TYPES:
+            problems.append("schedule.windows[{0}].activity_type: {1!r} is not one of {2}".format(index, window_activity_type, ", ".join(VALID_ACTIVITY_TYPES)))
+    return problems
+
+
+def cmd_schedule_next(args, out):
+    schedule = config_from_raw(read_raw_config(args.config)).schedule
+    start = args.start or datetime.now()
+    if not schedule.enabled:
+        out.write("Schedule disabled; the app stays active.\n")
+        return 0
+
+    state = "active" if is_schedule_active(schedule, start) else "scheduled_off"
+    out.write("Now: {0}\n".format(state))
+    for index, transition in enumerate(iter_transitions(schedule, start)):
+        if index >= args.count:
+            break
+        out.write("{0}\t{1}\t{2}\n".format(transition[1].isoformat(timespec="minutes"), transition[0], format_transition(transition)))
+    return 0
+
+
+def cmd_schedule_check(args, out):
+    raw_config = read_raw_config(args.config)
+    problems = find_config_problems(raw_config)
+    for problem in problems:
+        out.write("ERROR {0}\n".format(problem))
+    if problems:
+        return 1
+
+    schedule = config_from_raw(raw_config).schedule
+    out.write(
+        "OK: schedule {0}, {1} window(s), time zone {2}\n".format(
+            "enabled" if schedule.enabled else "disabled",
+            len(schedule.windows),
+            schedule.timezone or "local",
+        )
+    )
+    return 0
+
+
+def cmd_schedule_csv(args, out):
+    schedule = config_from_raw(read_raw_config(args.config)).schedule
+    if args.end <= args.start:
+        raise ValueError("--end must be after --start.")
+
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["start", "end", "state"])
+    cursor = args.start
+    state = "active" if is_schedule_active(schedule, cursor) else "inactive"
+    for next_state, transition_at in iter_transitions(schedule, args.start, args.end):
+        if args.start.tzinfo is None and transition_at.tzinfo is not None:
+            transition_at = transition_at.astimezone().replace(tzinfo=None)
+        writer.writerow([cursor.isoformat(timespec="minutes"), transition_at.isoformat(timespec="minutes"), state])
+        cursor = transition_at
+        state = "active" if next_state == "active" else "inactive"
+    writer.writerow([cursor.isoformat(timespec="minutes"), args.end.isoformat(timespec="minutes"), state])
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="alive_forever", description="Alive Forever tray app and schedule tools.")
+    parser.add_argument(
+        "--profile",
+        type=float,
+        metavar="MINUTES",
+        help=(
+            "Start the tray app and profile it from launch for MINUTES; results are written to the log folder. "
+            "An instance that is already running refuses a second one, so profile it with Diagnostics in its tray menu."
+        ),
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    schedule_parser = commands.add_parser("schedule", help="Query a schedule without starting the app.")
+    schedule_commands = schedule_parser.add_subparsers(dest="schedule_command", required=True)
+
+    def add_config_argument(command_parser):
+        command_parser.add_argument("--config", default=str(CONFIG_FILE), help="Config file to read (default: %(default)s)")
+
+    next_parser = schedule_commands.add_parser("next", help="Print the next N schedule transitions.")
+    add_config_argument(next_parser)
+    next_parser.add_argument("-n", "--count", type=int, default=10, help="Number of transitions to print.")
+    next_parser.add_argument("--from", dest="start", type=parse_moment, help="Start from this ISO datetime instead of now.")
+    next_parser.set_defaults(handler=cmd_schedule_next)
+
+    check_parser = schedule_commands.add_parser("check", help="Validate a config file and report problems.")
+    add_config_argument(check_parser)
+    check_parser.set_defaults(handler=cmd_schedule_check)
+
+    csv_parser = schedule_commands.add_parser("csv", help="Stream active/inactive intervals for a date range as CSV.")
+    add_config_argument(csv_parser)
+    csv_parser.add_argument("--start", type=parse_moment, required=True, help="Range start (ISO date or datetime).")
+    csv_parser.add_argument("--end", type=parse_moment, required=True, help="Range end (ISO date or datetime).")
+    csv_parser.set_defaults(handler=cmd_schedule_csv)
+    return parser
+
+
+def main(argv=None, out=None):
+    out = out or sys.stdout
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        from alive_forever.app import main as run_app
+
+        return run_app(profile_minutes=args.profile)
+    if args.handler is cmd_schedule_csv and (args.start.tzinfo is None) != (args.end.tzinfo is None):
+        parser.error("--start and --end must both carry a UTC offset or both leave it out")
+
+    try:
+        return args.handler(args, out)
+    except (OSError, ValueError) as error:
+        sys.stderr.write("error: {0}\n".format(error))
+        return 2
@@ -0,0 +1,67 @@
+"""Clock abstractions shared by the runtime loop and the simulator."""
+
+import time
+from collections import namedtuple
+from datetime import datetime
+
+
+ClockJump = namedtuple("ClockJump", ["kind", "seconds"])
+CLOCK_JUMP_TOLERANCE_SECONDS = 5
+
+
+class SystemClock:
+    """Real wall and monotonic clocks backed by the operating system."""
+
+    def now(self):
+        return datetime.now()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def wall_time(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def wait(self, event, timeout):
+        return event.wait(timeout)
+
+
+class ClockJumpDetector:
+    """Notices sleep/resume and wall-clock changes between two checks of the same clock.
+
+    A step of the wall clock against the monotonic clock is reported as ``"wall"``: a
+    manual clock change, an NTP step, or a resume on systems whose monotonic clock stops
+    during sleep. A monotonic gap much longer than the caller expected is reported as
+    ``"suspend"``: the process was frozen while the monotonic clock kept running, as it
+    does across sleep on Windows. Differences within ``tolerance_seconds`` are ignored.
+    """
+
+    def __init__(self, clock, tolerance_seconds=CLOCK_JUMP_TOLERANCE_SECONDS):
+        self.clock = clock
+        self.tolerance_seconds = tolerance_seconds
+        self._offset = None
+        self._monotonic = None
+
+    def reset(self):
+        self._monotonic = self.clock.monotonic()
+        self._offset = self.clock.wall_time() - self._monotonic
+
+    def check(self, expected_elapsed=None):
+        """Return a ``ClockJump`` if the clocks moved apart since the previous check, else None."""
+        monotonic = self.clock.monotonic()
+        offset = self.clock.wall_time() - monotonic
+        previous_offset, previous_monotonic = self._offset, self._monotonic
+        self._offset, self._monotonic = offset, monotonic
+        if previous_offset is None:
+            return None
+
+        drift = offset - previous_offset
+        if abs(drift) > self.tolerance_seconds:
+            return ClockJump("wall", drift)
+        if expected_elapsed is not None:
+            overrun = monotonic - previous_monotonic - expected_elapsed
+            if overrun > self.tolerance_seconds:
+                return ClockJump("suspend", overrun)
+        return None
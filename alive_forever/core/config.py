@@ -1,15 +1,21 @@
 """Application configuration loading, migration, and presets."""
 
 import json
-from dataclasses import dataclass, field
+import re
+import threading
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
-from alive_forever.core.scheduler import ScheduleConfig, TimeWindow
-from alive_forever.system.windows import CONFIG_FILE, LEGACY_CONFIG_FILE, ensure_app_directories
+from alive_forever.core.notifications import parse_quiet_hours
+from alive_forever.core.scheduler import MAX_INTERVAL_SECONDS, MIN_INTERVAL_SECONDS, SNAPSHOT_OPTIONS, ScheduleConfig, TimeWindow
+from alive_forever.core.targets import parse_process_names
+from alive_forever.system.host import CONFIG_FILE, LEGACY_CONFIG_FILE, PROFILES_DIR, ensure_app_directories
+from alive_forever.system.presence import compile_presence_pattern
 
 
 VALID_ACTIVITY_TYPES = ["F15 Key (Recommended)", "Mouse Jiggle", "Both"]
+VALID_CATCH_UP_POLICIES = ["Immediately", "After One Interval"]
 PRESET_CONFIGS = {
     "Custom": None,
     "Always On": {
@@ -50,12 +56,23 @@ PRESET_CONFIGS = {
 }
 
 
+PROFILE_NAME_PATTERN = re.compile(r"^\w[\w .-]{0,63}$")
+PROFILE_FILE_SUFFIX = ".json"
+
+
+def user_profile_path(name, profiles_dir=PROFILES_DIR):
+    """Return the file for user profile ``name``, or None if the name cannot be a file name."""
+    if profiles_dir is None or not isinstance(name, str) or not PROFILE_NAME_PATTERN.match(name) or name.endswith("."):
+        return None
+    return profiles_dir / (name + PROFILE_FILE_SUFFIX)
+
+
 def clamp_interval(value):
     try:
         interval = int(value)
     except (TypeError, ValueError):
         return 60
-    return max(10, min(300, interval))
+    return max(MIN_INTERVAL_SECONDS, min(MAX_INTERVAL_SECONDS, interval))
 
 
 def parse_datetime(value):
@@ -67,53 +84,114 @@ def parse_datetime(value):
         return None
 
 
-@dataclass
+@dataclass(**SNAPSHOT_OPTIONS)
 class AppConfig:
+    """Immutable settings snapshot. Changes build a new one with ``dataclasses.replace``."""
+
     interval: int = 60
     activity_type: str = "F15 Key (Recommended)"
     start_minimized: bool = True
     notifications_enabled: bool = True
+    quiet_hours: Optional[str] = None
+    verbose_activity_log: bool = False
+    resume_catch_up: str = "Immediately"
+    metrics_textfile_dir: Optional[str] = None
+    presence_log_path: Optional[str] = None
+    presence_pattern: Optional[str] = None
+    target_processes: Tuple[str, ...] = ()
     profile_name: str = "Custom"
-    lifetime_activity_count: int = 0
-    last_activity_at: Optional[datetime] = None
     schedule: ScheduleConfig = field(default_factory=ScheduleConfig.default)
 
-    def clone(self):
-        return AppConfig(
-            interval=self.interval,
-            activity_type=self.activity_type,
-            start_minimized=self.start_minimized,
-            notifications_enabled=self.notifications_enabled,
-            profile_name=self.profile_name,
-            lifetime_activity_count=self.lifetime_activity_count,
-            last_activity_at=self.last_activity_at,
-            schedule=self.schedule.clone(),
-        )
-
     def to_dict(self):
         return {
             "interval": self.interval,
             "activity_type": self.activity_type,
             "start_minimized": self.start_minimized,
             "notifications_enabled": self.notifications_enabled,
+            "quiet_hours": self.quiet_hours,
+            "verbose_activity_log": self.verbose_activity_log,
+            "resume_catch_up": self.resume_catch_up,
+            "metrics_textfile_dir": self.metrics_textfile_dir,
+            "presence_log_path": self.presence_log_path,
+            "presence_pattern": self.presence_pattern,
+            "target_processes": list(self.target_processes),
             "profile_name": self.profile_name,
+            "schedule": self.schedule.to_dict(),
+        }
+
+
+class RuntimeStats:
+    """Activity counters and pause expiry, kept out of ``AppConfig`` so runtime changes never touch a snapshot.
+
+    The activity thread is the only writer of the counters and goes through the
+    ``record_*`` methods; readers just read the attributes. The lifetime count, last
+    activity time and timed pause expiry are saved in the same file as the config; skip
+    and failure counts are per session.
+    """
+
+    __slots__ = (
+        "session_activity_count",
+        "lifetime_activity_count",
+        "last_activity_at",
+        "skipped_activity_count",
+        "failed_activity_count",
+        "pause_until",
+        "_lock",
+    )
+
+    def __init__(self, lifetime_activity_count=0, last_activity_at=None, pause_until=None):
+        self.session_activity_count = 0
+        self.lifetime_activity_count = lifetime_activity_count
+        self.last_activity_at = last_activity_at
+        self.skipped_activity_count = 0
+        self.failed_activity_count = 0
+        self.pause_until = pause_until
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_raw(cls, raw_config):
+        try:
+            lifetime_activity_count = max(0, int(raw_config.get("lifetime_activity_count", 0) or 0))
+        except (TypeError, ValueError):
+            lifetime_activity_count = 0
+        return cls(lifetime_activity_count, parse_datetime(raw_config.get("last_activity_at")), parse_datetime(raw_config.get("pause_until")))
+
+    def record_activity(self, moment):
+        with self._lock:
+            self.session_activity_count += 1
+            self.lifetime_activity_count += 1
+            self.last_activity_at = moment
+            return self.lifetime_activity_count
+
+    def record_skipped(self):
+        with self._lock:
+            self.skipped_activity_count += 1
+
+    def record_failure(self):
+        with self._lock:
+            self.failed_activity_count += 1
+
+    def to_dict(self):
+        return {
             "lifetime_activity_count": self.lifetime_activity_count,
             "last_activity_at": self.last_activity_at.isoformat() if self.last_activity_at else None,
-            "schedule": self.schedule.to_dict(),
+            "pause_until": self.pause_until.isoformat() if self.pause_until else None,
         }
 
 
 def apply_preset(config, preset_name):
     preset = PRESET_CONFIGS.get(preset_name)
     if not preset:
-        config.profile_name = "Custom"
-        return config
+        return replace(config, profile_name="Custom")
 
-    config.interval = preset["interval"]
-    config.activity_type = preset["activity_type"]
-    config.schedule = preset["schedule"].clone()
-    config.profile_name = preset_name
-    return config
+    # Schedules are immutable, so the preset's instance can be shared.
+    return replace(
+        config,
+        interval=preset["interval"],
+        activity_type=preset["activity_type"],
+        schedule=preset["schedule"],
+        profile_name=preset_name,
+    )
 
 
 def config_from_raw(raw_config):
@@ -121,9 +199,32 @@ def config_from_raw(raw_config):
     if activity_type not in VALID_ACTIVITY_TYPES:
         activity_type = VALID_ACTIVITY_TYPES[0]
 
+    resume_catch_up = raw_config.get("resume_catch_up", VALID_CATCH_UP_POLICIES[0])
+    if resume_catch_up not in VALID_CATCH_UP_POLICIES:
+        resume_catch_up = VALID_CATCH_UP_POLICIES[0]
+
     profile_name = raw_config.get("profile_name", "Custom")
     if profile_name not in PRESET_CONFIGS:
-        profile_name = "Custom"
+        profile_path = user_profile_path(profile_name)
+        if profile_path is None or not profile_path.exists():
+            profile_name = "Custom"
+
+    quiet_hours = raw_config.get("quiet_hours")
+    try:
+        quiet_hours = quiet_hours if isinstance(quiet_hours, str) and parse_quiet_hours(quiet_hours) else None
+    except ValueError:
+        quiet_hours = None
+
+    presence_pattern = raw_config.get("presence_pattern")
+    try:
+        presence_pattern = presence_pattern if isinstance(presence_pattern, str) and compile_presence_pattern(presence_pattern) else None
+    except ValueError:
+        presence_pattern = None
+
+    try:
+        target_processes = parse_process_names(raw_config.get("target_processes", ()))
+    except ValueError:
+        target_processes = ()
 
     schedule = ScheduleConfig.from_raw(raw_config.get("schedule", {}))
     return AppConfig(
@@ -131,22 +232,34 @@ def config_from_raw(raw_config):
         activity_type=activity_type,
         start_minimized=bool(raw_config.get("start_minimized", True)),
         notifications_enabled=bool(raw_config.get("notifications_enabled", True)),
+        quiet_hours=quiet_hours,
+        verbose_activity_log=bool(raw_config.get("verbose_activity_log", False)),
+        resume_catch_up=resume_catch_up,
+        metrics_textfile_dir=raw_config.get("metrics_textfile_dir") if isinstance(raw_config.get("metrics_textfile_dir"), str) else None,
+        presence_log_path=(raw_config.get("presence_log_path") or None) if isinstance(raw_config.get("presence_log_path"), str) else None,
+        presence_pattern=presence_pattern,
+        target_processes=target_processes,
         profile_name=profile_name,
-        lifetime_activity_count=max(0, int(raw_config.get("lifetime_activity_count", 0) or 0)),
-        last_activity_at=parse_datetime(raw_config.get("last_activity_at")),
         schedule=schedule,
     )
 
 
-def load_app_config(logger):
+def load_app_state(logger, config_file=None):
+    """Return ``(AppConfig, RuntimeStats)`` read from the config file, or defaults.
+
+    ``config_file`` reads another file in place of the app's own, as the benchmarks do.
+    Only the app's own file falls back to, and migrates, the legacy config.
+    """
+    legacy_file = LEGACY_CONFIG_FILE if config_file is None else None
+    config_file = config_file or CONFIG_FILE
     source_file = None
     raw_config = {}
 
     try:
-        if CONFIG_FILE.exists():
-            source_file = CONFIG_FILE
-        elif LEGACY_CONFIG_FILE.exists():
-            source_file = LEGACY_CONFIG_FILE
+        if config_file.exists():
+            source_file = config_file
+        elif legacy_file and legacy_file.exists():
+            source_file = legacy_file
 
         if source_file:
             with open(source_file, "r", encoding="utf-8") as handle:
@@ -157,14 +270,18 @@ def load_app_config(logger):
         raw_config = {}
 
     config = config_from_raw(raw_config)
-    if source_file == LEGACY_CONFIG_FILE:
+    stats = RuntimeStats.from_raw(raw_config)
+    if legacy_file and source_file == legacy_file:
         logger.info("Migrating legacy config into %s", CONFIG_FILE)
-        save_app_config(config, logger)
-    return config
+        save_app_config(config, logger, stats)
+    return config, stats
 
 
-def save_app_config(config, logger):
+def save_app_config(config, logger, stats=None):
+    raw_config = config.to_dict()
+    if stats is not None:
+        raw_config.update(stats.to_dict())
     ensure_app_directories()
     with open(CONFIG_FILE, "w", encoding="utf-8") as handle:
-        json.dump(config.to_dict(), handle, indent=2)
+        json.dump(raw_config, handle, indent=2)
     logger.info("Saved configuration to %s", CONFIG_FILE)
\ No newline at end of file
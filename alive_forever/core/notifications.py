@@ -0,0 +1,137 @@
+"""Tray notification queue with coalescing, rate limiting and quiet hours."""
+
+import threading
+from collections import OrderedDict, namedtuple
+from itertools import count
+
+from alive_forever.core.scheduler import parse_time_string
+
+
+PendingNotification = namedtuple("PendingNotification", ["title", "message", "submitted_at"])
+
+
+def parse_quiet_hours(value):
+    """Parse ``"22:00-07:00"`` into ``(start, end)`` times; blank means no quiet hours."""
+    if not value or not value.strip():
+        return None
+    start_text, separator, end_text = value.partition("-")
+    if not separator:
+        raise ValueError("Quiet hours must look like 22:00-07:00")
+    start, end = parse_time_string(start_text), parse_time_string(end_text)
+    if start == end:
+        raise ValueError("Quiet hours need different start and end times.")
+    return start, end
+
+
+def in_quiet_hours(quiet_hours, moment):
+    if quiet_hours is None:
+        return False
+    start, end = quiet_hours
+    current = moment.time()
+    if start < end:
+        return start <= current < end
+    return current >= start or current < end
+
+
+class NotificationDispatcher:
+    """Delivers tray notifications from its own thread so no caller waits on the shell.
+
+    ``submit`` only queues. Messages that share a ``kind`` replace each other while they
+    wait, so a burst of state changes ends in one message about the final state, and
+    none at all if that state was already the last one shown. A message waits
+    ``COALESCE_SECONDS`` for a replacement, deliveries are at least ``MIN_GAP_SECONDS``
+    apart, and messages that come due inside quiet hours are dropped; the log keeps them.
+    Quiet hours are read off ``now_provider``, the clock's local time unless the caller
+    passes another wall clock.
+
+    ``run`` sleeps until the next message is due or a new one arrives, so an idle
+    dispatcher never wakes up. The simulator calls ``deliver_due`` directly instead.
+    """
+
+    COALESCE_SECONDS = 2.0
+    MIN_GAP_SECONDS = 10.0
+
+    def __init__(self, deliver, clock, logger, quiet_hours=None, now_provider=None):
+        self.deliver = deliver
+        self.clock = clock
+        self.logger = logger
+        self.quiet_hours = quiet_hours
+        self.now_provider = now_provider or clock.now
+        self.delivered_count = 0
+        self.coalesced_count = 0
+        self.suppressed_count = 0
+        self._pending = OrderedDict()
+        self._last_shown = {}
+        self._last_delivery_at = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._unique_kinds = count()
+
+    def submit(self, title, message, kind=None):
+        with self._lock:
+            if kind is None:
+                kind = ("unique", next(self._unique_kinds))
+            if kind in self._pending:
+                self.coalesced_count += 1
+                del self._pending[kind]
+            self._pending[kind] = PendingNotification(title, message, self.clock.monotonic())
+        self._wake.set()
+
+    def remember(self, kind, title):
+        """Record ``title`` as already shown for ``kind`` without showing it, such as the state at startup."""
+        with self._lock:
+            self._last_shown[kind] = title
+
+    def _due_at(self, pending):
+        due_at = pending.submitted_at + self.COALESCE_SECONDS
+        if self._last_delivery_at is not None:
+            due_at = max(due_at, self._last_delivery_at + self.MIN_GAP_SECONDS)
+        return due_at
+
+    def seconds_until_due(self, now_monotonic=None):
+        """Seconds until the oldest queued message may be delivered, or None when the queue is empty."""
+        current_time = self.clock.monotonic() if now_monotonic is None else now_monotonic
+        with self._lock:
+            if not self._pending:
+                return None
+            return max(0.0, self._due_at(next(iter(self._pending.values()))) - current_time)
+
+    def deliver_due(self, now_monotonic=None):
+        """Show or drop every queued message that is due; return how many were shown."""
+        current_time = self.clock.monotonic() if now_monotonic is None else now_monotonic
+        ready = []
+        with self._lock:
+            while self._pending:
+                kind, pending = next(iter(self._pending.items()))
+                if current_time < self._due_at(pending):
+                    break
+                del self._pending[kind]
+                if self._last_shown.get(kind) == pending.title:
+                    self.coalesced_count += 1
+                    continue
+                if in_quiet_hours(self.quiet_hours, self.now_provider()):
+                    self.suppressed_count += 1
+                    self.logger.debug("Quiet hours; not showing %s: %s", pending.title, pending.message)
+                    continue
+                self._last_shown[kind] = pending.title
+                self._last_delivery_at = current_time
+                self.delivered_count += 1
+                ready.append(pending)
+
+        for pending in ready:
+            try:
+                self.deliver(pending.title, pending.message)
+            except Exception:
+                self.logger.debug("Tray notification not available", exc_info=True)
+        return len(ready)
+
+    def run(self):
+        while not self._stopped:
+            self._wake.clear()
+            self.deliver_due()
+            self.clock.wait(self._wake, self.seconds_until_due())
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
@@ -0,0 +1,163 @@
+"""Named profiles: the built-in presets plus user profiles stored as JSON files."""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, replace
+
+from alive_forever.core.config import PRESET_CONFIGS, PROFILE_FILE_SUFFIX, VALID_ACTIVITY_TYPES, clamp_interval, user_profile_path
+from alive_forever.core.scheduler import ScheduleConfig, compile_schedule
+
+
+@dataclass
+class Profile:
+    name: str
+    interval: int
+    activity_type: str
+    schedule: ScheduleConfig
+    builtin: bool = False
+    content_hash: str = ""
+
+    def to_dict(self):
+        return {
+            "interval": self.interval,
+            "activity_type": self.activity_type,
+            "schedule": self.schedule.to_dict(),
+        }
+
+    def apply_to(self, config):
+        """Return a copy of ``config`` running this profile; the schedule is shared, not cloned."""
+        return replace(config, interval=self.interval, activity_type=self.activity_type, schedule=self.schedule, profile_name=self.name)
+
+
+def profile_content_hash(raw_profile):
+    return hashlib.sha256(json.dumps(raw_profile, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def profile_from_raw(name, raw_profile, builtin=False):
+    if not isinstance(raw_profile, dict):
+        raise ValueError("Profile {0!r} must be a JSON object.".format(name))
+    activity_type = raw_profile.get("activity_type", VALID_ACTIVITY_TYPES[0])
+    if activity_type not in VALID_ACTIVITY_TYPES:
+        activity_type = VALID_ACTIVITY_TYPES[0]
+    profile = Profile(
+        name=name,
+        interval=clamp_interval(raw_profile.get("interval", 60)),
+        activity_type=activity_type,
+        schedule=ScheduleConfig.from_raw(raw_profile.get("schedule", {})),
+        builtin=builtin,
+    )
+    profile.content_hash = profile_content_hash(profile.to_dict())
+    return profile
+
+
+class ProfileLibrary:
+    """Built-in presets plus the user profiles in ``profiles_dir``, loaded on first use.
+
+    Listing names only reads the directory. A user file is parsed and validated the
+    first time its profile is asked for, and again only when its size or mtime changes.
+    Each schedule is compiled once and kept under a hash of its contents, so profiles
+    and re-saved files with the same schedule share one snapshot. The snapshot carries
+    its compiled form, so switching profiles never compiles or rebuilds a cache key.
+    Schedules no loaded profile uses any more are dropped.
+    """
+
+    def __init__(self, profiles_dir=None, logger=None):
+        self.profiles_dir = profiles_dir
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._loaded = {}
+        self._by_hash = {}
+        self._builtin = {}
+        for name, preset in PRESET_CONFIGS.items():
+            if preset:
+                raw_profile = {"interval": preset["interval"], "activity_type": preset["activity_type"], "schedule": preset["schedule"].to_dict()}
+                self._builtin[name] = self._share(profile_from_raw(name, raw_profile, builtin=True))
+
+    def user_profile_names(self):
+        if self.profiles_dir is None:
+            return []
+        try:
+            entries = os.listdir(self.profiles_dir)
+        except OSError:
+            return []
+        names = []
+        for entry in entries:
+            name = entry[: -len(PROFILE_FILE_SUFFIX)]
+            if entry.endswith(PROFILE_FILE_SUFFIX) and name not in self._builtin and user_profile_path(name, self.profiles_dir):
+                names.append(name)
+        return sorted(names, key=str.lower)
+
+    def names(self):
+        return ["Custom"] + list(self._builtin) + self.user_profile_names()
+
+    def get(self, name):
+        """Return the named profile, or None for "Custom", unknown names and unreadable files."""
+        profile = self._builtin.get(name)
+        if profile is not None:
+            return profile
+
+        path = user_profile_path(name, self.profiles_dir)
+        if path is None:
+            return None
+        try:
+            stat = path.stat()
+        except OSError:
+            with self._lock:
+                if self._loaded.pop(name, None) is not None:
+                    self._forget_unused_schedules()
+            return None
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._loaded.get(name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                profile = self._share(profile_from_raw(name, json.load(handle)))
+        except (OSError, ValueError) as error:
+            if self.logger:
+                self.logger.warning("Could not load profile %s: %s", path, error)
+            return None
+
+        with self._lock:
+            replaced = self._loaded.get(name)
+            self._loaded[name] = (stamp, profile)
+            if replaced is not None and replaced[1].schedule is not profile.schedule:
+                self._forget_unused_schedules()
+        return profile
+
+    def save(self, name, interval, activity_type, schedule):
+        if name in self._builtin or name == "Custom":
+            raise ValueError("{0!r} is a built-in profile name.".format(name))
+        path = user_profile_path(name, self.profiles_dir)
+        if path is None:
+            raise ValueError("Profile names use letters, digits, spaces, dots and dashes (up to 64).")
+
+        profile = Profile(name=name, interval=interval, activity_type=activity_type, schedule=schedule)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + ".part")
+        with open(partial, "w", encoding="utf-8") as handle:
+            json.dump(profile.to_dict(), handle, indent=2)
+        os.replace(partial, path)
+        return self.get(name)
+
+    def _share(self, profile):
+        schedule_hash = profile_content_hash(profile.schedule.to_dict())
+        with self._lock:
+            shared = self._by_hash.get(schedule_hash)
+            if shared is None:
+                shared = profile.schedule
+                compile_schedule(shared)
+                self._by_hash[schedule_hash] = shared
+        profile.schedule = shared
+        return profile
+
+    def _forget_unused_schedules(self):
+        """Drop shared schedules that no loaded profile references; call with the lock held."""
+        used = {id(profile.schedule) for profile in self._builtin.values()}
+        used.update(id(profile.schedule) for _, profile in self._loaded.values())
+        self._by_hash = {key: schedule for key, schedule in self._by_hash.items() if id(schedule) in used}
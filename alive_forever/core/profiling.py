@@ -0,0 +1,186 @@
+"""On-demand cProfile and tracemalloc capture of the running app's threads."""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import tracemalloc
+from pathlib import Path
+
+
+# From Python 3.12 cProfile hooks sys.monitoring: one profiler sees every thread and a second is refused.
+PROFILER_SEES_ALL_THREADS = sys.version_info >= (3, 12)
+
+
+class ProfilingSession:
+    """Profiles each participating thread for ``duration_seconds`` and writes the results.
+
+    Before Python 3.12 ``cProfile`` only sees the thread that enabled it, so every thread
+    that should be profiled calls ``attach_current_thread`` from its own loop: the first
+    call enables a profiler for that thread, and the first call after the deadline
+    disables it again. On 3.12+ the first attached thread enables a single shared
+    profiler and the last one to detach disables it.
+
+    Once every attached thread has detached, the merged stats are written to
+    ``output_dir`` as a pstats file, a top-N text summary and a tracemalloc diff between
+    the start and end snapshots. Nothing runs on any thread while no session exists.
+
+    A hung or exited thread never checks in again, so ``finish_overdue`` writes what was
+    collected once ``GRACE_SECONDS`` have passed the deadline. Before 3.12 a profile that
+    may still be collecting on another live thread is left out of that report.
+    """
+
+    DEFAULT_TOP_N = 30
+    TRACEMALLOC_FRAMES = 5
+    GRACE_SECONDS = 30
+
+    def __init__(self, output_dir, duration_seconds, clock, top_n=DEFAULT_TOP_N, on_finished=None):
+        self.output_dir = Path(output_dir)
+        self.duration_seconds = duration_seconds
+        self.clock = clock
+        self.top_n = top_n
+        self.on_finished = on_finished
+        self.started_at = None
+        self.deadline = None
+        self.finished = False
+        self.output_files = []
+        self._profiles = {}
+        self._active = {}
+        self._threads = {}
+        self._left_out = []
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+        self._start_snapshot = None
+
+    @property
+    def is_running(self):
+        return self.deadline is not None and not self.finished
+
+    def start(self):
+        self.started_at = self.clock.now()
+        self.deadline = self.clock.monotonic() + self.duration_seconds
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+        self._start_snapshot = tracemalloc.take_snapshot()
+        return self
+
+    def stop(self):
+        """End the session early; threads detach on their next check."""
+        self.deadline = self.clock.monotonic()
+
+    def seconds_remaining(self):
+        if not self.is_running:
+            return 0.0
+        return max(0.0, self.deadline - self.clock.monotonic())
+
+    def attach_current_thread(self, name):
+        """Enable or disable profiling for the calling thread. Returns True while it should keep checking."""
+        with self._lock:
+            if self.finished:
+                # Left attached by finish_overdue; only this thread can switch its profiler off.
+                profile = self._active.pop(name, None)
+                if profile is not None:
+                    profile.disable()
+                return False
+            if self.clock.monotonic() < self.deadline:
+                if name not in self._active:
+                    self._attach(name)
+                return True
+
+            profile = self._active.pop(name, None)
+            if profile is not None and profile not in self._active.values():
+                profile.disable()
+            if self._active:
+                return False
+            self.finished = True
+
+        self._finish()
+        return False
+
+    def finish_overdue(self, force=False):
+        """Write the results if threads are still attached ``GRACE_SECONDS`` after the deadline, or now with ``force``.
+
+        Returns True when this call wrote them.
+        """
+        with self._lock:
+            if self.finished or self.deadline is None:
+                return False
+            if not force and self.clock.monotonic() < self.deadline + self.GRACE_SECONDS:
+                return False
+            self.finished = True
+            for name, profile in list(self._active.items()):
+                thread = self._threads.get(name)
+                if PROFILER_SEES_ALL_THREADS or thread is threading.current_thread():
+                    self._active.pop(name)
+                    if profile not in self._active.values():
+                        profile.disable()
+                elif thread is not None and thread.is_alive():
+                    self._left_out.append(name)
+                else:
+                    self._active.pop(name)
+
+        self._finish()
+        return True
+
+    def _finish(self):
+        self._write_results()
+        if self.on_finished:
+            self.on_finished(self)
+
+    def _attach(self, name):
+        if PROFILER_SEES_ALL_THREADS and self._active:
+            self._active[name] = next(iter(self._active.values()))
+            return
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler or debugger owns the hook; leave this thread unprofiled.
+            return
+        self._profiles["all threads" if PROFILER_SEES_ALL_THREADS else name] = profile
+        self._active[name] = profile
+        self._threads[name] = threading.current_thread()
+
+    def _output_path(self, suffix):
+        return self.output_dir / "profile-{0}{1}".format(self.started_at.strftime("%Y%m%d-%H%M%S"), suffix)
+
+    def _write_results(self):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        end_snapshot = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        summary = io.StringIO()
+        summary.write("Profile started {0} for {1:.0f} seconds\n".format(self.started_at.isoformat(timespec="seconds"), self.duration_seconds))
+        profiles = [(name, profile) for name, profile in sorted(self._profiles.items()) if name not in self._left_out and profile.getstats()]
+        combined = None
+        for name, profile in profiles:
+            summary.write("\n=== Thread: {0} ===\n".format(name))
+            pstats.Stats(profile, stream=summary).sort_stats("cumulative").print_stats(self.top_n)
+            if combined is None:
+                combined = pstats.Stats(profile)
+            else:
+                combined.add(profile)
+
+        if combined is not None:
+            stats_path = self._output_path(".prof")
+            combined.dump_stats(str(stats_path))
+            self.output_files.append(stats_path)
+        else:
+            summary.write("\nNo thread reported any calls.\n")
+        if self._left_out:
+            summary.write("\nLeft out, still running without checking in: {0}\n".format(", ".join(sorted(self._left_out))))
+
+        summary_path = self._output_path("-summary.txt")
+        summary_path.write_text(summary.getvalue(), encoding="utf-8")
+        self.output_files.append(summary_path)
+
+        alloc_path = self._output_path("-alloc.txt")
+        differences = end_snapshot.compare_to(self._start_snapshot, "lineno")[: self.top_n]
+        lines = ["Top {0} allocation changes since the profile started".format(len(differences))]
+        lines.extend(str(difference) for difference in differences)
+        alloc_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        self.output_files.append(alloc_path)
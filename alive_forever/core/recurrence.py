@@ -0,0 +1,212 @@
+"""RRULE-lite date rules that pick which dates a schedule window occurs on."""
+
+import calendar
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+
+RULE_FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+RULE_DAY_CODES = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+# Any Monday works as the interval origin when a rule repeats every period.
+DEFAULT_RULE_START = date(2001, 1, 1)
+
+
+def _parse_rule_date(name, value):
+    for pattern in ("%Y%m%d", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, pattern).date()
+        except ValueError:
+            continue
+    raise ValueError("{0} must be a date like 20260410 or 2026-04-10".format(name))
+
+
+def _parse_int_list(name, value, low, high):
+    numbers = []
+    for item in value.split(","):
+        try:
+            number = int(item)
+        except ValueError:
+            raise ValueError("{0} must be a comma-separated list of numbers".format(name))
+        if not low <= abs(number) <= high:
+            raise ValueError("{0} values must be between {1} and {2}".format(name, low, high))
+        numbers.append(number)
+    return tuple(sorted(set(numbers)))
+
+
+def _parse_by_day(value):
+    days = []
+    for item in value.split(","):
+        code = item[-2:]
+        if code not in RULE_DAY_CODES:
+            raise ValueError("BYDAY entries must end in one of {0}".format(", ".join(RULE_DAY_CODES)))
+        ordinal = None
+        if item[:-2]:
+            try:
+                ordinal = int(item[:-2])
+            except ValueError:
+                raise ValueError("BYDAY ordinals must be numbers, as in 1MO or -1FR")
+            if not 1 <= abs(ordinal) <= 53:
+                raise ValueError("BYDAY ordinals must be between 1 and 53")
+        days.append((ordinal, RULE_DAY_CODES.index(code)))
+    return tuple(sorted(set(days), key=lambda day: (day[1], day[0] or 0)))
+
+
+class DateRule:
+    """A parsed rule such as ``FREQ=WEEKLY;INTERVAL=2;BYDAY=FR;DTSTART=20260410``.
+
+    Supported parts are ``FREQ`` (DAILY, WEEKLY, MONTHLY or YEARLY), ``INTERVAL``,
+    ``BYDAY`` with optional ordinals for monthly and yearly rules (``1MO``, ``-1FR``),
+    ``BYMONTHDAY`` (negative values count from the month end), ``BYMONTH``, ``DTSTART``
+    and ``UNTIL``. The rule only picks dates; the window still gives the times.
+
+    Matching dates are expanded one calendar year at a time and cached, so ``matches``
+    is a set lookup and ``next_date`` a bisect. ``next_date`` gives up after
+    ``HORIZON_YEARS``, which bounds the work for a rule that never matches again.
+    """
+
+    HORIZON_YEARS = 5
+    YEAR_CACHE_SIZE = 8
+
+    def __init__(self, text):
+        parts = {}
+        body = text.strip().upper()
+        if body.startswith("RRULE:"):
+            body = body[len("RRULE:"):]
+        for part in filter(None, body.split(";")):
+            name, separator, value = part.partition("=")
+            if not separator or not value:
+                raise ValueError("Rule parts must look like NAME=VALUE, got {0!r}".format(part))
+            if name in parts:
+                raise ValueError("Rule part {0} is repeated".format(name))
+            parts[name] = value
+
+        unknown = set(parts) - {"FREQ", "INTERVAL", "BYDAY", "BYMONTHDAY", "BYMONTH", "DTSTART", "UNTIL"}
+        if unknown:
+            raise ValueError("Unsupported rule part: {0}".format(", ".join(sorted(unknown))))
+        self.freq = parts.get("FREQ")
+        if self.freq not in RULE_FREQUENCIES:
+            raise ValueError("FREQ must be one of {0}".format(", ".join(RULE_FREQUENCIES)))
+        try:
+            self.interval = int(parts.get("INTERVAL", "1"))
+        except ValueError:
+            self.interval = 0
+        if self.interval < 1:
+            raise ValueError("INTERVAL must be a whole number of at least 1")
+        self.weekdays = _parse_by_day(parts["BYDAY"]) if "BYDAY" in parts else ()
+        self.month_days = _parse_int_list("BYMONTHDAY", parts["BYMONTHDAY"], 1, 31) if "BYMONTHDAY" in parts else ()
+        self.months = _parse_int_list("BYMONTH", parts["BYMONTH"], 1, 12) if "BYMONTH" in parts else ()
+        if any(month < 0 for month in self.months):
+            raise ValueError("BYMONTH values must be between 1 and 12")
+        self.start = _parse_rule_date("DTSTART", parts["DTSTART"]) if "DTSTART" in parts else None
+        self.until = _parse_rule_date("UNTIL", parts["UNTIL"]) if "UNTIL" in parts else None
+
+        if any(ordinal is not None for ordinal, _ in self.weekdays) and self.freq not in ("MONTHLY", "YEARLY"):
+            raise ValueError("BYDAY ordinals need FREQ=MONTHLY or FREQ=YEARLY")
+        if self.start is None:
+            if self.interval > 1:
+                raise ValueError("INTERVAL above 1 needs a DTSTART to count from")
+            if not (self.weekdays or self.month_days or self.months) and self.freq != "DAILY":
+                raise ValueError("FREQ={0} needs BYDAY, BYMONTHDAY, BYMONTH or DTSTART".format(self.freq))
+        # Without BY parts a rule repeats on its start date's weekday, day or month and day.
+        if not (self.weekdays or self.month_days or self.months):
+            if self.freq == "WEEKLY":
+                self.weekdays = ((None, self.start.weekday()),)
+            elif self.freq == "MONTHLY":
+                self.month_days = (self.start.day,)
+            elif self.freq == "YEARLY":
+                self.months, self.month_days = (self.start.month,), (self.start.day,)
+        self.origin = self.start or DEFAULT_RULE_START
+        self.text = ";".join("{0}={1}".format(name, parts[name]) for name in ("FREQ", "INTERVAL", "BYDAY", "BYMONTHDAY", "BYMONTH", "DTSTART", "UNTIL") if name in parts)
+        self._years = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _in_interval(self, day):
+        if self.interval == 1:
+            return True
+        if self.freq == "DAILY":
+            periods = (day - self.origin).days
+        elif self.freq == "WEEKLY":
+            periods = (day - (self.origin - timedelta(days=self.origin.weekday()))).days // 7
+        elif self.freq == "MONTHLY":
+            periods = (day.year - self.origin.year) * 12 + day.month - self.origin.month
+        else:
+            periods = day.year - self.origin.year
+        return periods % self.interval == 0
+
+    def _weekday_matches(self, day):
+        # Ordinals count within the month for monthly rules and BYMONTH, otherwise within the year.
+        if self.freq == "MONTHLY" or self.months:
+            position, length = day.day, calendar.monthrange(day.year, day.month)[1]
+        else:
+            position, length = day.timetuple().tm_yday, 366 if calendar.isleap(day.year) else 365
+        for ordinal, weekday in self.weekdays:
+            if weekday != day.weekday():
+                continue
+            if ordinal is None or ordinal == (position - 1) // 7 + 1 or ordinal == -((length - position) // 7 + 1):
+                return True
+        return False
+
+    def _date_matches(self, day):
+        if (self.start is not None and day < self.start) or (self.until is not None and day > self.until):
+            return False
+        if self.months and day.month not in self.months:
+            return False
+        if self.month_days:
+            month_length = calendar.monthrange(day.year, day.month)[1]
+            if day.day not in self.month_days and day.day - month_length - 1 not in self.month_days:
+                return False
+        if self.weekdays and not self._weekday_matches(day):
+            return False
+        return self._in_interval(day)
+
+    def dates_in_year(self, year):
+        """Return the sorted matching dates of ``year`` and a set of them for lookups."""
+        with self._lock:
+            cached = self._years.get(year)
+            if cached is not None:
+                self._years.move_to_end(year)
+                return cached
+
+        day = date(year, 1, 1)
+        dates = []
+        while day.year == year:
+            if self._date_matches(day):
+                dates.append(day)
+            day += timedelta(days=1)
+        expanded = (tuple(dates), frozenset(dates))
+
+        with self._lock:
+            self._years[year] = expanded
+            if len(self._years) > self.YEAR_CACHE_SIZE:
+                self._years.popitem(last=False)
+        return expanded
+
+    def possible_weekdays(self):
+        """Return the weekdays (Monday is 0) that this rule can ever fall on."""
+        weekdays = {weekday for _, weekday in self.weekdays} if self.weekdays else set(range(7))
+        if self.freq == "DAILY" and self.interval % 7 == 0:
+            weekdays &= {self.origin.weekday()}
+        return frozenset(weekdays)
+
+    def matches(self, day):
+        return day in self.dates_in_year(day.year)[1]
+
+    def next_date(self, day):
+        """Return the first matching date on or after ``day``, or None within ``HORIZON_YEARS``."""
+        for year in range(day.year, day.year + self.HORIZON_YEARS + 1):
+            dates = self.dates_in_year(year)[0]
+            index = bisect_left(dates, day) if year == day.year else 0
+            if index < len(dates):
+                return dates[index]
+            if self.until is not None and self.until.year <= year:
+                return None
+        return None
+
+
+@lru_cache(maxsize=64)
+def parse_date_rule(text):
+    """Parse ``text`` into a shared ``DateRule``; raises ValueError when it is not a valid rule."""
+    return DateRule(text)
@@ -1,8 +1,20 @@
 """Scheduling primitives and evaluation helpers."""
 
+import sys
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from datetime import datetime, time as dt_time, timedelta
-from typing import List
+from datetime import datetime, time as dt_time, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from alive_forever.core.recurrence import DateRule, parse_date_rule
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:
+    ZoneInfo = None
+    ZoneInfoNotFoundError = KeyError
 
 
 DAY_ORDER = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
@@ -15,6 +27,10 @@ DAY_LABELS = {
     "sat": "Sat",
     "sun": "Sun",
 }
+# Config objects are immutable snapshots; slots keep them small where the interpreter allows it.
+SNAPSHOT_OPTIONS = {"frozen": True, "slots": True} if sys.version_info >= (3, 10) else {"frozen": True}
+MIN_INTERVAL_SECONDS = 10
+MAX_INTERVAL_SECONDS = 300
 
 
 def parse_time_string(value):
@@ -33,7 +49,7 @@ def parse_time_string(value):
 
 
 def sanitize_days(days):
-    if not isinstance(days, list):
+    if not isinstance(days, (list, tuple)):
         return list(DAY_ORDER)
 
     normalized = []
@@ -49,35 +65,149 @@ def day_code_for_date(value):
     return DAY_ORDER[value.weekday()]
 
 
-@dataclass
+def resolve_timezone(name):
+    if not name:
+        return None
+    if ZoneInfo is None:
+        raise ValueError("Schedule time zones need Python 3.9 or newer.")
+    try:
+        return ZoneInfo(str(name).strip())
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError("Unknown time zone: {0}".format(name))
+
+
+@lru_cache(maxsize=64)
+def _zone_transition_table(zone_key, year):
+    """Precompute a zone's UTC offset changes around ``year`` as wall-clock thresholds."""
+    zone = ZoneInfo(zone_key)
+
+    def offset_at(utc_moment):
+        return utc_moment.replace(tzinfo=dt_timezone.utc).astimezone(zone).utcoffset()
+
+    cursor = datetime(year, 1, 1) - timedelta(days=2)
+    stop = datetime(year + 1, 1, 1) + timedelta(days=2)
+    initial_offset = offset_at(cursor)
+    thresholds = []
+    offsets = []
+    current_offset = initial_offset
+    step = timedelta(hours=6)
+    while cursor < stop:
+        probe = cursor + step
+        probe_offset = offset_at(probe)
+        if probe_offset != current_offset:
+            low, high = cursor, probe
+            while high - low > timedelta(seconds=1):
+                middle = low + (high - low) / 2
+                if offset_at(middle) == current_offset:
+                    low = middle
+                else:
+                    high = middle
+            changed_at = high.replace(microsecond=0)
+            # Wall times before this threshold still use the old offset. That resolves a
+            # skipped hour forwards and picks the first pass through a repeated hour.
+            thresholds.append(changed_at + max(current_offset, probe_offset))
+            offsets.append(probe_offset)
+            current_offset = probe_offset
+        cursor = probe
+    return initial_offset, tuple(thresholds), tuple(offsets)
+
+
+def localize_wall_time(value, zone):
+    """Map a naive wall-clock time in ``zone`` to an unambiguous UTC datetime."""
+    initial_offset, thresholds, offsets = _zone_transition_table(zone.key, value.year)
+    index = bisect_right(thresholds, value)
+    offset = offsets[index - 1] if index else initial_offset
+    return (value - offset).replace(tzinfo=dt_timezone.utc)
+
+
+def seconds_until(moment, now):
+    # Aware datetimes sharing a tzinfo subtract as wall clocks, so compare instants in UTC.
+    if moment.tzinfo is not None or now.tzinfo is not None:
+        moment = moment.astimezone(dt_timezone.utc)
+        now = now.astimezone(dt_timezone.utc)
+    return (moment - now).total_seconds()
+
+
+@dataclass(**SNAPSHOT_OPTIONS)
 class TimeWindow:
+    """A daily active window. ``interval`` and ``activity_type`` override the app-wide cadence while it is active.
+
+    With a ``rule`` (see ``recurrence.DateRule``) the window only occurs on dates the rule
+    matches, such as every other Friday or the first Monday of the month, on top of ``days``.
+    """
+
     start: str
     end: str
-    days: List[str] = field(default_factory=lambda: list(DAY_ORDER))
+    days: Tuple[str, ...] = tuple(DAY_ORDER)
+    interval: Optional[int] = None
+    activity_type: Optional[str] = None
+    rule: Optional[str] = None
 
     def __post_init__(self):
         parse_time_string(self.start)
         parse_time_string(self.end)
         if self.start == self.end:
             raise ValueError("Schedule windows need different start and end times.")
-        self.days = sanitize_days(self.days)
+        if self.interval is not None and not MIN_INTERVAL_SECONDS <= self.interval <= MAX_INTERVAL_SECONDS:
+            raise ValueError("Window interval must be between {0} and {1} seconds.".format(MIN_INTERVAL_SECONDS, MAX_INTERVAL_SECONDS))
+        object.__setattr__(self, "days", tuple(sanitize_days(self.days)))
+        if self.rule is not None:
+            rule = parse_date_rule(self.rule)
+            if not rule.possible_weekdays() & {DAY_ORDER.index(day) for day in self.days}:
+                raise ValueError("Repeat rule {0} never falls on the window's days.".format(rule.text))
+            object.__setattr__(self, "rule", rule.text)
+
+    @classmethod
+    def from_raw(cls, raw_window):
+        interval = raw_window.get("interval")
+        activity_type = raw_window.get("activity_type")
+        rule = raw_window.get("rule")
+        return cls(
+            start=raw_window.get("start", "09:00"),
+            end=raw_window.get("end", "17:00"),
+            days=raw_window.get("days", list(DAY_ORDER)),
+            interval=max(MIN_INTERVAL_SECONDS, min(MAX_INTERVAL_SECONDS, interval)) if isinstance(interval, int) and not isinstance(interval, bool) else None,
+            activity_type=activity_type if isinstance(activity_type, str) and activity_type else None,
+            rule=rule if isinstance(rule, str) and rule.strip() else None,
+        )
 
     def label(self):
         day_text = ", ".join(DAY_LABELS[day] for day in self.days)
-        return "{0} | {1}-{2}".format(day_text, self.start, self.end)
+        if self.rule:
+            day_text = self.rule if len(self.days) == len(DAY_ORDER) else "{0}; {1}".format(self.rule, day_text)
+        label = "{0} | {1}-{2}".format(day_text, self.start, self.end)
+        overrides = []
+        if self.interval is not None:
+            overrides.append("every {0}s".format(self.interval))
+        if self.activity_type:
+            overrides.append(self.activity_type)
+        return "{0} | {1}".format(label, ", ".join(overrides)) if overrides else label
 
     def to_dict(self):
-        return {
+        raw_window = {
             "start": self.start,
             "end": self.end,
             "days": list(self.days),
         }
+        if self.interval is not None:
+            raw_window["interval"] = self.interval
+        if self.activity_type:
+            raw_window["activity_type"] = self.activity_type
+        if self.rule:
+            raw_window["rule"] = self.rule
+        return raw_window
 
 
-@dataclass
+@dataclass(**SNAPSHOT_OPTIONS)
 class ScheduleConfig:
     enabled: bool = False
-    windows: List[TimeWindow] = field(default_factory=list)
+    windows: Tuple[TimeWindow, ...] = ()
+    timezone: Optional[str] = None
+    # Set by compile_schedule; replace() starts a new snapshot without it.
+    _compiled: Optional["CompiledSchedule"] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "windows", tuple(self.windows))
 
     @classmethod
     def default(cls):
@@ -100,13 +230,7 @@ class ScheduleConfig:
                 if not isinstance(raw_window, dict):
                     continue
                 try:
-                    windows.append(
-                        TimeWindow(
-                            start=raw_window.get("start", "09:00"),
-                            end=raw_window.get("end", "17:00"),
-                            days=raw_window.get("days", list(DAY_ORDER)),
-                        )
-                    )
+                    windows.append(TimeWindow.from_raw(raw_window))
                 except ValueError:
                     continue
         elif {"start", "end"}.intersection(raw_schedule.keys()):
@@ -124,36 +248,271 @@ class ScheduleConfig:
         if not windows:
             windows = cls.default().windows
 
-        return cls(enabled=enabled, windows=windows)
+        timezone_name = raw_schedule.get("timezone") or None
+        try:
+            resolve_timezone(timezone_name)
+        except ValueError:
+            timezone_name = None
+
+        return cls(enabled=enabled, windows=windows, timezone=timezone_name)
 
     def to_dict(self):
         return {
             "enabled": self.enabled,
             "windows": [window.to_dict() for window in self.windows],
+            "timezone": self.timezone,
         }
 
-    def clone(self):
-        return ScheduleConfig(enabled=self.enabled, windows=[TimeWindow(**window.to_dict()) for window in self.windows])
 
+class CompiledSchedule:
+    """Parsed form of a ``ScheduleConfig`` with per-date occurrences cached.
+
+    Without a time zone, occurrences are naive local datetimes as before. With one,
+    they are UTC datetimes resolved through the precomputed DST table, because aware
+    datetimes that share a zone compare and subtract by wall clock, not by instant.
+    Transitions are handed back in the schedule's zone for display.
+    """
+
+    OCCURRENCE_CACHE_DAYS = 64
+    # Weekly windows repeat every 7 days, so 8 days of unbroken coverage means it never ends.
+    # Rules have no such period and are only trusted once coverage outlasts their horizon.
+    CONTINUOUS_COVERAGE_DAYS = 8
+
+    def __init__(self, schedule):
+        self.enabled = schedule.enabled
+        self.zone = resolve_timezone(schedule.timezone)
+        self.windows = [
+            (
+                window,
+                parse_time_string(window.start),
+                parse_time_string(window.end),
+                frozenset(DAY_ORDER.index(day) for day in window.days),
+                parse_date_rule(window.rule) if window.rule else None,
+            )
+            for window in schedule.windows
+        ]
+        has_rules = any(rule is not None for *_, rule in self.windows)
+        self.coverage_days = DateRule.HORIZON_YEARS * 366 if has_rules else self.CONTINUOUS_COVERAGE_DAYS
+        self._occurrences = OrderedDict()
+        self._next_transition = None
+        self._lock = threading.Lock()
+
+    def localize(self, now):
+        if self.zone is None:
+            return now if now.tzinfo is None else now.astimezone().replace(tzinfo=None)
+        return now.astimezone(dt_timezone.utc)
+
+    def local_date(self, moment):
+        if self.zone is None:
+            return moment.date()
+        return moment.astimezone(self.zone).date()
+
+    def to_display(self, moment):
+        return moment if self.zone is None else moment.astimezone(self.zone)
+
+    def occurrences_for_date(self, active_date):
+        with self._lock:
+            occurrences = self._occurrences.get(active_date)
+            if occurrences is not None:
+                self._occurrences.move_to_end(active_date)
+                return occurrences
+
+        weekday = active_date.weekday()
+        occurrences = []
+        for window, start_time, end_time, weekdays, rule in self.windows:
+            if weekday not in weekdays or (rule is not None and not rule.matches(active_date)):
+                continue
+            start_at = datetime.combine(active_date, start_time)
+            end_at = datetime.combine(active_date, end_time)
+            if start_time >= end_time:
+                end_at += timedelta(days=1)
+            if self.zone is not None:
+                start_at = localize_wall_time(start_at, self.zone)
+                end_at = localize_wall_time(end_at, self.zone)
+            occurrences.append((start_at, end_at, window))
+        occurrences.sort(key=lambda item: item[0])
+
+        with self._lock:
+            self._occurrences[active_date] = occurrences
+            if len(self._occurrences) > self.OCCURRENCE_CACHE_DAYS:
+                self._occurrences.popitem(last=False)
+        return occurrences
+
+    def next_occurrence_date(self, active_date):
+        """Return the first date on or after ``active_date`` with any occurrence, or None within the rule horizon."""
+        # The horizon is counted once from active_date; next_date counts it from each call's argument.
+        horizon = active_date + timedelta(days=DateRule.HORIZON_YEARS * 366)
+        candidates = []
+        for _, _, _, weekdays, rule in self.windows:
+            if not weekdays:
+                continue
+            if rule is None:
+                offset = min((weekday - active_date.weekday()) % 7 for weekday in weekdays)
+                candidates.append(active_date + timedelta(days=offset))
+                continue
+            candidate = rule.next_date(active_date)
+            while candidate is not None and candidate.weekday() not in weekdays:
+                if candidate > horizon:
+                    candidate = None
+                    break
+                candidate = rule.next_date(candidate + timedelta(days=1))
+            if candidate is not None:
+                candidates.append(candidate)
+        return min(candidates) if candidates else None
+
+    def iter_occurrences(self, now, day_span=14):
+        start_date = self.local_date(now)
+        for offset in range(-1, day_span):
+            for occurrence in self.occurrences_for_date(start_date + timedelta(days=offset)):
+                yield occurrence
+
+    def is_active(self, now):
+        if not self.enabled:
+            return True
 
-def build_window_occurrence(window, active_date):
-    start_time = parse_time_string(window.start)
-    end_time = parse_time_string(window.end)
-    start_at = datetime.combine(active_date, start_time)
-    end_at = datetime.combine(active_date, end_time)
-    if start_time >= end_time:
-        end_at += timedelta(days=1)
-    return start_at, end_at
+        now = self.localize(now)
+        for start_at, end_at, _ in self.iter_occurrences(now, day_span=1):
+            if start_at <= now < end_at:
+                return True
+        return False
+
+    def iter_intervals(self, start, end=None):
+        """Yield merged ``(start, end)`` active intervals that finish after ``start``, in order.
+
+        Occurrences are merged day by day as they are needed, so an unbounded scan only
+        costs as many days as the caller consumes; runs of dates without occurrences are
+        skipped in one step. A schedule that covers every moment for ``coverage_days``
+        never changes state again and ends the stream with an open ``(start, None)``
+        interval; one whose rules stop matching simply ends it.
+        """
+        if not self.windows:
+            return
+
+        start = self.localize(start)
+        end = self.localize(end) if end is not None else None
+        active_date = self.local_date(start) - timedelta(days=1)
+        last_date = self.local_date(end) if end is not None else None
+        current_start = current_end = None
+
+        while last_date is None or active_date <= last_date:
+            occurrences = self.occurrences_for_date(active_date)
+            for start_at, end_at, _ in occurrences:
+                if current_start is None:
+                    current_start, current_end = start_at, end_at
+                elif start_at <= current_end:
+                    current_end = max(current_end, end_at)
+                else:
+                    if current_end > start:
+                        yield current_start, current_end
+                    current_start, current_end = start_at, end_at
+
+            if (
+                current_start is not None
+                and self.local_date(current_end) > active_date
+                and self.local_date(current_start) < active_date - timedelta(days=self.coverage_days)
+            ):
+                yield current_start, None
+                return
+            active_date += timedelta(days=1)
+            if not occurrences:
+                active_date = self.next_occurrence_date(active_date)
+                if active_date is None:
+                    break
+
+        if current_start is not None and current_end > start:
+            yield current_start, current_end
+
+    def iter_transitions(self, start, end=None):
+        if not self.enabled:
+            return
+
+        now = self.localize(start)
+        limit = self.localize(end) if end is not None else None
+        for start_at, end_at in self.iter_intervals(start, end):
+            for next_state, transition_at in (("active", start_at), ("scheduled_off", end_at)):
+                if transition_at is None:
+                    return
+                if transition_at <= now:
+                    continue
+                if limit is not None and transition_at > limit:
+                    return
+                yield next_state, self.to_display(transition_at)
+
+    def next_transition(self, now):
+        """Return the first transition after ``now``, reusing the last answer while it still holds.
+
+        A transition found from an earlier moment stays the next one until it passes. When
+        there is none, which can take a scan to the rule horizon to establish, the answer
+        is reused for a day.
+        """
+        local_now = self.localize(now)
+        cached = self._next_transition
+        if cached is not None and cached[0] <= local_now < cached[1]:
+            return cached[2]
+
+        transition = next(self.iter_transitions(now), None)
+        valid_until = self.localize(transition[1]) if transition else local_now + timedelta(days=1)
+        self._next_transition = (local_now, valid_until, transition)
+        return transition
+
+    def active_segment(self, now):
+        """Return ``(windows, until)``: the windows active at ``now``, in start order, and when that set next changes.
+
+        Overlapping windows merge into one active interval, but a window starting or
+        ending inside it still changes which overrides apply, so ``until`` is the nearest
+        window boundary rather than the next transition. ``until`` is None while the
+        schedule is disabled, because the set can then never change.
+        """
+        if not self.enabled:
+            return (), None
+
+        local_now = self.localize(now)
+        active = []
+        until = None
+        for start_at, end_at, window in self.iter_occurrences(local_now, day_span=2):
+            if start_at <= local_now < end_at:
+                active.append(window)
+                boundary = end_at
+            elif start_at > local_now:
+                boundary = start_at
+            else:
+                continue
+            if until is None or boundary < until:
+                until = boundary
+        if until is None:
+            until = local_now + timedelta(days=1)
+        return tuple(active), self.to_display(until)
 
 
-def iter_window_occurrences(schedule, now, day_span=14):
-    for offset in range(-1, day_span):
-        active_date = (now + timedelta(days=offset)).date()
-        active_day = day_code_for_date(active_date)
-        for window in schedule.windows:
-            if active_day not in window.days:
-                continue
-            yield window, build_window_occurrence(window, active_date)
+def schedule_cache_key(schedule):
+    return (
+        schedule.enabled,
+        schedule.timezone,
+        tuple((window.start, window.end, window.days, window.interval, window.activity_type, window.rule) for window in schedule.windows),
+    )
+
+
+@lru_cache(maxsize=32)
+def _compile_schedule_cached(key):
+    enabled, timezone_name, raw_windows = key
+    windows = [
+        TimeWindow(start=start, end=end, days=days, interval=interval, activity_type=activity_type, rule=rule)
+        for start, end, days, interval, activity_type, rule in raw_windows
+    ]
+    return CompiledSchedule(ScheduleConfig(enabled=enabled, windows=windows, timezone=timezone_name))
+
+
+def compile_schedule(schedule):
+    """Return the compiled form of ``schedule``, kept on the snapshot after the first call.
+
+    Only a snapshot's first call builds the content key, which walks every window, so
+    equal schedules loaded separately still share one compiled copy.
+    """
+    compiled = schedule._compiled
+    if compiled is None:
+        compiled = _compile_schedule_cached(schedule_cache_key(schedule))
+        object.__setattr__(schedule, "_compiled", compiled)
+    return compiled
 
 
 def is_schedule_active(schedule, now=None):
@@ -162,11 +521,7 @@ def is_schedule_active(schedule, now=None):
 
     if not schedule.enabled:
         return True
-
-    for _, (start_at, end_at) in iter_window_occurrences(schedule, now, day_span=2):
-        if start_at <= now < end_at:
-            return True
-    return False
+    return compile_schedule(schedule).is_active(now)
 
 
 def get_next_transition(schedule, now=None):
@@ -175,17 +530,63 @@ def get_next_transition(schedule, now=None):
 
     if not schedule.enabled:
         return None
+    return compile_schedule(schedule).next_transition(now)
 
-    candidates = []
-    for _, (start_at, end_at) in iter_window_occurrences(schedule, now, day_span=14):
-        if start_at > now:
-            candidates.append(("active", start_at))
-        if end_at > now:
-            candidates.append(("scheduled_off", end_at))
 
-    if not candidates:
-        return None
-    return min(candidates, key=lambda item: item[1])
+def iter_transitions(schedule, start, end=None):
+    """Lazily yield ``(next_state, at)`` schedule transitions after ``start``, in order.
+
+    With ``end`` the stream stops at that moment; without it the stream is unbounded
+    for any schedule that changes state at all.
+    """
+    return compile_schedule(schedule).iter_transitions(start, end)
+
+
+def wall_clock(schedule, moment):
+    """Return ``moment`` as a naive wall-clock time in the schedule's zone (or local time)."""
+    compiled = compile_schedule(schedule)
+    return compiled.to_display(compiled.localize(moment)).replace(tzinfo=None)
+
+
+def timeline_rows(schedule, now, day_count=7):
+    """Return ``(date, spans)`` for ``day_count`` days starting today on the schedule's wall clock.
+
+    Each span is an active ``(start_minute, end_minute)`` pair within that day, cut from the
+    merged interval stream, so overnight windows show up on both days they touch. A disabled
+    schedule keeps the app active and covers every day completely.
+    """
+    first_date = wall_clock(schedule, now).date()
+    dates = [first_date + timedelta(days=offset) for offset in range(day_count)]
+    if not schedule.enabled:
+        return [(active_date, [(0, 1440)]) for active_date in dates]
+
+    compiled = compile_schedule(schedule)
+    rows = OrderedDict((active_date, []) for active_date in dates)
+    range_start = datetime.combine(first_date, dt_time())
+    range_end = range_start + timedelta(days=day_count)
+
+    def from_wall(value):
+        return localize_wall_time(value, compiled.zone) if compiled.zone is not None else value
+
+    for start_at, end_at in compiled.iter_intervals(from_wall(range_start), from_wall(range_end)):
+        cursor = max(compiled.to_display(start_at).replace(tzinfo=None), range_start)
+        end_at = range_end if end_at is None else min(compiled.to_display(end_at).replace(tzinfo=None), range_end)
+        while cursor < end_at:
+            day_end = datetime.combine(cursor.date() + timedelta(days=1), dt_time())
+            span_end = min(end_at, day_end)
+            end_minute = 1440 if span_end == day_end else span_end.hour * 60 + span_end.minute
+            rows[cursor.date()].append((cursor.hour * 60 + cursor.minute, end_minute))
+            cursor = span_end
+    return list(rows.items())
+
+
+def format_duration(seconds):
+    """Format a remaining time in whole minutes, rounded up: ``"25 min"``, ``"1 h 05 min"``."""
+    minutes = max(1, -(-int(seconds) // 60))
+    if minutes < 60:
+        return "{0} min".format(minutes)
+    hours, minutes = divmod(minutes, 60)
+    return "{0} h".format(hours) if not minutes else "{0} h {1:02d} min".format(hours, minutes)
 
 
 def format_transition(transition):
@@ -194,20 +595,20 @@ def format_transition(transition):
 
     next_state, transition_at = transition
     label = "Active" if next_state == "active" else "Scheduled Off"
-    return "Next: {0} at {1}".format(label, transition_at.strftime("%a %H:%M"))
+    time_format = "%a %H:%M %Z" if transition_at.tzinfo is not None else "%a %H:%M"
+    return "Next: {0} at {1}".format(label, transition_at.strftime(time_format))
 
 
 def describe_schedule(schedule, now=None):
     if not schedule.enabled:
         return "Schedule disabled. The app stays active unless you pause it manually."
 
-    window_labels = [window.label() for window in schedule.windows]
-    if not window_labels:
+    if not schedule.windows:
         return "Schedule enabled, but no windows are configured."
 
-    summary = "; ".join(window_labels[:3])
-    if len(window_labels) > 3:
-        summary = "{0}; +{1} more".format(summary, len(window_labels) - 3)
+    summary = "; ".join(window.label() for window in schedule.windows[:3])
+    if len(schedule.windows) > 3:
+        summary = "{0}; +{1} more".format(summary, len(schedule.windows) - 3)
 
     transition = format_transition(get_next_transition(schedule, now=now))
     if transition:
@@ -0,0 +1,180 @@
+"""Virtual-time clock, fake backends, and a driver for running the app loop at high speed."""
+
+import logging
+from datetime import timedelta, timezone
+
+from alive_forever.core.scheduler import seconds_until
+
+
+class SimulatedClock:
+    """Clock whose wall and monotonic time only move when the simulation advances them.
+
+    ``jump`` moves the wall clock alone, like a clock change or a resume on a system
+    whose monotonic clock stops during sleep.
+    """
+
+    def __init__(self, start, monotonic_start=0.0):
+        self._start = start
+        self._start_timestamp = start.timestamp()
+        self._monotonic_start = monotonic_start
+        self._elapsed = 0.0
+        self._wall_offset = 0.0
+        self.wait_count = 0
+
+    def now(self):
+        offset = timedelta(seconds=self._elapsed + self._wall_offset)
+        if self._start.tzinfo is None:
+            return self._start + offset
+        # Aware arithmetic in Python is wall-clock arithmetic, so step through UTC to keep DST honest.
+        return (self._start.astimezone(timezone.utc) + offset).astimezone(self._start.tzinfo)
+
+    def monotonic(self):
+        return self._monotonic_start + self._elapsed
+
+    def wall_time(self):
+        return self._start_timestamp + self._elapsed + self._wall_offset
+
+    def advance(self, seconds):
+        if seconds < 0:
+            raise ValueError("Simulated time cannot move backwards.")
+        self._elapsed += seconds
+
+    def jump(self, seconds):
+        self._wall_offset += seconds
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def wait(self, event, timeout):
+        self.wait_count += 1
+        if event.is_set():
+            return True
+        self.advance(timeout)
+        return event.is_set()
+
+
+class FakeInputBackend:
+    """Records simulated activity instead of injecting real input."""
+
+    def __init__(self, clock=None):
+        self.clock = clock
+        self.events = []
+        self.fail = False
+
+    def send_activity(self, activity_type):
+        if self.fail:
+            raise OSError("Simulated input failure")
+        self.events.append((self.clock.now() if self.clock else None, activity_type))
+
+
+class FakeProcessTable:
+    """Process enumerator returning whatever names a test puts in ``names``."""
+
+    def __init__(self, names=()):
+        self.names = set(names)
+        self.calls = 0
+
+    def process_names(self):
+        self.calls += 1
+        return set(self.names)
+
+
+class FakeTray:
+    """Stand-in for ``pystray.Icon`` that keeps everything the app pushed to it."""
+
+    def __init__(self):
+        self.icon = None
+        self.title = ""
+        self.notifications = []
+        self.menu_updates = 0
+        self.stopped = False
+
+    def notify(self, message, title=None):
+        self.notifications.append((title, message))
+
+    def update_menu(self):
+        self.menu_updates += 1
+
+    def run(self):
+        return None
+
+    def stop(self):
+        self.stopped = True
+
+
+def create_quiet_logger(name="alive_forever_simulation"):
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    if not logger.handlers:
+        logger.addHandler(logging.NullHandler())
+    return logger
+
+
+class AppSimulator:
+    """Drives ``KeepAliveApp.process_activity_tick`` by jumping straight to the next deadline.
+
+    The app must be built with a ``SimulatedClock``; a ``FakeTray`` is attached when the
+    app has no tray yet. Between deadlines nothing can change, so the driver skips the idle
+    one-second polls the real loop would make and a simulated week runs in about a second.
+    """
+
+    MIN_STEP_SECONDS = 0.001
+
+    def __init__(self, app, clock=None):
+        self.app = app
+        self.clock = clock or app.clock
+        if app.icon is None:
+            app.icon = FakeTray()
+        self.started = False
+        self.transitions = []
+        self.steps = 0
+
+    @property
+    def tray(self):
+        return self.app.icon
+
+    def _record_state(self):
+        state = self.app.get_runtime_state()
+        if not self.transitions or self.transitions[-1][1] != state:
+            self.transitions.append((self.clock.now(), state))
+
+    def start(self):
+        if self.started:
+            return
+        self.started = True
+        if self.app.start_time is None:
+            self.app.start_time = self.clock.now()
+        if self.app.next_run is None:
+            self.app.next_run = self.clock.monotonic()
+        self.app.clock_jumps.reset()
+        self.app.refresh_runtime_state(notify=False)
+        self._record_state()
+
+    def step(self):
+        self.start()
+        # Deadline skipping makes monotonic gaps meaningless here, so only wall jumps are checked.
+        self.app.run_loop_iteration()
+        self.app.notifier.deliver_due()
+        self.steps += 1
+        self._record_state()
+        # The real dispatcher wakes on its own thread; here its deadline joins the app's.
+        delays = [self.app.seconds_until_next_deadline(self.app.next_run), self.app.notifier.seconds_until_due()]
+        delays = [delay for delay in delays if delay is not None]
+        return min(delays) if delays else None
+
+    def run_for(self, seconds):
+        self.start()
+        end = self.clock.monotonic() + seconds
+        while True:
+            delay = self.step()
+            remaining = end - self.clock.monotonic()
+            if remaining <= 0:
+                break
+            if delay is None:
+                self.clock.advance(remaining)
+            else:
+                self.clock.advance(min(max(delay, self.MIN_STEP_SECONDS), remaining))
+        return self
+
+    def run_until(self, moment):
+        return self.run_for(max(0.0, seconds_until(moment, self.clock.now())))
@@ -0,0 +1,75 @@
+"""Gating activity on whether a target process such as Teams is running."""
+
+
+def normalize_process_name(name):
+    """Compare names case-insensitively and without ``.exe``, so one list works on every platform."""
+    name = name.strip().lower()
+    return name[:-4] if name.endswith(".exe") else name
+
+
+def parse_process_names(value):
+    """Split ``"ms-teams.exe, Teams.exe"`` (or a list of names) into a tuple of non-blank names."""
+    items = value.split(",") if isinstance(value, str) else value
+    if not isinstance(items, (list, tuple)) or not all(isinstance(item, str) for item in items):
+        raise ValueError("Target processes must be a list of process names")
+    return tuple(item.strip() for item in items if item.strip())
+
+
+class TargetProcessGate:
+    """Caches whether any of the target processes runs, for ``TTL_SECONDS`` per enumeration.
+
+    Enumerating processes is the costly part, so the app calls ``refresh`` only when it
+    wakes for a deadline and the cached answer has gone stale. ``is_missing`` only reads
+    the cache. Enumerators return a set of process names, or None when the platform cannot
+    list processes; an unknown answer never counts as missing.
+    """
+
+    TTL_SECONDS = 30.0
+
+    def __init__(self, enumerator, clock, logger):
+        self.enumerator = enumerator
+        self.clock = clock
+        self.logger = logger
+        self.enumeration_count = 0
+        self._targets = ()
+        self._checked_at = None
+        self._present = True
+
+    def set_targets(self, names):
+        targets = tuple(sorted({normalize_process_name(name) for name in names}))
+        if targets != self._targets:
+            self._targets = targets
+            self._checked_at = None
+            self._present = True
+
+    @property
+    def enabled(self):
+        return bool(self._targets)
+
+    def is_stale(self, now_monotonic=None):
+        return self.enabled and self.seconds_until_stale(now_monotonic) <= 0
+
+    def seconds_until_stale(self, now_monotonic=None):
+        if self._checked_at is None:
+            return 0.0
+        current_time = self.clock.monotonic() if now_monotonic is None else now_monotonic
+        return max(0.0, self._checked_at + self.TTL_SECONDS - current_time)
+
+    def refresh(self, now_monotonic=None):
+        """Enumerate processes now; return True when a target process is running."""
+        current_time = self.clock.monotonic() if now_monotonic is None else now_monotonic
+        try:
+            names = self.enumerator.process_names()
+        except OSError:
+            self.logger.debug("Could not list running processes", exc_info=True)
+            names = None
+        self.enumeration_count += 1
+        self._checked_at = current_time
+        present = names is None or any(normalize_process_name(name) in self._targets for name in names)
+        if present != self._present:
+            self.logger.info("Target process %s", "found" if present else "not running")
+        self._present = present
+        return present
+
+    def is_missing(self):
+        return self.enabled and not self._present
@@ -0,0 +1,122 @@
+"""Supervisor that restarts the activity loop when its heartbeat goes missing."""
+
+from alive_forever.core.scheduler import seconds_until
+
+
+class ActivityWatchdog:
+    """Watches the activity loop heartbeat and restarts the loop when it dies or stalls.
+
+    The loop stamps ``app.last_heartbeat`` with the monotonic clock on every tick. A
+    dead thread is restarted straight away; a live thread is restarted once its
+    heartbeat is older than ``tolerance_seconds``.
+
+    A hung thread cannot be stopped, only abandoned, so a replacement that stalls too
+    (a blocked input backend hangs every loop alike) is given twice as long before the
+    next restart, and after ``MAX_CONSECUTIVE_RESTARTS`` the watchdog gives up until a
+    loop runs healthily for ``tolerance_seconds`` again.
+    """
+
+    DEFAULT_TOLERANCE_SECONDS = 30
+    CHECK_INTERVAL_SECONDS = 5
+    INCIDENT_DISPLAY_SECONDS = 3600
+    MAX_CONSECUTIVE_RESTARTS = 4
+
+    def __init__(self, app, tolerance_seconds=DEFAULT_TOLERANCE_SECONDS, check_interval=CHECK_INTERVAL_SECONDS):
+        self.app = app
+        self.tolerance_seconds = tolerance_seconds
+        self.check_interval = check_interval
+        self.restart_count = 0
+        self.stall_durations = []
+        self.last_incident = None
+        self.consecutive_restarts = 0
+        self.gave_up = False
+        self._replacement_generation = None
+        self._restarted_at = None
+
+    @property
+    def longest_stall(self):
+        return max(self.stall_durations) if self.stall_durations else 0.0
+
+    def check(self, now_monotonic=None):
+        current_time = self.app.clock.monotonic() if now_monotonic is None else now_monotonic
+        last_heartbeat = self.app.last_heartbeat
+        stall = current_time - last_heartbeat if last_heartbeat is not None else 0.0
+
+        if not self.app.is_activity_thread_alive():
+            reason = "stopped"
+        elif last_heartbeat is not None and stall > self.tolerance_seconds:
+            reason = "stalled"
+        else:
+            if self.consecutive_restarts and current_time - self._restarted_at > self.tolerance_seconds:
+                self.consecutive_restarts = 0
+                self.gave_up = False
+            return None
+
+        if self.app.activity_loop_generation() != self._replacement_generation:
+            # Not a loop this watchdog started, so earlier failed restarts say nothing about it.
+            self.consecutive_restarts = 0
+            self.gave_up = False
+        if self.gave_up:
+            return None
+        if self.consecutive_restarts:
+            if self.consecutive_restarts >= self.MAX_CONSECUTIVE_RESTARTS:
+                self.gave_up = True
+                self.app.logger.error(
+                    "Activity loop still %s after %s restarts; giving up until it recovers",
+                    reason,
+                    self.consecutive_restarts,
+                )
+                # The loop that would report the change is the one that hangs, so report it from here.
+                self.app.refresh_runtime_state()
+                return None
+            if reason == "stalled" and stall <= self.tolerance_seconds * 2 ** self.consecutive_restarts:
+                return None
+
+        self.restart_count += 1
+        self.consecutive_restarts += 1
+        self.stall_durations.append(stall)
+        self.last_incident = (reason, self.app.now_provider(), stall)
+        self.app.logger.error(
+            "Activity loop %s (no heartbeat for %.1f seconds); restarting it (restart #%s)",
+            reason,
+            stall,
+            self.restart_count,
+        )
+        self.app.restart_activity_loop(reason, stall)
+        self._replacement_generation = self.app.activity_loop_generation()
+        self._restarted_at = current_time
+        return reason
+
+    def describe_incident(self, now=None):
+        if not self.last_incident:
+            return ""
+
+        reason, incident_at, stall = self.last_incident
+        now = now or self.app.now_provider()
+        if -seconds_until(incident_at, now) > self.INCIDENT_DISPLAY_SECONDS:
+            return ""
+        return "Recovered from a {0} activity loop at {1} after {2:.0f} seconds ({3} restart{4}).".format(
+            reason,
+            incident_at.strftime("%H:%M"),
+            stall,
+            self.restart_count,
+            "" if self.restart_count == 1 else "s",
+        )
+
+    def run(self):
+        last_check = self.app.clock.monotonic()
+        while not self.app.clock.wait(self.app.shutdown_event, self.check_interval):
+            current_time = self.app.clock.monotonic()
+            suspended = current_time - last_check > self.check_interval + self.tolerance_seconds
+            last_check = current_time
+            if suspended:
+                # The whole process slept; give the loop a check interval to resume before judging it.
+                continue
+            try:
+                self.check()
+            except Exception:
+                self.app.logger.exception("Activity watchdog check failed")
+            profiler = self.app.profiler
+            if profiler is not None:
+                # A hung loop never checks out of a profiling session; write what it has.
+                profiler.finish_overdue()
@@ -0,0 +1,128 @@
+"""Platform-neutral app paths, logging, and the lazily chosen operating system backend."""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from pathlib import Path
+
+from alive_forever.system.logs import LOG_FILE_NAME, CompactingFileHandler
+
+
+APP_NAME = "Alive Forever"
+APP_FOLDER_NAME = "AliveForever"
+XDG_FOLDER_NAME = "alive-forever"
+ROOT_DIR = Path(__file__).resolve().parents[2]
+LEGACY_CONFIG_FILE = ROOT_DIR / "config.json"
+ICON_FILE = ROOT_DIR / "icon.png"
+ICO_FILE = ROOT_DIR / "icon.ico"
+MUTEX_NAME = "AliveForever.Singleton"
+
+AppPaths = namedtuple("AppPaths", ["app_dir", "log_dir", "config_file", "profiles_dir", "runtime_dir"])
+
+
+def _xdg_dir(environ, name, fallback):
+    # The XDG spec says relative values are invalid and must be ignored.
+    value = environ.get(name)
+    return Path(value) if value and os.path.isabs(value) else fallback
+
+
+def resolve_app_paths(os_name=os.name, environ=os.environ):
+    """Return where config, profiles, logs and the instance lock live on ``os_name``.
+
+    Windows keeps everything under ``%APPDATA%``. Elsewhere config and profiles go to
+    ``$XDG_CONFIG_HOME``, logs to ``$XDG_STATE_HOME`` and the lock to ``$XDG_RUNTIME_DIR``.
+    """
+    if os_name == "nt":
+        app_dir = Path(environ.get("APPDATA") or Path.cwd()) / APP_FOLDER_NAME
+        return AppPaths(app_dir, app_dir / "logs", app_dir / "config.json", app_dir / "profiles", app_dir)
+
+    home = Path(environ.get("HOME") or Path.home())
+    app_dir = _xdg_dir(environ, "XDG_CONFIG_HOME", home / ".config") / XDG_FOLDER_NAME
+    state_dir = _xdg_dir(environ, "XDG_STATE_HOME", home / ".local" / "state") / XDG_FOLDER_NAME
+    runtime_dir = _xdg_dir(environ, "XDG_RUNTIME_DIR", state_dir)
+    return AppPaths(app_dir, state_dir / "logs", app_dir / "config.json", app_dir / "profiles", runtime_dir)
+
+
+APP_PATHS = resolve_app_paths()
+APP_DIR = APP_PATHS.app_dir
+LOG_DIR = APP_PATHS.log_dir
+CONFIG_FILE = APP_PATHS.config_file
+PROFILES_DIR = APP_PATHS.profiles_dir
+
+
+def ensure_app_directories():
+    APP_DIR.mkdir(parents=True, exist_ok=True)
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def setup_logging():
+    logger = logging.getLogger("alive_forever")
+    if logger.handlers:
+        return logger
+
+    ensure_app_directories()
+    logger.setLevel(logging.INFO)
+    formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
+
+    file_handler = CompactingFileHandler(LOG_DIR / LOG_FILE_NAME)
+    file_handler.setFormatter(formatter)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    logger.addHandler(file_handler)
+    logger.addHandler(stream_handler)
+    return logger
+
+
+class HostPlatform(ABC):
+    """What the app needs from the operating system.
+
+    ``get_host_platform`` imports the implementation for the running system the first
+    time it is asked, so Windows-only modules such as ``winreg`` are never imported
+    elsewhere. Every method is abstract, so a backend missing one fails when it is
+    constructed rather than when the app first calls it.
+    """
+
+    @abstractmethod
+    def create_instance_lock(self, name):
+        """Return a lock named ``name`` with ``acquire()`` and ``release()``."""
+
+    @abstractmethod
+    def create_input_backend(self):
+        """Return an input backend with ``send_activity(activity_type)``."""
+
+    @abstractmethod
+    def create_process_enumerator(self):
+        """Return a process enumerator with ``process_names()``."""
+
+    @abstractmethod
+    def build_startup_command(self, script_path):
+        """Return the command line that starts the app at login."""
+
+    @abstractmethod
+    def is_startup_enabled(self):
+        """Return whether the app is registered to start at login."""
+
+    @abstractmethod
+    def set_startup_enabled(self, enabled, startup_command, logger):
+        """Register or unregister ``startup_command`` to run at login."""
+
+    @abstractmethod
+    def show_message_box(self, message, title=APP_NAME):
+        """Show ``message`` to the user without the tray or Tk."""
+
+
+_host_platform = None
+
+
+def get_host_platform():
+    global _host_platform
+    if _host_platform is None:
+        if os.name == "nt":
+            from alive_forever.system.windows import WindowsPlatform as platform_class
+        else:
+            from alive_forever.system.posix import PosixPlatform as platform_class
+        _host_platform = platform_class()
+    return _host_platform
@@ -0,0 +1,245 @@
+"""Incremental log reader backed by mmap, for viewing recent events in the app."""
+
+import gzip
+import mmap
+import os
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+from alive_forever.system.logs import list_rotated_logs
+
+
+# ``file_key`` is the file's first line, which survives the renames and compression of rotation.
+LogLine = namedtuple("LogLine", ["source", "offset", "level", "text", "file_key"])
+LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+
+def parse_level(text):
+    parts = text.split(" | ", 2)
+    if len(parts) == 3 and parts[1] in LOG_LEVELS:
+        return parts[1]
+    return ""
+
+
+def line_matches(line, level=None, text=None):
+    """Return True when ``line`` is at least ``level`` and contains ``text`` (case-insensitive)."""
+    if level in LOG_LEVELS:
+        if line.level not in LOG_LEVELS or LOG_LEVELS.index(line.level) < LOG_LEVELS.index(level):
+            return False
+    return not text or text.lower() in line.text.lower()
+
+
+def _decode(raw_line):
+    return raw_line.rstrip(b"\r\n").decode("utf-8", errors="replace")
+
+
+def _file_key(data, head_bytes):
+    return bytes(data[:head_bytes]).partition(b"\n")[0]
+
+
+def _file_identity(path):
+    stat = os.stat(path)
+    return str(path), stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class _MappedView:
+    """Read-only mapping of a plain file's bytes.
+
+    Views are opened per operation and closed straight away so the log handler can still
+    rename the live file during rotation, which Windows refuses while a mapping is open.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._handle = None
+        self.data = b""
+
+    def __enter__(self):
+        self._handle = open(self.path, "rb")
+        size = os.fstat(self._handle.fileno()).st_size
+        self.data = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        return self
+
+    def __exit__(self, *exc_info):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        if self._handle:
+            self._handle.close()
+        self.data = b""
+
+
+class LogReader:
+    """Filters and follows a log file and its rotated copies.
+
+    Searches walk backwards from the end of each file with ``rfind``, starting with the
+    live file and continuing into rotated files, newest first. Plain files are mapped, not
+    read. A compressed rotation is decompressed whole, which the handler's ``max_bytes``
+    bounds; gzip cannot be read backwards. Those files never change, so the last
+    ``GZIP_CACHE_SIZE`` decompressed files are kept by file identity, and files in which
+    a filter found nothing are remembered. Loading older batches therefore does not
+    decompress a file again, and repeating a search skips files that had no matches.
+    ``follow`` returns only the lines appended since its previous call.
+
+    No line index is kept: the viewer only ever reads the newest lines and then pages
+    backwards, and a search cursor already resumes at a byte offset. Cursors name their
+    file by its first line rather than its place in ``sources()``, so a rotation between
+    two batches does not move them into another file.
+    """
+
+    GZIP_CACHE_SIZE = 2
+    NO_MATCH_MEMORY = 256
+    KEY_BYTES = 256
+
+    def __init__(self, log_file):
+        self.log_file = Path(log_file)
+        self._identity = None
+        self._follow_offset = None
+        self._decompressed = OrderedDict()
+        self._no_match = OrderedDict()
+        self._file_keys = OrderedDict()
+
+    def sources(self):
+        rotated = list(reversed(list_rotated_logs(self.log_file)))
+        return [self.log_file] + rotated if self.log_file.exists() else rotated
+
+    def _decompressed_data(self, identity, source):
+        data = self._decompressed.get(identity)
+        if data is None:
+            with gzip.open(source, "rb") as handle:
+                data = handle.read()
+            self._decompressed[identity] = data
+            if len(self._decompressed) > self.GZIP_CACHE_SIZE:
+                self._decompressed.popitem(last=False)
+        else:
+            self._decompressed.move_to_end(identity)
+        return data
+
+    def _source_key(self, source):
+        identity = _file_identity(source)
+        file_key = self._file_keys.get(identity)
+        if file_key is None:
+            data = self._decompressed.get(identity)
+            if data is None:
+                with (gzip.open(source, "rb") if source.suffix == ".gz" else open(source, "rb")) as handle:
+                    data = handle.read(self.KEY_BYTES)
+            file_key = _file_key(data, self.KEY_BYTES)
+            self._file_keys[identity] = file_key
+            if len(self._file_keys) > self.NO_MATCH_MEMORY:
+                self._file_keys.popitem(last=False)
+        return file_key
+
+    def _find_source(self, sources, file_key):
+        for index, source in enumerate(sources):
+            try:
+                if self._source_key(source) == file_key:
+                    return index
+            except FileNotFoundError:
+                continue
+        return None
+
+    def _search_data(self, source, data, level, text, end, limit):
+        """Return up to ``limit`` matching lines that start before ``end``, newest first, and where the scan stopped."""
+        file_key = _file_key(data, self.KEY_BYTES)
+        matches = []
+        position = len(data) if end is None else end
+        if end is None and position and data[position - 1:position] != b"\n":
+            position = data.rfind(b"\n", 0, position) + 1
+        while position > 0:
+            start = data.rfind(b"\n", 0, position - 1) + 1
+            line_text = _decode(data[start:position])
+            position = start
+            if not line_text:
+                continue
+            line = LogLine(str(source), start, parse_level(line_text), line_text, file_key)
+            if not line_matches(line, level, text):
+                continue
+            matches.append(line)
+            if len(matches) >= limit:
+                break
+        return matches, position
+
+    def _search_source(self, source, level, text, end, limit):
+        if source.suffix != ".gz":
+            with _MappedView(source) as view:
+                return self._search_data(source, view.data, level, text, end, limit)
+
+        identity = _file_identity(source)
+        no_match_key = (identity, level, text)
+        if end is None and no_match_key in self._no_match:
+            return [], 0
+        matches, position = self._search_data(source, self._decompressed_data(identity, source), level, text, end, limit)
+        if end is None and not matches:
+            self._no_match[no_match_key] = True
+            if len(self._no_match) > self.NO_MATCH_MEMORY:
+                self._no_match.popitem(last=False)
+        return matches, position
+
+    def search(self, level=None, text=None, limit=100, cursor=None):
+        """Return up to ``limit`` matching lines, newest first, and a cursor for the next batch.
+
+        ``level`` is a minimum level name; ``text`` a case-insensitive substring. The
+        cursor is ``(file_key, offset)`` and ``None`` once every file was read; a file that
+        has since been pruned ends the search.
+        """
+        sources = self.sources()
+        source_index, end = 0, None
+        if cursor:
+            file_key, end = cursor
+            source_index = self._find_source(sources, file_key)
+            if source_index is None:
+                return [], None
+            if end == 0:
+                source_index, end = source_index + 1, None
+        matches = []
+
+        while source_index < len(sources):
+            try:
+                batch, position = self._search_source(sources[source_index], level, text, end, limit - len(matches))
+            except FileNotFoundError:
+                batch, position = [], 0
+            matches.extend(batch)
+            if len(matches) >= limit:
+                return matches, (batch[-1].file_key, position)
+            source_index += 1
+            end = None
+        return matches, None
+
+    def cursor_before(self, line):
+        """Return the cursor that continues a search with the lines older than ``line``."""
+        return line.file_key, line.offset
+
+    def follow(self):
+        """Return complete lines appended since the previous call, oldest first.
+
+        The first call only records the current end of file. After a rotation the new
+        file is read from its start.
+        """
+        try:
+            stat = os.stat(self.log_file)
+        except FileNotFoundError:
+            identity, size = None, 0
+        else:
+            identity, size = (stat.st_dev, stat.st_ino), stat.st_size
+        rotated = identity != self._identity or (self._follow_offset is not None and size < self._follow_offset)
+        self._identity = identity
+        if self._follow_offset is None:
+            self._follow_offset = size
+            return []
+        if rotated:
+            self._follow_offset = 0
+        if size <= self._follow_offset:
+            return []
+
+        lines = []
+        with _MappedView(self.log_file) as view:
+            file_key = _file_key(view.data, self.KEY_BYTES)
+            position = self._follow_offset
+            while True:
+                newline = view.data.find(b"\n", position, size)
+                if newline < 0:
+                    break
+                text = _decode(view.data[position:newline])
+                lines.append(LogLine(str(self.log_file), position, parse_level(text), text, file_key))
+                position = newline + 1
+            self._follow_offset = position
+        return lines
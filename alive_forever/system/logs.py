@@ -0,0 +1,212 @@
+"""Compacting log handler: routine activity summaries plus compressed, age/size-bounded rotation."""
+
+import gzip
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+
+LOG_FILE_NAME = "alive_forever.log"
+ROUTINE_ACTIVITY = {"routine": True}
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_SUMMARY_INTERVAL = 3600
+DEFAULT_MAX_AGE_DAYS = 30
+DEFAULT_MAX_TOTAL_BYTES = 20 * 1024 * 1024
+ROTATED_TIMESTAMP_FORMAT = "%Y%m%d-%H%M%S"
+
+
+def _rotation_sort_key(suffix):
+    stem = suffix[:-3] if suffix.endswith(".gz") else suffix
+    date_part, _, rest = stem.partition("-")
+    time_part, _, counter = rest.partition("-")
+    return date_part, time_part, int(counter) if counter.isdigit() else 0
+
+
+def list_rotated_logs(log_file):
+    """Return rotated copies of ``log_file`` (plain or ``.gz``), oldest first."""
+    log_file = Path(log_file)
+    prefix = log_file.name + "."
+    rotated = [path for path in log_file.parent.glob(prefix + "*") if path.is_file() and not path.name.endswith(".part")]
+    return sorted(rotated, key=lambda path: _rotation_sort_key(path.name[len(prefix):]))
+
+
+class _LogMaintenance:
+    """Single background worker that compresses rotated files and applies retention."""
+
+    def __init__(self):
+        self._jobs = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, job):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="log-maintenance", daemon=True)
+                self._thread.start()
+        self._jobs.put(job)
+
+    def join(self):
+        self._jobs.join()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                job()
+            except Exception:
+                logging.getLogger("alive_forever").debug("Log maintenance failed", exc_info=True)
+            finally:
+                self._jobs.task_done()
+
+
+LOG_MAINTENANCE = _LogMaintenance()
+
+
+class CompactingFileHandler(RotatingFileHandler):
+    """Rotating file handler that folds routine activity into periodic summary lines.
+
+    Records logged with ``extra=ROUTINE_ACTIVITY`` are counted instead of written and
+    come out as one summary line per ``summary_interval`` seconds, or earlier when any
+    other record arrives so the file stays in order. Set ``summary_interval`` to 0 to
+    write every record. Rotated files get a timestamp suffix and are gzip-compressed
+    on a background thread; they are then pruned by age and by total size.
+    """
+
+    def __init__(
+        self,
+        filename,
+        max_bytes=DEFAULT_MAX_BYTES,
+        summary_interval=DEFAULT_SUMMARY_INTERVAL,
+        max_age_days=DEFAULT_MAX_AGE_DAYS,
+        max_total_bytes=DEFAULT_MAX_TOTAL_BYTES,
+        encoding="utf-8",
+        maintenance=LOG_MAINTENANCE,
+    ):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=0, encoding=encoding)
+        self.summary_interval = summary_interval
+        self.max_age_days = max_age_days
+        self.max_total_bytes = max_total_bytes
+        self.maintenance = maintenance
+        self._pending = None
+        self.maintenance.submit(self.compact_rotated_files)
+
+    def emit(self, record):
+        if self.summary_interval and getattr(record, "routine", False):
+            self._absorb(record)
+            return
+        self.flush_summary()
+        super().emit(record)
+
+    def _absorb(self, record):
+        if self._pending is None:
+            self._pending = {"count": 0, "first": record.created, "record": record}
+        self._pending["count"] += 1
+        self._pending["record"] = record
+        if record.created - self._pending["first"] >= self.summary_interval:
+            self.flush_summary()
+
+    def flush_summary(self):
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+
+        last = pending["record"]
+        summary = logging.LogRecord(
+            last.name,
+            logging.INFO,
+            last.pathname,
+            last.lineno,
+            "Activity summary: %s routine event(s) between %s and %s; last: %s",
+            (
+                pending["count"],
+                time.strftime("%H:%M:%S", time.localtime(pending["first"])),
+                time.strftime("%H:%M:%S", time.localtime(last.created)),
+                last.getMessage(),
+            ),
+            None,
+        )
+        summary.created = last.created
+        summary.msecs = last.msecs
+        super().emit(summary)
+
+    def rotation_target(self):
+        base = "{0}.{1}".format(self.baseFilename, time.strftime(ROTATED_TIMESTAMP_FORMAT))
+        target, counter = base, 1
+        while os.path.exists(target) or os.path.exists(target + ".gz"):
+            target = "{0}-{1}".format(base, counter)
+            counter += 1
+        return target
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename):
+            os.replace(self.baseFilename, self.rotation_target())
+        if not self.delay:
+            self.stream = self._open()
+        self.maintenance.submit(self.compact_rotated_files)
+
+    def close(self):
+        self.acquire()
+        try:
+            self.flush_summary()
+        finally:
+            self.release()
+        super().close()
+
+    def compact_rotated_files(self):
+        for path in list_rotated_logs(self.baseFilename):
+            if path.suffix != ".gz":
+                compress_file(path)
+        prune_rotated_logs(self.baseFilename, self.max_age_days, self.max_total_bytes)
+
+
+def compress_file(path):
+    path = Path(path)
+    target = path.with_name(path.name + ".gz")
+    partial = target.with_name(target.name + ".part")
+    with open(path, "rb") as source, gzip.open(partial, "wb") as destination:
+        shutil.copyfileobj(source, destination)
+    os.replace(partial, target)
+    path.unlink()
+    return target
+
+
+def prune_rotated_logs(log_file, max_age_days, max_total_bytes, now=None):
+    now = time.time() if now is None else now
+    removed = []
+    survivors = []
+    for path in list_rotated_logs(log_file):
+        if max_age_days and now - path.stat().st_mtime > max_age_days * 86400:
+            path.unlink()
+            removed.append(path)
+        else:
+            survivors.append(path)
+
+    if max_total_bytes:
+        total = sum(path.stat().st_size for path in survivors)
+        while survivors and total > max_total_bytes:
+            oldest = survivors.pop(0)
+            total -= oldest.stat().st_size
+            oldest.unlink()
+            removed.append(oldest)
+    return removed
+
+
+def set_activity_summary(logger, enabled, interval=DEFAULT_SUMMARY_INTERVAL):
+    for handler in logger.handlers:
+        if isinstance(handler, CompactingFileHandler):
+            handler.acquire()
+            try:
+                if not enabled:
+                    handler.flush_summary()
+                handler.summary_interval = interval if enabled else 0
+            finally:
+                handler.release()
@@ -0,0 +1,111 @@
+"""OpenMetrics textfile export for monitoring agents that scrape a local directory."""
+
+import math
+import os
+from collections import namedtuple
+from pathlib import Path
+
+
+METRICS_FILE_NAME = "alive_forever.prom"
+MetricsSnapshot = namedtuple(
+    "MetricsSnapshot",
+    ["state", "session_activities", "lifetime_activities", "skipped_activities", "failed_activities", "next_transition_at", "started_at"],
+)
+
+
+def _format_value(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "NaN"
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+def render_openmetrics(snapshot, states, tick_count, tick_seconds_sum, tick_seconds_max):
+    """Return the OpenMetrics exposition for ``snapshot`` and the tick timing totals."""
+    lines = []
+
+    def family(name, metric_type, help_text, samples):
+        lines.append("# HELP {0} {1}".format(name, help_text))
+        lines.append("# TYPE {0} {1}".format(name, metric_type))
+        for suffix, labels, value in samples:
+            label_text = "{" + ",".join('{0}="{1}"'.format(key, label) for key, label in labels) + "}" if labels else ""
+            lines.append("{0}{1}{2} {3}".format(name, suffix, label_text, _format_value(value)))
+
+    family(
+        "alive_forever_state",
+        "gauge",
+        "Current runtime state; 1 for the active one.",
+        [("", [("state", state)], 1 if state == snapshot.state else 0) for state in states],
+    )
+    family("alive_forever_session_activities", "counter", "Activities sent since the app started.", [("_total", [], snapshot.session_activities)])
+    family("alive_forever_lifetime_activities", "counter", "Activities sent over every run.", [("_total", [], snapshot.lifetime_activities)])
+    family("alive_forever_skipped_activities", "counter", "Due activities that were not sent.", [("_total", [], snapshot.skipped_activities)])
+    family("alive_forever_failed_activities", "counter", "Activities whose input injection failed.", [("_total", [], snapshot.failed_activities)])
+    family(
+        "alive_forever_next_transition_timestamp_seconds",
+        "gauge",
+        "Unix time of the next schedule transition; NaN when none is coming.",
+        [("", [], snapshot.next_transition_at)],
+    )
+    family("alive_forever_start_time_seconds", "gauge", "Unix time the app started.", [("", [], snapshot.started_at)])
+    family(
+        "alive_forever_tick_duration_seconds",
+        "summary",
+        "Time spent in activity loop ticks.",
+        [("_count", [], tick_count), ("_sum", [], float(tick_seconds_sum))],
+    )
+    family("alive_forever_tick_duration_max_seconds", "gauge", "Longest activity loop tick so far.", [("", [], float(tick_seconds_max))])
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsTextfileExporter:
+    """Writes an OpenMetrics file into ``directory`` from the activity loop's own wakeups.
+
+    The file is written to a ``.part`` file and moved into place with ``os.replace``, so a
+    scraper never reads half a file. Times are exported as Unix timestamps rather than
+    durations, so the file only changes when something happens: a state change, an
+    activity, a skip or failure, or a new next transition. Tick timing changes every tick
+    and alone only refreshes the file every ``REFRESH_SECONDS``.
+    """
+
+    REFRESH_SECONDS = 60
+
+    def __init__(self, directory, states, clock):
+        self.directory = Path(directory)
+        self.path = self.directory / METRICS_FILE_NAME
+        self.states = tuple(states)
+        self.clock = clock
+        self.tick_count = 0
+        self.tick_seconds_sum = 0.0
+        self.tick_seconds_max = 0.0
+        self.write_count = 0
+        self._written_snapshot = None
+        self._written_tick_count = 0
+        self._written_at = None
+
+    def record_tick(self, seconds):
+        self.tick_count += 1
+        self.tick_seconds_sum += seconds
+        self.tick_seconds_max = max(self.tick_seconds_max, seconds)
+
+    def export(self, snapshot):
+        """Write the file if ``snapshot`` or stale tick timing calls for it; return True if written."""
+        current_time = self.clock.monotonic()
+        if snapshot == self._written_snapshot:
+            if self.tick_count == self._written_tick_count or current_time - self._written_at < self.REFRESH_SECONDS:
+                return False
+
+        text = render_openmetrics(snapshot, self.states, self.tick_count, self.tick_seconds_sum, self.tick_seconds_max)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_name(self.path.name + ".part")
+        with open(partial, "w", encoding="utf-8", newline="\n") as handle:
+            handle.write(text)
+        os.replace(partial, self.path)
+
+        self._written_snapshot = snapshot
+        self._written_tick_count = self.tick_count
+        self._written_at = current_time
+        self.write_count += 1
+        return True
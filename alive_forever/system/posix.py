@@ -0,0 +1,118 @@
+"""POSIX host support: an ``fcntl`` instance lock, ``/proc`` process listing, and stand-ins for input and startup.
+
+Linux and macOS have no portable way to inject input or register a login item, so this
+backend exists to run the app, its benchmarks and its soak tests on build agents, not
+to keep anyone's presence alive.
+"""
+
+import fcntl
+import os
+import sys
+from pathlib import Path
+
+from alive_forever.system.host import APP_NAME, APP_PATHS, HostPlatform
+
+
+class LockFileInstance:
+    """Single-instance guard holding an exclusive ``flock`` on ``<name>.lock`` in ``directory``.
+
+    The kernel drops the lock when the process exits, so a crash never leaves a stale
+    lock behind.
+    """
+
+    def __init__(self, name, directory):
+        self.path = directory / "{0}.lock".format(name)
+        self.handle = None
+
+    def acquire(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.path, "a+", encoding="ascii")
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        handle.truncate(0)
+        handle.write(str(os.getpid()))
+        handle.flush()
+        self.handle = handle
+        return True
+
+    def release(self):
+        if self.handle:
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+            self.handle.close()
+            self.handle = None
+
+
+class CountingInputBackend:
+    """Counts activities instead of sending them."""
+
+    def __init__(self):
+        self.sent_count = 0
+        self.last_activity_type = None
+
+    def send_activity(self, activity_type):
+        self.sent_count += 1
+        self.last_activity_type = activity_type
+
+
+class ProcProcessEnumerator:
+    """Lists running process names from ``/proc``; returns None where there is no ``/proc``.
+
+    ``comm`` is cut at 15 characters, so a name that long is read from ``cmdline`` instead.
+    """
+
+    COMM_LENGTH = 15
+
+    def __init__(self, proc_dir="/proc"):
+        self.proc_dir = Path(proc_dir)
+
+    def process_names(self):
+        try:
+            entries = [entry for entry in os.scandir(self.proc_dir) if entry.name.isdigit()]
+        except FileNotFoundError:
+            return None
+        names = set()
+        for entry in entries:
+            # Processes can exit between the listing and the read.
+            try:
+                with open(os.path.join(entry.path, "comm"), "rb") as handle:
+                    name = handle.read().rstrip(b"\n").decode("utf-8", errors="replace")
+                if len(name) >= self.COMM_LENGTH:
+                    with open(os.path.join(entry.path, "cmdline"), "rb") as handle:
+                        argv0 = handle.read().split(b"\0", 1)[0].decode("utf-8", errors="replace")
+                    name = os.path.basename(argv0) or name
+            except OSError:
+                continue
+            names.add(name)
+        return names
+
+
+class PosixPlatform(HostPlatform):
+    def __init__(self, lock_dir=None):
+        self.lock_dir = lock_dir or APP_PATHS.runtime_dir
+        # Startup registration only lasts for this process.
+        self._startup_command = None
+
+    def create_instance_lock(self, name):
+        return LockFileInstance(name, self.lock_dir)
+
+    def create_input_backend(self):
+        return CountingInputBackend()
+
+    def create_process_enumerator(self):
+        return ProcProcessEnumerator()
+
+    def build_startup_command(self, script_path):
+        return '"{0}" "{1}"'.format(sys.executable, script_path)
+
+    def is_startup_enabled(self):
+        return self._startup_command is not None
+
+    def set_startup_enabled(self, enabled, startup_command, logger):
+        self._startup_command = startup_command if enabled else None
+        logger.info("%s startup registration for this session only", "Enabled" if enabled else "Disabled")
+
+    def show_message_box(self, message, title=APP_NAME):
+        print("{0}: {1}".format(title, message), file=sys.stderr)
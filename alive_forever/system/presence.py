@@ -0,0 +1,165 @@
+"""Presence verification by tailing the Teams client's local log for availability changes."""
+
+import glob
+import os
+import re
+from collections import namedtuple
+from pathlib import Path
+
+
+PresenceChange = namedtuple("PresenceChange", ["status", "observed_at", "text"])
+
+# Classic Teams logs "(current state: Away -> Available)"; the new client logs "availability to Available".
+TEAMS_PRESENCE_PATTERN = (
+    r"(?:current state: \w+ -> |availability(?: changed)?(?: to|:|=) ?)"
+    r"(?P<status>Available|Away|BeRightBack|Busy|DoNotDisturb|InAMeeting|InACall|OnThePhone|Presenting|Offline)\b"
+)
+PRESENT_STATUSES = ("Available", "Busy", "DoNotDisturb", "InAMeeting", "InACall", "OnThePhone", "Presenting")
+AWAY_STATUSES = ("Away", "BeRightBack", "Offline")
+
+
+def compile_presence_pattern(pattern=None):
+    """Compile ``pattern``, which must have a ``status`` group; raises ValueError otherwise."""
+    try:
+        compiled = re.compile(pattern or TEAMS_PRESENCE_PATTERN, re.IGNORECASE)
+    except re.error as error:
+        raise ValueError("Presence pattern is not a valid regular expression: {0}".format(error))
+    if "status" not in compiled.groupindex:
+        raise ValueError("Presence pattern needs a (?P<status>...) group")
+    return compiled
+
+
+def regex_presence_parser(pattern=None):
+    """Return a parser mapping a log line to its status name, or None when the line has none.
+
+    Status names are matched case-insensitively and returned in the spelling of
+    ``PRESENT_STATUSES`` and ``AWAY_STATUSES`` when they are one of those.
+    """
+    compiled = compile_presence_pattern(pattern)
+    known = {status.lower(): status for status in PRESENT_STATUSES + AWAY_STATUSES}
+
+    def parse(line):
+        match = compiled.search(line)
+        if match is None:
+            return None
+        status = match.group("status").replace(" ", "")
+        return known.get(status.lower(), status)
+
+    return parse
+
+
+class LogTail:
+    """Returns the complete lines appended to a file since the previous ``read_new_lines`` call.
+
+    Only the bytes past the saved offset are read. A new file identity or a file shorter
+    than the offset means the log was rotated, and the new file is read from its start.
+    ``path`` may be a glob such as ``MSTeams_*.log``; the newest match is followed.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.current_file = None
+        self._identity = None
+        self._offset = None
+
+    def _resolve(self):
+        if not glob.has_magic(self.path):
+            return Path(self.path)
+        matches = glob.glob(self.path)
+        if not matches:
+            return None
+        return Path(max(matches, key=lambda match: (os.path.getmtime(match), match)))
+
+    def read_new_lines(self, initial_bytes=0):
+        """Return new lines, oldest first.
+
+        The first call reads at most the last ``initial_bytes`` of the file, so the
+        current state can be found without reading the whole history.
+        """
+        current_file = self._resolve()
+        try:
+            stat = os.stat(current_file) if current_file is not None else None
+        except OSError:
+            stat = None
+        if stat is None:
+            # A log that appears later is new in full.
+            if self._offset is None:
+                self._offset = 0
+            return []
+
+        identity = (str(current_file), stat.st_dev, stat.st_ino)
+        if self._offset is None:
+            self._offset = max(0, stat.st_size - initial_bytes)
+        elif identity != self._identity or stat.st_size < self._offset:
+            self._offset = 0
+        self._identity = identity
+        self.current_file = current_file
+        if stat.st_size <= self._offset:
+            return []
+
+        with open(current_file, "rb") as handle:
+            handle.seek(self._offset)
+            data = handle.read(stat.st_size - self._offset)
+        end = data.rfind(b"\n") + 1
+        # A partial last line is read again once its newline arrives.
+        self._offset += end
+        return [line.rstrip(b"\r").decode("utf-8", errors="replace") for line in data[:end].split(b"\n")[:-1]]
+
+
+class PresenceVerifier:
+    """Tracks the presence the Teams client reports, from its local log.
+
+    ``poll`` reads only what was appended since the last poll and returns the changes.
+    A present status counts as confirmed for ``FRESH_SECONDS`` after it was last seen,
+    since Teams writes a line only when the status changes. ``parser`` maps one log
+    line to a status name or None, so tests and other clients can bring their own.
+    """
+
+    FRESH_SECONDS = 120
+    INITIAL_SCAN_BYTES = 64 * 1024
+
+    def __init__(self, path, clock, logger, parser=None):
+        self.tail = LogTail(path)
+        self.clock = clock
+        self.logger = logger
+        self.parser = parser or regex_presence_parser()
+        self.status = None
+        self.confirmed_at = None
+        self._started = False
+
+    def poll(self, now_monotonic=None):
+        current_time = self.clock.monotonic() if now_monotonic is None else now_monotonic
+        first_poll, self._started = not self._started, True
+        try:
+            lines = self.tail.read_new_lines(self.INITIAL_SCAN_BYTES if first_poll else 0)
+        except OSError:
+            self.logger.debug("Could not read presence log %s", self.tail.path, exc_info=True)
+            return []
+
+        changes = []
+        for line in lines:
+            status = self.parser(line)
+            if status is None:
+                continue
+            if first_poll:
+                # History from before the app started gives the starting state but confirms nothing.
+                self.status = status
+                continue
+            self.confirmed_at = current_time
+            if status != self.status:
+                self.status = status
+                changes.append(PresenceChange(status, current_time, line))
+        if first_poll and self.status:
+            self.logger.info("Teams presence was last logged as %s", self.status)
+        return changes
+
+    def lag_seconds(self, now_monotonic=None):
+        """Seconds since the log last reported a status, or None before it reported one."""
+        if self.confirmed_at is None:
+            return None
+        current_time = self.clock.monotonic() if now_monotonic is None else now_monotonic
+        return max(0.0, current_time - self.confirmed_at)
+
+    def is_confirmed_present(self, now_monotonic=None):
+        lag = self.lag_seconds(now_monotonic)
+        return self.status in PRESENT_STATUSES and lag is not None and lag <= self.FRESH_SECONDS
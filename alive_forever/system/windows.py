@@ -1,56 +1,37 @@
-"""Windows-specific paths, startup registration, logging, and singleton helpers."""
+"""Windows startup registration, input injection, process listing, and singleton helpers."""
 
 import ctypes
-import logging
-import os
+from ctypes import wintypes
 import sys
+import time
 import winreg
-from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
+from alive_forever.system.host import APP_NAME, HostPlatform
+
 
-APP_NAME = "Alive Forever"
-APP_FOLDER_NAME = "AliveForever"
-APP_DIR = Path(os.getenv("APPDATA") or Path.cwd()) / APP_FOLDER_NAME
-LOG_DIR = APP_DIR / "logs"
-CONFIG_FILE = APP_DIR / "config.json"
-ROOT_DIR = Path(__file__).resolve().parents[2]
-LEGACY_CONFIG_FILE = ROOT_DIR / "config.json"
-ICON_FILE = ROOT_DIR / "icon.png"
-ICO_FILE = ROOT_DIR / "icon.ico"
 STARTUP_KEY = r"Software\Microsoft\Windows\CurrentVersion\Run"
-MUTEX_NAME = "AliveForever.Singleton"
 ERROR_ALREADY_EXISTS = 183
-
-
-def ensure_app_directories():
-    APP_DIR.mkdir(parents=True, exist_ok=True)
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-
-
-def setup_logging():
-    logger = logging.getLogger("alive_forever")
-    if logger.handlers:
-        return logger
-
-    ensure_app_directories()
-    logger.setLevel(logging.INFO)
-    formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
-
-    file_handler = RotatingFileHandler(
-        LOG_DIR / "alive_forever.log",
-        maxBytes=1024 * 1024,
-        backupCount=5,
-        encoding="utf-8",
-    )
-    file_handler.setFormatter(formatter)
-
-    stream_handler = logging.StreamHandler()
-    stream_handler.setFormatter(formatter)
-
-    logger.addHandler(file_handler)
-    logger.addHandler(stream_handler)
-    return logger
+VK_F15 = 0x7E
+KEYEVENTF_KEYUP = 0x0002
+MOUSEEVENTF_MOVE = 0x0001
+TH32CS_SNAPPROCESS = 0x00000002
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+
+class PROCESSENTRY32W(ctypes.Structure):
+    _fields_ = [
+        ("dwSize", wintypes.DWORD),
+        ("cntUsage", wintypes.DWORD),
+        ("th32ProcessID", wintypes.DWORD),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", wintypes.DWORD),
+        ("cntThreads", wintypes.DWORD),
+        ("th32ParentProcessID", wintypes.DWORD),
+        ("pcPriClassBase", ctypes.c_long),
+        ("dwFlags", wintypes.DWORD),
+        ("szExeFile", ctypes.c_wchar * 260),
+    ]
 
 
 class SingleInstance:
@@ -68,6 +49,47 @@ class SingleInstance:
             self.handle = None
 
 
+class WindowsInputBackend:
+    def send_activity(self, activity_type):
+        if activity_type in ("F15 Key (Recommended)", "Both"):
+            ctypes.windll.user32.keybd_event(VK_F15, 0, 0, 0)
+            ctypes.windll.user32.keybd_event(VK_F15, 0, KEYEVENTF_KEYUP, 0)
+
+        if activity_type in ("Mouse Jiggle", "Both"):
+            ctypes.windll.user32.mouse_event(MOUSEEVENTF_MOVE, 1, 0, 0, 0)
+            time.sleep(0.05)
+            ctypes.windll.user32.mouse_event(MOUSEEVENTF_MOVE, -1, 0, 0, 0)
+
+
+class SnapshotProcessEnumerator:
+    """Lists running executables with one ``CreateToolhelp32Snapshot`` call."""
+
+    def __init__(self):
+        kernel32 = ctypes.windll.kernel32
+        kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+        kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+        kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+        kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self.kernel32 = kernel32
+
+    def process_names(self):
+        snapshot = self.kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+        if snapshot is None or snapshot == INVALID_HANDLE_VALUE:
+            raise ctypes.WinError()
+        try:
+            entry = PROCESSENTRY32W()
+            entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+            names = set()
+            found = self.kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+            while found:
+                names.add(entry.szExeFile)
+                found = self.kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+            return names
+        finally:
+            self.kernel32.CloseHandle(snapshot)
+
+
 def build_startup_command(script_path):
     if getattr(sys, "frozen", False):
         return '"{0}"'.format(sys.executable)
@@ -107,4 +129,27 @@ def set_startup_enabled(enabled, startup_command, logger):
 
 
 def show_message_box(message, title=APP_NAME):
-    ctypes.windll.user32.MessageBoxW(None, message, title, 0)
\ No newline at end of file
+    ctypes.windll.user32.MessageBoxW(None, message, title, 0)
+
+
+class WindowsPlatform(HostPlatform):
+    def create_instance_lock(self, name):
+        return SingleInstance(name)
+
+    def create_input_backend(self):
+        return WindowsInputBackend()
+
+    def create_process_enumerator(self):
+        return SnapshotProcessEnumerator()
+
+    def build_startup_command(self, script_path):
+        return build_startup_command(script_path)
+
+    def is_startup_enabled(self):
+        return is_startup_enabled()
+
+    def set_startup_enabled(self, enabled, startup_command, logger):
+        set_startup_enabled(enabled, startup_command, logger)
+
+    def show_message_box(self, message, title=APP_NAME):
+        show_message_box(message, title)
@@ -1,38 +1,31 @@
 """Tk settings window for Alive Forever."""
 
 import tkinter as tk
-from tkinter import messagebox
-
-from alive_forever.core.config import PRESET_CONFIGS, VALID_ACTIVITY_TYPES, apply_preset, clamp_interval
-from alive_forever.core.scheduler import DAY_LABELS, DAY_ORDER, ScheduleConfig, TimeWindow, describe_schedule, parse_time_string
-from alive_forever.system.windows import ICON_FILE
-
-
-class ModernStyle:
-    WINDOW_BG = "#c0c0c0"
-    PANEL_BG = "#d4d0c8"
-    PANEL_INNER = "#c0c0c0"
-    FIELD_BG = "#ffffff"
-    TITLE_BG = "#000080"
-    TITLE_TEXT = "#ffffff"
-    TEXT = "#000000"
-    TEXT_DIM = "#3f3f3f"
-    BORDER_DARK = "#404040"
-    BORDER_SHADOW = "#808080"
-    BORDER_LIGHT = "#dfdfdf"
-    BORDER_HIGHLIGHT = "#ffffff"
-    SELECT_BG = "#000080"
-    SELECT_TEXT = "#ffffff"
-    SUCCESS = "#008000"
-    WARNING = "#800000"
-    PAUSED = "#404040"
-    FONT_FAMILY = "MS Sans Serif"
-    FONT_TITLE = (FONT_FAMILY, 18, "bold")
-    FONT_SUBTITLE = (FONT_FAMILY, 10)
-    FONT_BODY = (FONT_FAMILY, 10)
-    FONT_BODY_BOLD = (FONT_FAMILY, 10, "bold")
-    FONT_CAPTION = (FONT_FAMILY, 8, "bold")
-    FONT_SMALL = (FONT_FAMILY, 8)
+from dataclasses import replace
+from tkinter import messagebox, simpledialog
+
+from alive_forever.core.config import VALID_ACTIVITY_TYPES, VALID_CATCH_UP_POLICIES, clamp_interval
+from alive_forever.core.notifications import parse_quiet_hours
+from alive_forever.core.targets import parse_process_names
+from alive_forever.core.scheduler import (
+    DAY_LABELS,
+    DAY_ORDER,
+    ScheduleConfig,
+    TimeWindow,
+    describe_schedule,
+    format_duration,
+    get_next_transition,
+    iter_transitions,
+    parse_time_string,
+    resolve_timezone,
+    seconds_until,
+    timeline_rows,
+    wall_clock,
+)
+from alive_forever.system.logreader import LogReader, line_matches
+from alive_forever.system.logs import LOG_FILE_NAME
+from alive_forever.system.host import ICON_FILE, LOG_DIR
+from alive_forever.ui.style import ModernStyle
 
 
 class SettingsWindow:
@@ -40,17 +33,51 @@ class SettingsWindow:
     WINDOW_HEIGHT = 860
     MIN_WINDOW_HEIGHT = 520
     WINDOW_MARGIN = 80
-
-    def __init__(self, app):
+    EVENT_BATCH_SIZE = 100
+    # Followed lines are added on every refresh; older ones beyond this drop off the bottom.
+    EVENT_LIST_LIMIT = 500
+    EVENT_LEVELS = ["All", "INFO", "WARNING", "ERROR"]
+    WINDOW_DEFAULT_ACTIVITY = "App Default"
+    PAUSE_PROMPT = "Choose..."
+    PAUSE_UNTIL_TRANSITION = "Until Next Change"
+    PAUSE_UNTIL_TIME = "Until Time..."
+    LAZY_SECTION_MARGIN = 120
+    TIMELINE_WIDTH = 520
+    TIMELINE_LABEL_WIDTH = 56
+    TIMELINE_HEADER_HEIGHT = 14
+    TIMELINE_ROW_HEIGHT = 16
+    REFRESH_MS = 1000
+    EVENT_FILTER_DELAY_MS = 300
+
+    def __init__(self, app, on_close=None):
         self.app = app
+        self.on_close = on_close
         self.window = None
         self.is_open = False
         self._icon_photo = None
         self.window_day_vars = {}
         self.draft_windows = []
+        self._draft_labels = []
+        self._visible_indexes = None
+        self._preview_key = None
+        self._preview_expires_at = None
+        self._draft_revision = 0
+        self._log_reader = None
+        self._event_cursor = None
+        self._event_lines = []
         self._content_canvas = None
         self._content_frame = None
         self._content_scrollbar = None
+        self._pending_sections = []
+        self._refresh_job = None
+        self._event_reload_job = None
+        self.preset_menu = None
+        self.windows_listbox = None
+        self.schedule_preview_label = None
+        self.timeline_canvas = None
+        self._timeline_rows = []
+        self._preview_schedule = None
+        self.events_listbox = None
 
     @classmethod
     def calculate_window_geometry(cls, screen_width, screen_height):
@@ -62,25 +89,29 @@ class SettingsWindow:
         return width, height, x_pos, y_pos
 
     def build_schedule_windows_for_save(self):
-        windows = [TimeWindow(**window.to_dict()) for window in self.draft_windows]
+        windows = list(self.draft_windows)
 
-        if not hasattr(self, "window_start_var") or not hasattr(self, "window_end_var") or not hasattr(self, "windows_listbox"):
+        if getattr(self, "windows_listbox", None) is None:
             return windows
 
-        selection = self.windows_listbox.curselection()
-        if selection:
-            windows[selection[0]] = self._window_from_editor()
+        index = self._selected_draft_index()
+        if index is not None:
+            windows[index] = self._window_from_editor()
         return windows
 
     def show(self):
         if self.window and self.window.winfo_exists():
-            self.window.deiconify()
+            if not self.is_open:
+                # Reopening a withdrawn window only reloads the bound variables; the widgets stay built.
+                self.is_open = True
+                self._load_config_values()
+                self._reload_events()
+                self.window.deiconify()
+                self._refresh_runtime_display()
             self.window.lift()
             self.window.focus_force()
             return
 
-        self.draft_windows = [TimeWindow(**window.to_dict()) for window in self.app.config.schedule.windows]
-
         parent = self.app.root if self.app.root else None
         self.window = tk.Toplevel(parent) if parent else tk.Tk()
         self.window.title("Alive Forever - Settings")
@@ -97,18 +128,75 @@ class SettingsWindow:
         self.window.resizable(True, True)
         self.window.geometry("{0}x{1}+{2}+{3}".format(width, height, x_pos, y_pos))
 
-        if ICON_FILE.exists():
-            try:
+        try:
+            if self._icon_photo is None and ICON_FILE.exists():
                 self._icon_photo = tk.PhotoImage(file=str(ICON_FILE))
+            if self._icon_photo is not None:
                 self.window.iconphoto(True, self._icon_photo)
-            except Exception:
-                self.app.logger.debug("Could not set Tk icon", exc_info=True)
+        except Exception:
+            self.app.logger.debug("Could not set Tk icon", exc_info=True)
 
+        self._create_variables(self.window)
         self._create_ui()
-        self._populate_windows_list()
+        self._load_config_values()
         self._refresh_runtime_display()
 
+    def _create_variables(self, master):
+        self.preset_var = tk.StringVar(master=master)
+        self.pause_choice_var = tk.StringVar(master=master, value=self.PAUSE_PROMPT)
+        self.interval_var = tk.StringVar(master=master)
+        self.activity_type_var = tk.StringVar(master=master)
+        self.resume_catch_up_var = tk.StringVar(master=master)
+        self.startup_var = tk.BooleanVar(master=master)
+        self.minimized_var = tk.BooleanVar(master=master)
+        self.notifications_var = tk.BooleanVar(master=master)
+        self.quiet_hours_var = tk.StringVar(master=master)
+        self.target_processes_var = tk.StringVar(master=master)
+        self.verbose_log_var = tk.BooleanVar(master=master)
+        self.schedule_enabled_var = tk.BooleanVar(master=master)
+        self.schedule_timezone_var = tk.StringVar(master=master)
+        self.window_filter_var = tk.StringVar(master=master)
+        self.window_start_var = tk.StringVar(master=master)
+        self.window_end_var = tk.StringVar(master=master)
+        self.window_interval_var = tk.StringVar(master=master)
+        self.window_rule_var = tk.StringVar(master=master)
+        self.window_activity_var = tk.StringVar(master=master, value=self.WINDOW_DEFAULT_ACTIVITY)
+        self.window_day_vars = {day_code: tk.BooleanVar(master=master) for day_code in DAY_ORDER}
+        self.event_level_var = tk.StringVar(master=master, value=self.EVENT_LEVELS[0])
+        self.event_filter_var = tk.StringVar(master=master)
+
+        self.window_filter_var.trace_add("write", lambda *_: self._populate_windows_list())
+        self.event_filter_var.trace_add("write", lambda *_: self._schedule_event_reload())
+
+    def _load_config_values(self):
+        config = self.app.config
+        self._refresh_profile_options()
+        self.preset_var.set(config.profile_name)
+        self.interval_var.set(str(config.interval))
+        self.activity_type_var.set(config.activity_type)
+        self.resume_catch_up_var.set(config.resume_catch_up)
+        self.startup_var.set(self.app.is_startup_enabled())
+        self.minimized_var.set(config.start_minimized)
+        self.notifications_var.set(config.notifications_enabled)
+        self.quiet_hours_var.set(config.quiet_hours or "")
+        self.target_processes_var.set(", ".join(config.target_processes))
+        self.verbose_log_var.set(config.verbose_activity_log)
+        self.schedule_enabled_var.set(config.schedule.enabled)
+        self.schedule_timezone_var.set(config.schedule.timezone or "")
+        self._set_draft_windows(config.schedule.windows)
+        self._show_window_in_editor(self.draft_windows[0] if self.draft_windows else None)
+        # Clearing the filter repopulates the window list through its trace.
+        self.window_filter_var.set("")
+
     def _create_ui(self):
+        self._pending_sections = []
+        self._log_reader = None
+        self.windows_listbox = None
+        self.schedule_preview_label = None
+        self.timeline_canvas = None
+        self._timeline_rows = []
+        self.events_listbox = None
+
         shell = tk.Frame(self.window, bg=ModernStyle.WINDOW_BG, bd=2, relief=tk.RAISED)
         shell.pack(fill=tk.BOTH, expand=True, padx=4, pady=4)
 
@@ -155,7 +243,7 @@ class SettingsWindow:
             bd=2,
         )
         self._content_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self._content_canvas.configure(yscrollcommand=self._content_scrollbar.set)
+        self._content_canvas.configure(yscrollcommand=self._on_content_scroll)
 
         main_frame = tk.Frame(self._content_canvas, bg=ModernStyle.WINDOW_BG)
         self._content_frame = main_frame
@@ -213,6 +301,9 @@ class SettingsWindow:
         )
         self.status_detail_label.pack(fill=tk.X)
 
+        pause_options = self._pause_duration_labels() + [self.PAUSE_UNTIL_TRANSITION, self.PAUSE_UNTIL_TIME]
+        self._create_option_row(status_card, "Timed Pause", self.pause_choice_var, pause_options, self._apply_timed_pause)
+
         stats_row = tk.Frame(status_card, bg=ModernStyle.PANEL_BG)
         stats_row.pack(fill=tk.X, pady=(10, 0))
 
@@ -229,30 +320,76 @@ class SettingsWindow:
         self.last_activity_label = tk.Label(totals_row, text="Last activity: --", font=ModernStyle.FONT_SMALL, fg=ModernStyle.TEXT_DIM, bg=ModernStyle.PANEL_BG)
         self.last_activity_label.pack(side=tk.RIGHT)
 
-        general_card = self._create_card(main_frame, "General")
+        self.presence_label = tk.Label(status_card, text="", font=ModernStyle.FONT_SMALL, fg=ModernStyle.TEXT_DIM, bg=ModernStyle.PANEL_BG, anchor="w")
 
-        self.preset_var = tk.StringVar(value=self.app.config.profile_name)
-        self._create_option_row(general_card, "Preset", self.preset_var, list(PRESET_CONFIGS.keys()), self._apply_preset)
+        general_card = self._create_card(main_frame, "General")
 
-        self.interval_var = tk.StringVar(value=str(self.app.config.interval))
+        self.preset_menu = self._create_option_row(general_card, "Profile", self.preset_var, self.app.profiles.names(), self._apply_preset)
         self._create_entry_row(general_card, "Activity Interval", self.interval_var, "seconds")
-
-        self.activity_type_var = tk.StringVar(value=self.app.config.activity_type)
         self._create_option_row(general_card, "Activity Type", self.activity_type_var, VALID_ACTIVITY_TYPES)
-
-        self.startup_var = tk.BooleanVar(value=self.app.is_startup_enabled())
+        self._create_option_row(general_card, "After Sleep", self.resume_catch_up_var, VALID_CATCH_UP_POLICIES)
         self._create_toggle_row(general_card, "Start with Windows", self.startup_var)
-
-        self.minimized_var = tk.BooleanVar(value=self.app.config.start_minimized)
         self._create_toggle_row(general_card, "Start Minimized", self.minimized_var)
-
-        self.notifications_var = tk.BooleanVar(value=self.app.config.notifications_enabled)
         self._create_toggle_row(general_card, "Notifications", self.notifications_var)
+        self._create_entry_row(general_card, "Quiet Hours", self.quiet_hours_var, "e.g. 22:00-07:00", width=12)
+        self._create_entry_row(general_card, "Only While Running", self.target_processes_var, "e.g. ms-teams.exe", width=24)
+        self._create_toggle_row(general_card, "Log Every Activity", self.verbose_log_var)
+
+        self._add_lazy_section(main_frame, self._create_schedule_card)
+        self._add_lazy_section(main_frame, self._create_events_card)
+
+        actions = tk.Frame(main_frame, bg=ModernStyle.WINDOW_BG)
+        actions.pack(fill=tk.X, pady=(20, 0))
+        self._create_button(actions, "Save Settings", self._save_settings, primary=True).pack(fill=tk.X, ipady=4)
+        self._create_button(actions, "Save as Profile...", self._save_as_profile).pack(fill=tk.X, pady=(6, 0))
+
+        tk.Label(
+            main_frame,
+            text="System log: {0}".format(LOG_DIR),
+            font=ModernStyle.FONT_SMALL,
+            fg=ModernStyle.TEXT_DIM,
+            bg=ModernStyle.WINDOW_BG,
+        ).pack(pady=(15, 0))
+
+    def _add_lazy_section(self, parent, builder):
+        placeholder = tk.Frame(parent, bg=ModernStyle.WINDOW_BG)
+        placeholder.pack(fill=tk.X)
+        self._pending_sections.append((placeholder, builder))
 
-        schedule_card = self._create_card(main_frame, "Schedule")
+    def _build_visible_sections(self):
+        """Build the next pending card once its placeholder scrolls within reach of the viewport.
 
-        self.schedule_enabled_var = tk.BooleanVar(value=self.app.config.schedule.enabled)
+        Only the first pending card is considered: building it moves the ones below, and
+        the resulting ``<Configure>`` brings us back here with their real positions.
+        """
+        if not self._pending_sections or not self._content_canvas:
+            return
+        placeholder, builder = self._pending_sections[0]
+        visible_bottom = self._content_canvas.canvasy(self._content_canvas.winfo_height())
+        if placeholder.winfo_y() <= visible_bottom + self.LAZY_SECTION_MARGIN:
+            self._pending_sections.pop(0)
+            builder(placeholder)
+
+    def _create_schedule_card(self, parent):
+        schedule_card = self._create_card(parent, "Schedule")
         self._create_toggle_row(schedule_card, "Enable Schedule", self.schedule_enabled_var)
+        self._create_entry_row(schedule_card, "Time Zone", self.schedule_timezone_var, "blank = this PC", width=18)
+
+        filter_row = tk.Frame(schedule_card, bg=ModernStyle.PANEL_BG)
+        filter_row.pack(fill=tk.X, pady=(8, 0))
+        tk.Label(filter_row, text="Find Window", font=ModernStyle.FONT_BODY, fg=ModernStyle.TEXT, bg=ModernStyle.PANEL_BG).pack(side=tk.LEFT)
+        filter_entry = tk.Entry(
+            filter_row,
+            textvariable=self.window_filter_var,
+            font=ModernStyle.FONT_BODY,
+            bg=ModernStyle.FIELD_BG,
+            fg=ModernStyle.TEXT,
+            insertbackground=ModernStyle.TEXT,
+            relief=tk.SUNKEN,
+            bd=2,
+        )
+        filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(10, 0), ipady=2)
+        filter_entry.bind("<Return>", self._jump_to_next_match)
 
         list_row = tk.Frame(schedule_card, bg=ModernStyle.PANEL_BG)
         list_row.pack(fill=tk.X, pady=(8, 0))
@@ -282,13 +419,12 @@ class SettingsWindow:
         editor_card = tk.Frame(schedule_card, bg=ModernStyle.PANEL_BG, bd=2, relief=tk.GROOVE)
         editor_card.pack(fill=tk.X, pady=(12, 0))
 
-        self.window_start_var = tk.StringVar(value="09:00")
         self._create_entry_row(editor_card, "Window Start", self.window_start_var, "HH:MM")
-
-        self.window_end_var = tk.StringVar(value="17:00")
         self._create_entry_row(editor_card, "Window End", self.window_end_var, "HH:MM")
+        self._create_entry_row(editor_card, "Window Interval", self.window_interval_var, "seconds, blank = app")
+        self._create_entry_row(editor_card, "Repeat Rule", self.window_rule_var, "blank = every week", width=24)
+        self._create_option_row(editor_card, "Window Activity", self.window_activity_var, [self.WINDOW_DEFAULT_ACTIVITY] + VALID_ACTIVITY_TYPES)
 
-        default_days = self.app.config.schedule.windows[0].days if self.app.config.schedule.windows else list(DAY_ORDER)
         days_frame = tk.Frame(editor_card, bg=ModernStyle.PANEL_BG)
         days_frame.pack(fill=tk.X, pady=8)
         tk.Label(days_frame, text="Window Days", font=ModernStyle.FONT_BODY, fg=ModernStyle.TEXT, bg=ModernStyle.PANEL_BG).pack(anchor="w")
@@ -296,12 +432,10 @@ class SettingsWindow:
         chips = tk.Frame(days_frame, bg=ModernStyle.PANEL_INNER, bd=2, relief=tk.SUNKEN)
         chips.pack(fill=tk.X, pady=(8, 0))
         for index, day_code in enumerate(DAY_ORDER):
-            day_var = tk.BooleanVar(value=day_code in default_days)
-            self.window_day_vars[day_code] = day_var
             check = tk.Checkbutton(
                 chips,
                 text=DAY_LABELS[day_code],
-                variable=day_var,
+                variable=self.window_day_vars[day_code],
                 bg=ModernStyle.PANEL_INNER,
                 fg=ModernStyle.TEXT,
                 activebackground=ModernStyle.PANEL_INNER,
@@ -326,17 +460,101 @@ class SettingsWindow:
         )
         self.schedule_preview_label.pack(fill=tk.X, pady=(10, 0))
 
-        actions = tk.Frame(main_frame, bg=ModernStyle.WINDOW_BG)
-        actions.pack(fill=tk.X, pady=(20, 0))
-        self._create_button(actions, "Save Settings", self._save_settings, primary=True).pack(fill=tk.X, ipady=4)
+        self.timeline_canvas = tk.Canvas(
+            schedule_card,
+            width=self.TIMELINE_WIDTH,
+            height=self.TIMELINE_HEADER_HEIGHT + 7 * self.TIMELINE_ROW_HEIGHT + 2,
+            bg=ModernStyle.PANEL_BG,
+            highlightthickness=0,
+            bd=0,
+        )
+        self.timeline_canvas.pack(anchor="w", pady=(8, 0))
+        self._draw_timeline_grid()
+        self._populate_windows_list()
 
-        tk.Label(
-            main_frame,
-            text="System log: %APPDATA%\\AliveForever\\logs",
+    def _create_events_card(self, parent):
+        events_card = self._create_card(parent, "Recent Events")
+        self._create_option_row(events_card, "Minimum Level", self.event_level_var, self.EVENT_LEVELS, lambda _: self._reload_events())
+        self._create_entry_row(events_card, "Contains", self.event_filter_var, "text", width=18)
+
+        self.events_listbox = tk.Listbox(
+            events_card,
+            height=8,
             font=ModernStyle.FONT_SMALL,
-            fg=ModernStyle.TEXT_DIM,
-            bg=ModernStyle.WINDOW_BG,
-        ).pack(pady=(15, 0))
+            bg=ModernStyle.FIELD_BG,
+            fg=ModernStyle.TEXT,
+            selectbackground=ModernStyle.SELECT_BG,
+            selectforeground=ModernStyle.SELECT_TEXT,
+            relief=tk.SUNKEN,
+            bd=2,
+            activestyle="none",
+            highlightthickness=0,
+        )
+        self.events_listbox.pack(fill=tk.X, pady=(8, 0))
+
+        self.older_events_btn = self._create_button(events_card, "Load Older", self._load_older_events)
+        self.older_events_btn.pack(anchor="e", pady=(6, 0))
+        self._log_reader = LogReader(LOG_DIR / LOG_FILE_NAME)
+        self._reload_events()
+
+    def _event_filters(self):
+        level = self.event_level_var.get()
+        return (None if level == self.EVENT_LEVELS[0] else level), self.event_filter_var.get().strip() or None
+
+    def _schedule_event_reload(self):
+        # Each keystroke in the filter box restarts the delay, so typing searches the logs once.
+        if not self.window:
+            return
+        if self._event_reload_job:
+            self.window.after_cancel(self._event_reload_job)
+        self._event_reload_job = self.window.after(self.EVENT_FILTER_DELAY_MS, self._run_event_reload)
+
+    def _run_event_reload(self):
+        self._event_reload_job = None
+        self._reload_events()
+
+    def _reload_events(self):
+        if not self._log_reader:
+            return
+        self.events_listbox.delete(0, tk.END)
+        self._event_lines = []
+        self._event_cursor = None
+        self._log_reader.follow()
+        self._load_older_events()
+
+    def _load_older_events(self):
+        level, text = self._event_filters()
+        try:
+            lines, self._event_cursor = self._log_reader.search(level, text, limit=self.EVENT_BATCH_SIZE, cursor=self._event_cursor)
+        except OSError:
+            self.app.logger.debug("Could not read log file", exc_info=True)
+            return
+        for line in lines:
+            self.events_listbox.insert(tk.END, line.text)
+        self._event_lines.extend(lines)
+        self.older_events_btn.config(state=tk.NORMAL if self._event_cursor else tk.DISABLED)
+
+    def _poll_events(self):
+        if not self._log_reader:
+            return
+        level, text = self._event_filters()
+        try:
+            new_lines = [line for line in self._log_reader.follow() if line_matches(line, level, text)]
+        except OSError:
+            return
+        for line in new_lines:
+            self.events_listbox.insert(0, line.text)
+            self._event_lines.insert(0, line)
+        if len(self._event_lines) > self.EVENT_LIST_LIMIT:
+            # Load Older then resumes right below the oldest line still shown.
+            self.events_listbox.delete(self.EVENT_LIST_LIMIT, tk.END)
+            del self._event_lines[self.EVENT_LIST_LIMIT:]
+            self._event_cursor = self._log_reader.cursor_before(self._event_lines[-1])
+            self.older_events_btn.config(state=tk.NORMAL if self._event_cursor else tk.DISABLED)
+
+    def _on_content_scroll(self, first, last):
+        self._content_scrollbar.set(first, last)
+        self._build_visible_sections()
 
     def _on_content_configure(self):
         if self._content_canvas and self._content_frame:
@@ -345,6 +563,7 @@ class SettingsWindow:
     def _on_canvas_configure(self, canvas_window, width):
         if self._content_canvas:
             self._content_canvas.itemconfigure(canvas_window, width=width)
+            self._build_visible_sections()
 
     def _on_mousewheel(self, event):
         if not self.window or not self.window.winfo_exists() or not self._content_canvas:
@@ -400,7 +619,7 @@ class SettingsWindow:
         button.config(padx=12, pady=4)
         return button
 
-    def _create_entry_row(self, parent, label_text, variable, suffix):
+    def _create_entry_row(self, parent, label_text, variable, suffix, width=8):
         row = tk.Frame(parent, bg=ModernStyle.PANEL_BG)
         row.pack(fill=tk.X, pady=8)
         tk.Label(row, text=label_text, font=ModernStyle.FONT_BODY, fg=ModernStyle.TEXT, bg=ModernStyle.PANEL_BG).pack(side=tk.LEFT)
@@ -409,7 +628,7 @@ class SettingsWindow:
         entry = tk.Entry(
             right,
             textvariable=variable,
-            width=8,
+            width=width,
             font=ModernStyle.FONT_BODY,
             bg=ModernStyle.FIELD_BG,
             fg=ModernStyle.TEXT,
@@ -447,6 +666,7 @@ class SettingsWindow:
             font=ModernStyle.FONT_BODY,
         )
         menu.pack()
+        return menu
 
     def _create_toggle_row(self, parent, label_text, variable):
         row = tk.Frame(parent, bg=ModernStyle.PANEL_BG)
@@ -468,12 +688,56 @@ class SettingsWindow:
         )
         toggle.pack(side=tk.RIGHT)
 
+    def _set_draft_windows(self, windows):
+        # TimeWindow instances are immutable, so the draft can share them until save.
+        self.draft_windows = list(windows)
+        self._draft_labels = [window.label() for window in self.draft_windows]
+        self._draft_revision += 1
+
+    def _filter_text(self):
+        if not hasattr(self, "window_filter_var"):
+            return ""
+        return self.window_filter_var.get().strip().lower()
+
+    def _matches_filter(self, index):
+        text = self._filter_text()
+        return not text or text in self._draft_labels[index].lower()
+
+    def _selected_draft_index(self):
+        selection = self.windows_listbox.curselection()
+        if not selection:
+            return None
+        visible_indexes = getattr(self, "_visible_indexes", None)
+        if visible_indexes is None:
+            return selection[0]
+        return visible_indexes[selection[0]]
+
     def _populate_windows_list(self):
+        if self.windows_listbox is None:
+            return
         self.windows_listbox.delete(0, tk.END)
-        for window in self.draft_windows:
-            self.windows_listbox.insert(tk.END, window.label())
+        text = self._filter_text()
+        if text:
+            self._visible_indexes = [index for index, label in enumerate(self._draft_labels) if text in label.lower()]
+        else:
+            self._visible_indexes = list(range(len(self._draft_labels)))
+        if self._visible_indexes:
+            self.windows_listbox.insert(tk.END, *[self._draft_labels[index] for index in self._visible_indexes])
         self._update_schedule_preview()
 
+    def _select_row(self, row):
+        self.windows_listbox.selection_clear(0, tk.END)
+        self.windows_listbox.selection_set(row)
+        self.windows_listbox.see(row)
+
+    def _jump_to_next_match(self, event=None):
+        if not self._visible_indexes:
+            return
+        selection = self.windows_listbox.curselection()
+        row = (selection[0] + 1) % len(self._visible_indexes) if selection else 0
+        self._select_row(row)
+        self._load_selected_window()
+
     def _window_from_editor(self):
         start = self.window_start_var.get().strip()
         end = self.window_end_var.get().strip()
@@ -482,24 +746,49 @@ class SettingsWindow:
         days = [day for day in DAY_ORDER if self.window_day_vars[day].get()]
         if not days:
             raise ValueError("Select at least one day for the window.")
-        return TimeWindow(start=start, end=end, days=days)
-
-    def _load_selected_window(self, event=None):
-        selection = self.windows_listbox.curselection()
-        if not selection:
-            return
-        window = self.draft_windows[selection[0]]
+        interval_text = self.window_interval_var.get().strip()
+        try:
+            interval = int(interval_text) if interval_text else None
+        except ValueError:
+            raise ValueError("Window interval must be a whole number of seconds.")
+        activity_type = self.window_activity_var.get()
+        if activity_type not in VALID_ACTIVITY_TYPES:
+            activity_type = None
+        rule = self.window_rule_var.get().strip() or None
+        return TimeWindow(start=start, end=end, days=days, interval=interval, activity_type=activity_type, rule=rule)
+
+    def _show_window_in_editor(self, window=None):
+        window = window or TimeWindow(start="09:00", end="17:00")
         self.window_start_var.set(window.start)
         self.window_end_var.set(window.end)
+        self.window_interval_var.set(str(window.interval) if window.interval is not None else "")
+        self.window_activity_var.set(window.activity_type or self.WINDOW_DEFAULT_ACTIVITY)
+        self.window_rule_var.set(window.rule or "")
         for day_code in DAY_ORDER:
             self.window_day_vars[day_code].set(day_code in window.days)
 
+    def _load_selected_window(self, event=None):
+        index = self._selected_draft_index()
+        if index is None:
+            return
+        self._show_window_in_editor(self.draft_windows[index])
+
     def _add_window(self):
         try:
-            self.draft_windows.append(self._window_from_editor())
-            self._populate_windows_list()
+            window = self._window_from_editor()
         except ValueError as error:
             messagebox.showerror("Error", str(error))
+            return
+
+        self.draft_windows.append(window)
+        self._draft_labels.append(window.label())
+        self._draft_revision += 1
+        index = len(self.draft_windows) - 1
+        if self._matches_filter(index):
+            self._visible_indexes.append(index)
+            self.windows_listbox.insert(tk.END, self._draft_labels[index])
+            self._select_row(len(self._visible_indexes) - 1)
+        self._update_schedule_preview()
 
     def _update_window(self):
         selection = self.windows_listbox.curselection()
@@ -507,44 +796,193 @@ class SettingsWindow:
             messagebox.showwarning("Warning", "Select a schedule window to update.")
             return
         try:
-            self.draft_windows[selection[0]] = self._window_from_editor()
-            self._populate_windows_list()
-            self.windows_listbox.selection_set(selection[0])
+            window = self._window_from_editor()
         except ValueError as error:
             messagebox.showerror("Error", str(error))
+            return
+
+        row = selection[0]
+        index = self._visible_indexes[row]
+        self.draft_windows[index] = window
+        self._draft_labels[index] = window.label()
+        self._draft_revision += 1
+        self.windows_listbox.delete(row)
+        if self._matches_filter(index):
+            self.windows_listbox.insert(row, self._draft_labels[index])
+            self._select_row(row)
+        else:
+            del self._visible_indexes[row]
+        self._update_schedule_preview()
 
     def _remove_window(self):
         selection = self.windows_listbox.curselection()
         if not selection:
             messagebox.showwarning("Warning", "Select a schedule window to remove.")
             return
-        del self.draft_windows[selection[0]]
-        self._populate_windows_list()
+
+        row = selection[0]
+        index = self._visible_indexes.pop(row)
+        del self.draft_windows[index]
+        del self._draft_labels[index]
+        self._draft_revision += 1
+        self._visible_indexes[row:] = [visible - 1 for visible in self._visible_indexes[row:]]
+        self.windows_listbox.delete(row)
+        self._update_schedule_preview()
+
+    def _refresh_profile_options(self):
+        if self.preset_menu is None:
+            return
+        options = self.preset_menu["menu"]
+        options.delete(0, tk.END)
+        for name in self.app.profiles.names():
+            options.add_command(label=name, command=tk._setit(self.preset_var, name, self._apply_preset))
 
     def _apply_preset(self, preset_name):
-        preview_config = self.app.config.clone()
-        apply_preset(preview_config, preset_name)
-        self.interval_var.set(str(preview_config.interval))
-        self.activity_type_var.set(preview_config.activity_type)
-        self.schedule_enabled_var.set(preview_config.schedule.enabled)
-        self.draft_windows = [TimeWindow(**window.to_dict()) for window in preview_config.schedule.windows]
+        profile = self.app.profiles.get(preset_name)
+        source = profile or self.app.config
+        interval, activity_type, schedule = source.interval, source.activity_type, source.schedule
+        self.interval_var.set(str(interval))
+        self.activity_type_var.set(activity_type)
+        self.schedule_enabled_var.set(schedule.enabled)
+        self.schedule_timezone_var.set(schedule.timezone or "")
+        self._set_draft_windows(schedule.windows)
         self._populate_windows_list()
         if self.draft_windows:
-            first_window = self.draft_windows[0]
-            self.window_start_var.set(first_window.start)
-            self.window_end_var.set(first_window.end)
-            for day_code in DAY_ORDER:
-                self.window_day_vars[day_code].set(day_code in first_window.days)
+            self._show_window_in_editor(self.draft_windows[0])
+
+    def _schedule_timezone(self):
+        timezone_name = self.schedule_timezone_var.get().strip() if hasattr(self, "schedule_timezone_var") else ""
+        resolve_timezone(timezone_name)
+        return timezone_name or None
 
     def _update_schedule_preview(self):
-        preview_schedule = ScheduleConfig(enabled=self.schedule_enabled_var.get(), windows=list(self.draft_windows))
-        self.schedule_preview_label.config(text=describe_schedule(preview_schedule))
+        if self.schedule_preview_label is None:
+            return
+        enabled = self.schedule_enabled_var.get()
+        try:
+            timezone_name = self._schedule_timezone()
+        except ValueError:
+            timezone_name = None
+        now = self.app.now_provider()
+        preview_key = (self._draft_revision, enabled, timezone_name, now.date())
+        if preview_key == self._preview_key and (self._preview_expires_at is None or seconds_until(self._preview_expires_at, now) > 0):
+            self._update_timeline_now_marker(self._preview_schedule, now)
+            return
+
+        preview_schedule = ScheduleConfig(enabled=enabled, windows=self.draft_windows, timezone=timezone_name)
+        transition = get_next_transition(preview_schedule, now=now)
+        self._preview_key = preview_key
+        self._preview_schedule = preview_schedule
+        self._preview_expires_at = transition[1] if transition else None
+        self.schedule_preview_label.config(text=describe_schedule(preview_schedule, now=now))
+        self._update_timeline(preview_schedule, now)
+
+    def _timeline_x(self, minute):
+        return self.TIMELINE_LABEL_WIDTH + minute * (self.TIMELINE_WIDTH - self.TIMELINE_LABEL_WIDTH - 1) / 1440.0
+
+    def _timeline_row_top(self, row):
+        return self.TIMELINE_HEADER_HEIGHT + row * self.TIMELINE_ROW_HEIGHT
+
+    def _draw_timeline_grid(self):
+        canvas = self.timeline_canvas
+        bottom = self._timeline_row_top(7)
+        for hour in range(0, 25, 6):
+            x_pos = self._timeline_x(hour * 60)
+            anchor = "nw" if hour == 0 else "ne" if hour == 24 else "n"
+            canvas.create_text(x_pos, 0, text="{0:02d}".format(hour), anchor=anchor, font=ModernStyle.FONT_SMALL, fill=ModernStyle.TEXT_DIM)
+            canvas.create_line(x_pos, self.TIMELINE_HEADER_HEIGHT, x_pos, bottom, fill=ModernStyle.BORDER_SHADOW, tags="grid")
+
+    def _draw_timeline_row(self, row, active_date, spans):
+        canvas = self.timeline_canvas
+        tag = "row{0}".format(row)
+        top = self._timeline_row_top(row)
+        bottom = top + self.TIMELINE_ROW_HEIGHT - 2
+        canvas.delete(tag)
+        canvas.create_text(
+            0,
+            top + self.TIMELINE_ROW_HEIGHT // 2,
+            text=active_date.strftime("%a %d"),
+            anchor="w",
+            font=ModernStyle.FONT_SMALL,
+            fill=ModernStyle.TEXT,
+            tags=tag,
+        )
+        canvas.create_rectangle(self._timeline_x(0), top, self._timeline_x(1440), bottom, fill=ModernStyle.FIELD_BG, outline=ModernStyle.BORDER_SHADOW, tags=tag)
+        for start_minute, end_minute in spans:
+            canvas.create_rectangle(self._timeline_x(start_minute), top + 2, self._timeline_x(end_minute), bottom - 1, fill=ModernStyle.SUCCESS, width=0, tags=tag)
+
+    def _update_timeline(self, schedule, now):
+        """Redraw the rows whose coverage changed, then the upcoming transition ticks.
+
+        Rows come from the merged interval stream, so an edit to one window leaves every
+        day it does not touch exactly as it was and those rows are not redrawn.
+        """
+        if self.timeline_canvas is None:
+            return
+        canvas = self.timeline_canvas
+        rows = timeline_rows(schedule, now)
+        for row, (active_date, spans) in enumerate(rows):
+            if row >= len(self._timeline_rows) or self._timeline_rows[row] != (active_date, spans):
+                self._draw_timeline_row(row, active_date, spans)
+        self._timeline_rows = rows
+
+        canvas.delete("transition")
+        first_date = rows[0][0]
+        if schedule.enabled:
+            for next_state, transition_at in iter_transitions(schedule, now):
+                wall_time = transition_at.replace(tzinfo=None)
+                row = (wall_time.date() - first_date).days
+                if row >= len(rows):
+                    break
+                x_pos = self._timeline_x(wall_time.hour * 60 + wall_time.minute)
+                top = self._timeline_row_top(row)
+                color = ModernStyle.SELECT_BG if next_state == "active" else ModernStyle.WARNING
+                canvas.create_line(x_pos, top, x_pos, top + self.TIMELINE_ROW_HEIGHT - 2, fill=color, width=2, tags="transition")
+        canvas.tag_raise("grid")
+        canvas.tag_raise("transition")
+        self._update_timeline_now_marker(schedule, now)
+
+    def _update_timeline_now_marker(self, schedule, now):
+        if self.timeline_canvas is None or not self._timeline_rows:
+            return
+        wall_time = wall_clock(schedule, now)
+        row = (wall_time.date() - self._timeline_rows[0][0]).days
+        x_pos = self._timeline_x(wall_time.hour * 60 + wall_time.minute)
+        top = self._timeline_row_top(row)
+        coords = (x_pos, top - 1, x_pos, top + self.TIMELINE_ROW_HEIGHT - 1)
+        if self.timeline_canvas.find_withtag("now"):
+            self.timeline_canvas.coords("now", *coords)
+        else:
+            self.timeline_canvas.create_line(*coords, fill=ModernStyle.WARNING, width=2, tags="now")
+        self.timeline_canvas.tag_raise("now")
 
     def _toggle_status(self):
         self.app.toggle_state()
         self._refresh_runtime_display()
 
+    def _pause_duration_labels(self):
+        return ["For {0}".format(format_duration(minutes * 60)) for minutes in self.app.PAUSE_PRESETS_MINUTES]
+
+    def _apply_timed_pause(self, choice):
+        self.pause_choice_var.set(self.PAUSE_PROMPT)
+        try:
+            if choice == self.PAUSE_UNTIL_TRANSITION:
+                if not self.app.pause_until_next_transition():
+                    messagebox.showinfo("Timed Pause", "The schedule has no upcoming change to pause until.")
+            elif choice == self.PAUSE_UNTIL_TIME:
+                value = simpledialog.askstring("Timed Pause", "Pause until (HH:MM):", parent=self.window)
+                if value:
+                    self.app.pause_until_clock_time(value.strip())
+            else:
+                self.app.pause_for(self.app.PAUSE_PRESETS_MINUTES[self._pause_duration_labels().index(choice)])
+        except ValueError as error:
+            messagebox.showerror("Error", str(error))
+        self._refresh_runtime_display()
+
     def _refresh_runtime_display(self):
+        self._refresh_job = None
+        if not self.is_open:
+            return
         if not self.window or not self.window.winfo_exists():
             self.is_open = False
             return
@@ -562,44 +1000,84 @@ class SettingsWindow:
                 minutes, seconds = divmod(remainder, 60)
                 self.session_label.config(text="Session: {0:02d}:{1:02d}:{2:02d}".format(hours, minutes, seconds))
 
-            self.activity_label.config(text="Session activities: {0}".format(self.app.activity_count))
-            self.total_activity_label.config(text="Lifetime activities: {0}".format(self.app.config.lifetime_activity_count))
-            if self.app.config.last_activity_at:
+            stats = self.app.stats
+            self.activity_label.config(text="Session activities: {0}".format(stats.session_activity_count))
+            self.total_activity_label.config(text="Lifetime activities: {0}".format(stats.lifetime_activity_count))
+            if stats.last_activity_at:
                 self.last_activity_label.config(
-                    text="Last activity: {0}".format(self.app.config.last_activity_at.strftime("%a %H:%M:%S"))
+                    text="Last activity: {0}".format(stats.last_activity_at.strftime("%a %H:%M:%S"))
                 )
             else:
                 self.last_activity_label.config(text="Last activity: --")
 
+            presence = self.app.describe_presence()
+            if presence is None:
+                self.presence_label.pack_forget()
+            else:
+                self.presence_label.config(text=presence)
+                self.presence_label.pack(fill=tk.X, pady=(6, 0))
+
             self._update_schedule_preview()
-            self.window.after(1000, self._refresh_runtime_display)
+            self._poll_events()
+            self._refresh_job = self.window.after(self.REFRESH_MS, self._refresh_runtime_display)
         except tk.TclError:
             self.is_open = False
 
+    def _collect_profile_settings(self):
+        raw_interval = self.interval_var.get().strip()
+        interval = clamp_interval(raw_interval)
+        if str(interval) != raw_interval:
+            raise ValueError("Interval must be between 10 and 300 seconds.")
+
+        activity_type = self.activity_type_var.get()
+        if activity_type not in VALID_ACTIVITY_TYPES:
+            raise ValueError("Select a valid activity type.")
+
+        schedule_windows = self.build_schedule_windows_for_save()
+        if self.schedule_enabled_var.get() and not schedule_windows:
+            raise ValueError("Add at least one schedule window or disable scheduling.")
+
+        schedule = ScheduleConfig(enabled=self.schedule_enabled_var.get(), windows=schedule_windows, timezone=self._schedule_timezone())
+        return interval, activity_type, schedule
+
+    def _save_as_profile(self):
+        try:
+            interval, activity_type, schedule = self._collect_profile_settings()
+        except ValueError as error:
+            messagebox.showerror("Error", str(error))
+            return
+
+        name = simpledialog.askstring("Save as Profile", "Profile name:", parent=self.window)
+        if not name:
+            return
+        try:
+            profile = self.app.profiles.save(name.strip(), interval, activity_type, schedule)
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Error", str(error))
+            return
+        self._refresh_profile_options()
+        self.preset_var.set(profile.name)
+        messagebox.showinfo("Saved", "Profile {0} saved. Switch to it from the tray menu or with Save Settings.".format(profile.name))
+
     def _save_settings(self):
         try:
-            raw_interval = self.interval_var.get().strip()
-            interval = clamp_interval(raw_interval)
-            if str(interval) != raw_interval:
-                raise ValueError("Interval must be between 10 and 300 seconds.")
-
-            activity_type = self.activity_type_var.get()
-            if activity_type not in VALID_ACTIVITY_TYPES:
-                raise ValueError("Select a valid activity type.")
-
-            schedule_windows = self.build_schedule_windows_for_save()
-            if self.schedule_enabled_var.get() and not schedule_windows:
-                raise ValueError("Add at least one schedule window or disable scheduling.")
-
-            updated_config = self.app.config.clone()
-            updated_config.interval = interval
-            updated_config.activity_type = activity_type
-            updated_config.start_minimized = self.minimized_var.get()
-            updated_config.notifications_enabled = self.notifications_var.get()
-            updated_config.profile_name = self.preset_var.get() if self.preset_var.get() in PRESET_CONFIGS else "Custom"
-            updated_config.schedule = ScheduleConfig(
-                enabled=self.schedule_enabled_var.get(),
-                windows=schedule_windows,
+            interval, activity_type, schedule = self._collect_profile_settings()
+            quiet_hours = self.quiet_hours_var.get().strip() or None
+            parse_quiet_hours(quiet_hours)
+            target_processes = parse_process_names(self.target_processes_var.get())
+
+            updated_config = replace(
+                self.app.config,
+                interval=interval,
+                activity_type=activity_type,
+                start_minimized=self.minimized_var.get(),
+                notifications_enabled=self.notifications_var.get(),
+                quiet_hours=quiet_hours,
+                target_processes=target_processes,
+                verbose_activity_log=self.verbose_log_var.get(),
+                resume_catch_up=self.resume_catch_up_var.get(),
+                profile_name=self.preset_var.get() if self.app.profiles.get(self.preset_var.get()) else "Custom",
+                schedule=schedule,
             )
 
             self.app.set_startup_enabled(self.startup_var.get())
@@ -612,9 +1090,15 @@ class SettingsWindow:
             messagebox.showerror("Error", "Could not save settings:\n{0}".format(error))
 
     def _on_close(self):
+        # Withdraw instead of destroying so the next open can reuse every widget.
         self.is_open = False
-        if self._content_canvas:
-            self._content_canvas.unbind_all("<MouseWheel>")
+        if self.window and self._refresh_job:
+            self.window.after_cancel(self._refresh_job)
+        self._refresh_job = None
+        if self.window and self._event_reload_job:
+            self.window.after_cancel(self._event_reload_job)
+        self._event_reload_job = None
         if self.window:
-            self.window.destroy()
-            self.window = None
\ No newline at end of file
+            self.window.withdraw()
+        if self.on_close:
+            self.on_close()
\ No newline at end of file
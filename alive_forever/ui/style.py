@@ -0,0 +1,31 @@
+"""Colors and fonts shared by the tray icon and the settings window.
+
+Kept free of tkinter so the tray can use them without loading Tk.
+"""
+
+
+class ModernStyle:
+    WINDOW_BG = "#c0c0c0"
+    PANEL_BG = "#d4d0c8"
+    PANEL_INNER = "#c0c0c0"
+    FIELD_BG = "#ffffff"
+    TITLE_BG = "#000080"
+    TITLE_TEXT = "#ffffff"
+    TEXT = "#000000"
+    TEXT_DIM = "#3f3f3f"
+    BORDER_DARK = "#404040"
+    BORDER_SHADOW = "#808080"
+    BORDER_LIGHT = "#dfdfdf"
+    BORDER_HIGHLIGHT = "#ffffff"
+    SELECT_BG = "#000080"
+    SELECT_TEXT = "#ffffff"
+    SUCCESS = "#008000"
+    WARNING = "#800000"
+    PAUSED = "#404040"
+    FONT_FAMILY = "MS Sans Serif"
+    FONT_TITLE = (FONT_FAMILY, 18, "bold")
+    FONT_SUBTITLE = (FONT_FAMILY, 10)
+    FONT_BODY = (FONT_FAMILY, 10)
+    FONT_BODY_BOLD = (FONT_FAMILY, 10, "bold")
+    FONT_CAPTION = (FONT_FAMILY, 8, "bold")
+    FONT_SMALL = (FONT_FAMILY, 8)
@@ -0,0 +1 @@
+"""Performance benchmarks for Alive Forever. Run from the repository root with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,299 @@
+"""Microbenchmarks of the scheduler, config and activity tick hot paths, checked against a stored baseline.
+
+Usage: python -m benchmarks.micro [--filter TEXT] [--threshold RATIO] [--save-baseline] [--baseline PATH]
+
+Each benchmark calls one function in a loop, picking a loop count that makes one sample
+last at least ``--min-sample-ms``, and keeps the fastest of ``--repeat`` samples, since
+noise from other processes only ever adds time. Every run also times a fixed pure-Python
+calibration loop, and timings are compared in units of that loop, so a baseline recorded
+on a laptop still applies on a slower build agent.
+
+The report lists each benchmark next to its baseline and ends with PASS or FAIL. The exit
+code is 1 when any benchmark is slower than its baseline by more than the threshold.
+``--save-baseline`` records the current run as the new baseline instead.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from itertools import cycle
+from pathlib import Path
+
+from alive_forever.app import KeepAliveApp
+from alive_forever.core.config import AppConfig, RuntimeStats, config_from_raw, load_app_state
+from alive_forever.core.scheduler import DAY_ORDER, ScheduleConfig, TimeWindow, describe_schedule, get_next_transition, is_schedule_active
+from alive_forever.core.simulation import AppSimulator, FakeInputBackend, FakeTray, SimulatedClock, create_quiet_logger
+from benchmarks.soak import SOAK_SCHEDULE, build_soak_app
+
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baselines" / "micro.json"
+DEFAULT_THRESHOLD = 0.25
+CALIBRATION = "calibration"
+BENCHMARK_START = datetime(2026, 4, 6, 6, 0)
+
+Comparison = namedtuple("Comparison", ["name", "baseline_units", "current_units", "ratio", "status"])
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register ``setup(resources)``, which returns the zero-argument callable to time."""
+
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _clock_label(minutes):
+    return "{0:02d}:{1:02d}".format(minutes // 60 % 24, minutes % 60)
+
+
+def build_large_schedule(window_count=200):
+    """Short windows spread over the week, every tenth limited by a repeat rule that alone picks its dates."""
+    rules = ("FREQ=MONTHLY;BYDAY=1MO", "FREQ=WEEKLY;INTERVAL=2;BYDAY=FR;DTSTART=20260410", "FREQ=MONTHLY;BYMONTHDAY=-1")
+    windows = [
+        TimeWindow(
+            start=_clock_label(index * 7),
+            end=_clock_label(index * 7 + 20),
+            days=list(DAY_ORDER) if index % 10 == 0 else [DAY_ORDER[index % 7], DAY_ORDER[(index + 3) % 7]],
+            interval=30 if index % 5 == 0 else None,
+            rule=rules[index // 10 % len(rules)] if index % 10 == 0 else None,
+        )
+        for index in range(window_count)
+    ]
+    return ScheduleConfig(enabled=True, windows=windows)
+
+
+SCHEDULES = {"small": SOAK_SCHEDULE, "large": build_large_schedule()}
+
+
+def _moments():
+    """Every 7 minutes over two weeks, so cached and recomputed lookups both show up."""
+    return cycle([BENCHMARK_START + timedelta(minutes=7 * step) for step in range(2 * 7 * 24 * 60 // 7)])
+
+
+def _large_raw_config():
+    raw_config = AppConfig(quiet_hours="22:00-07:00", target_processes=("ms-teams.exe",), schedule=SCHEDULES["large"]).to_dict()
+    raw_config.update(RuntimeStats(lifetime_activity_count=12345, last_activity_at=BENCHMARK_START).to_dict())
+    return raw_config
+
+
+def _calibration_loop():
+    total = 0
+    table = {}
+    for number in range(2000):
+        total += number * number
+        table[number & 63] = total
+    return total, len(table)
+
+
+@benchmark(CALIBRATION)
+def _setup_calibration(resources):
+    return _calibration_loop
+
+
+def _register_schedule_benchmarks(size, schedule):
+    @benchmark("is_schedule_active.{0}".format(size))
+    def setup_active(resources):
+        moments = _moments()
+        return lambda: is_schedule_active(schedule, now=next(moments))
+
+    @benchmark("get_next_transition.{0}".format(size))
+    def setup_transition(resources):
+        moments = _moments()
+        return lambda: get_next_transition(schedule, now=next(moments))
+
+    @benchmark("describe_schedule.{0}".format(size))
+    def setup_describe(resources):
+        moments = _moments()
+        return lambda: describe_schedule(schedule, now=next(moments))
+
+
+for _size, _schedule in SCHEDULES.items():
+    _register_schedule_benchmarks(_size, _schedule)
+
+
+@benchmark("config_from_raw.large")
+def _setup_config_from_raw(resources):
+    raw_config = _large_raw_config()
+    return lambda: config_from_raw(raw_config)
+
+
+@benchmark("load_app_state.large")
+def _setup_load_app_state(resources):
+    directory = Path(resources.enter_context(tempfile.TemporaryDirectory()))
+    config_file = directory / "config.json"
+    config_file.write_text(json.dumps(_large_raw_config(), indent=2), encoding="utf-8")
+    logger = create_quiet_logger("alive_forever_benchmark")
+    return lambda: load_app_state(logger, config_file)
+
+
+@benchmark("create_icon_image")
+def _setup_create_icon_image(resources):
+    app = build_soak_app(SimulatedClock(BENCHMARK_START))
+    states = cycle(KeepAliveApp.RUNTIME_STATES)
+    return lambda: app.create_icon_image(next(states))
+
+
+@benchmark("process_activity_tick")
+def _setup_process_activity_tick(resources):
+    clock = SimulatedClock(BENCHMARK_START)
+    config = AppConfig(interval=60, notifications_enabled=False, schedule=ScheduleConfig(enabled=True, windows=[TimeWindow(start="06:00", end="22:00")]))
+    app = KeepAliveApp(config=config, clock=clock, input_backend=FakeInputBackend(), logger=create_quiet_logger("alive_forever_benchmark"))
+    app.icon = FakeTray()
+    AppSimulator(app).start()
+
+    def tick():
+        # One-second ticks, like the real loop; 16 active hours outlast any sample.
+        clock.advance(1)
+        app.next_run = app.process_activity_tick(app.next_run)
+
+    return tick
+
+
+def _time_calls(action, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        action()
+    return time.perf_counter() - started
+
+
+def measure(action, repeat=7, min_sample_seconds=0.02):
+    """Return the seconds per call of ``action`` in the fastest of ``repeat`` samples."""
+    calls = 1
+    elapsed = _time_calls(action, calls)
+    while elapsed < min_sample_seconds:
+        calls = calls * 10 if elapsed < min_sample_seconds / 10 else calls * 2
+        elapsed = _time_calls(action, calls)
+    samples = [elapsed] + [_time_calls(action, calls) for _ in range(repeat - 1)]
+    return min(samples) / calls
+
+
+def run_benchmarks(name_filter=None, repeat=7, min_sample_seconds=0.02):
+    """Return ``{name: seconds per call}`` for the matching benchmarks, always including the calibration."""
+    results = {}
+    with ExitStack() as resources:
+        for name, setup in BENCHMARKS.items():
+            if name != CALIBRATION and name_filter and name_filter not in name:
+                continue
+            results[name] = measure(setup(resources), repeat, min_sample_seconds)
+    return results
+
+
+def load_baseline(path=BASELINE_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(results, path=BASELINE_FILE):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seconds_per_call": {name: results[name] for name in sorted(results)},
+    }
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(baseline, handle, indent=2)
+        handle.write("\n")
+
+
+def compare_results(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compare ``results`` with ``baseline`` in calibration units; one ``Comparison`` per benchmark.
+
+    Status is ``slower`` or ``faster`` past the threshold either way, ``ok`` within it,
+    and ``new`` when the baseline has no entry.
+    """
+    recorded = (baseline or {}).get("seconds_per_call", {})
+    current_unit = results[CALIBRATION]
+    baseline_unit = recorded.get(CALIBRATION)
+    comparisons = []
+    for name, seconds in results.items():
+        if name == CALIBRATION:
+            continue
+        current_units = seconds / current_unit
+        if name not in recorded or not baseline_unit:
+            comparisons.append(Comparison(name, None, current_units, None, "new"))
+            continue
+        baseline_units = recorded[name] / baseline_unit
+        ratio = current_units / baseline_units
+        if ratio > 1 + threshold:
+            status = "slower"
+        elif ratio < 1 / (1 + threshold):
+            status = "faster"
+        else:
+            status = "ok"
+        comparisons.append(Comparison(name, baseline_units, current_units, ratio, status))
+    return comparisons
+
+
+def _format_time(seconds):
+    if seconds < 1e-3:
+        return "{0:.2f} us".format(seconds * 1e6)
+    return "{0:.3f} ms".format(seconds * 1e3)
+
+
+def format_report(results, comparisons, threshold=DEFAULT_THRESHOLD):
+    lines = [
+        "Calibration loop: {0}".format(_format_time(results[CALIBRATION])),
+        "{0:<32} {1:>12} {2:>10} {3:>10} {4:>8}  {5}".format("Benchmark", "Per call", "Baseline", "Current", "Ratio", "Status"),
+    ]
+    for comparison in comparisons:
+        lines.append(
+            "{0:<32} {1:>12} {2:>10} {3:>10.2f} {4:>8}  {5}".format(
+                comparison.name,
+                _format_time(results[comparison.name]),
+                "--" if comparison.baseline_units is None else "{0:.2f}".format(comparison.baseline_units),
+                comparison.current_units,
+                "--" if comparison.ratio is None else "{0:.2f}x".format(comparison.ratio),
+                comparison.status,
+            )
+        )
+    regressions = [comparison.name for comparison in comparisons if comparison.status == "slower"]
+    if regressions:
+        lines.append("FAIL: {0} slower than baseline by more than {1:.0%}".format(", ".join(regressions), threshold))
+    else:
+        lines.append("PASS: no benchmark slower than baseline by more than {0:.0%}".format(threshold))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this text.")
+    parser.add_argument("--repeat", type=int, default=7, help="Samples per benchmark.")
+    parser.add_argument("--min-sample-ms", type=float, default=20, help="Shortest sample; loop counts grow until a sample takes this long.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown ratio against the baseline.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="Baseline JSON file.")
+    parser.add_argument("--save-baseline", action="store_true", help="Record this run as the baseline instead of comparing.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.filter, args.repeat, args.min_sample_ms / 1000)
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline) if args.filter else None
+        if baseline:
+            # A filtered run only replaces its own entries; the rest are rescaled to this run's calibration.
+            recorded = baseline["seconds_per_call"]
+            scale = results[CALIBRATION] / recorded[CALIBRATION]
+            results = dict({name: seconds * scale for name, seconds in recorded.items()}, **results)
+        save_baseline(results, args.baseline)
+        print("Saved {0} timings to {1}".format(len(results), args.baseline))
+        return 0
+
+    comparisons = compare_results(results, load_baseline(args.baseline), args.threshold)
+    print(format_report(results, comparisons, args.threshold))
+    return 1 if any(comparison.status == "slower" for comparison in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Open/reopen latency of the settings window.
+
+Usage: python -m benchmarks.settings_open [--windows N] [--repeat N]
+
+The reopen path (``show()`` on a withdrawn window: reloading the bound variables, the
+window list, the schedule preview and the timeline) only needs a Tcl interpreter once the
+built widgets are replaced with no-op stubs, so it is always measured headless. The stubs
+cost nothing, so that number is the Python side of a reopen without any Tk drawing. The
+real first open, the lower cards' deferred build (driven by scrolling to the bottom, one
+card per event pass) and the real reopen need Tk and are skipped when no display is
+available.
+"""
+
+import argparse
+import logging
+import statistics
+import time
+import tkinter as tk
+from datetime import datetime
+
+from alive_forever.core.config import AppConfig, RuntimeStats
+from alive_forever.core.profiles import ProfileLibrary
+from alive_forever.core.scheduler import DAY_ORDER, ScheduleConfig, TimeWindow
+from alive_forever.ui.settings import SettingsWindow
+
+
+def _clock_label(minutes):
+    return "{0:02d}:{1:02d}".format(minutes // 60 % 24, minutes % 60)
+
+
+class _BenchmarkApp:
+    """The slice of ``KeepAliveApp`` that ``SettingsWindow`` reads."""
+
+    PAUSE_PRESETS_MINUTES = (15, 30, 60, 120)
+
+    def __init__(self, window_count):
+        windows = [
+            TimeWindow(start=_clock_label(index * 7), end=_clock_label(index * 7 + 30), days=[DAY_ORDER[index % 7]])
+            for index in range(window_count)
+        ]
+        self.config = AppConfig(schedule=ScheduleConfig(enabled=True, windows=windows))
+        self.profiles = ProfileLibrary()
+        self.root = None
+        self.logger = logging.getLogger("alive_forever_benchmark")
+        self.manual_paused = False
+        self.start_time = datetime.now()
+        self.stats = RuntimeStats()
+
+    def now_provider(self):
+        return datetime.now()
+
+    def is_startup_enabled(self):
+        return False
+
+    def get_status_presentation(self):
+        return "Active", "#008000", "Benchmark"
+
+    def toggle_state(self):
+        self.manual_paused = not self.manual_paused
+
+    def describe_presence(self, now_monotonic=None):
+        return None
+
+
+class _StubWidget:
+    """Accepts any widget call and does nothing, so the reopen path runs without a display."""
+
+    def __getattr__(self, name):
+        return _ignore
+
+    def __getitem__(self, key):
+        return self
+
+    def winfo_exists(self):
+        return True
+
+    def curselection(self):
+        return ()
+
+    def find_withtag(self, tag):
+        return ()
+
+
+def _ignore(*args, **kwargs):
+    return None
+
+
+_STUBBED_WIDGETS = (
+    "preset_menu",
+    "windows_listbox",
+    "schedule_preview_label",
+    "timeline_canvas",
+    "status_indicator",
+    "status_label",
+    "status_detail_label",
+    "toggle_btn",
+    "session_label",
+    "activity_label",
+    "total_activity_label",
+    "last_activity_label",
+    "presence_label",
+)
+
+
+def _timed(action):
+    started = time.perf_counter()
+    action()
+    return (time.perf_counter() - started) * 1000
+
+
+def measure_stubbed_reopen(window_count, repeat):
+    interpreter = tk.Tcl()
+    settings = SettingsWindow(_BenchmarkApp(window_count))
+    settings._create_variables(interpreter)
+    settings.window = _StubWidget()
+    for name in _STUBBED_WIDGETS:
+        setattr(settings, name, _StubWidget())
+    settings.is_open = True
+    settings._load_config_values()
+
+    reopen = []
+    for _ in range(repeat):
+        settings._on_close()
+        # A reopen on a later day redraws the timeline, as a reopen after the preview expired would.
+        settings._preview_key = None
+        reopen.append(_timed(settings.show))
+    return reopen
+
+
+def measure_window_open(window_count, repeat):
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    root.withdraw()
+    app = _BenchmarkApp(window_count)
+    app.root = root
+    settings = SettingsWindow(app)
+
+    def open_window():
+        settings.show()
+        root.update_idletasks()
+
+    try:
+        first_open = _timed(open_window)
+
+        def build_lower_cards():
+            # Scroll to the bottom and let the scroll and <Configure> events build each card
+            # in turn, as they do for a user, until a pass builds nothing more.
+            while settings._pending_sections:
+                pending = len(settings._pending_sections)
+                settings._content_canvas.yview_moveto(1.0)
+                root.update()
+                if len(settings._pending_sections) == pending:
+                    break
+
+        lower_cards = _timed(build_lower_cards)
+        reopen = []
+        for _ in range(repeat):
+            settings._on_close()
+            reopen.append(_timed(open_window))
+        settings._on_close()
+    finally:
+        root.destroy()
+    return first_open, lower_cards, reopen
+
+
+def _describe(samples):
+    return "median {0:.2f} ms, max {1:.2f} ms over {2} run(s)".format(statistics.median(samples), max(samples), len(samples))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", type=int, default=200, help="Schedule windows in the benchmark config.")
+    parser.add_argument("--repeat", type=int, default=20, help="Reopen iterations.")
+    args = parser.parse_args(argv)
+
+    print("Reopen, stubbed widgets (Tcl): {0}".format(_describe(measure_stubbed_reopen(args.windows, args.repeat))))
+    window_timings = measure_window_open(args.windows, args.repeat)
+    if window_timings is None:
+        print("Window open (Tk): skipped, no display available")
+        return 0
+    first_open, lower_cards, reopen = window_timings
+    print("First open (Tk): {0:.2f} ms".format(first_open))
+    print("Lower cards on first scroll (Tk): {0:.2f} ms".format(lower_cards))
+    print("Reopen (Tk): {0}".format(_describe(reopen)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,252 @@
+"""Long-running soak test of the activity loop's CPU time, memory, threads, handles and wakeups.
+
+Usage: python -m benchmarks.soak [--hours N] [--realtime] [--bucket-minutes N]
+
+By default the app is driven in accelerated time: ``AppSimulator`` jumps from deadline
+to deadline on a ``SimulatedClock``, so a simulated day takes seconds. Resources are
+still those of this process, so caches or state that grow per tick or per transition
+show up as creep. ``--realtime`` runs the real activity loop and watchdog threads on the
+system clock instead, for the given number of wall-clock hours.
+
+The report lists each bucket (an hour by default) and ends with PASS or FAIL against
+the thresholds; the exit code is 1 on failure.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+from dataclasses import dataclass
+from datetime import datetime
+
+from alive_forever.app import KeepAliveApp
+from alive_forever.core.clock import SystemClock
+from alive_forever.core.config import AppConfig
+from alive_forever.core.scheduler import ScheduleConfig, TimeWindow
+from alive_forever.core.simulation import AppSimulator, FakeInputBackend, FakeTray, SimulatedClock, create_quiet_logger
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+ResourceSample = namedtuple("ResourceSample", ["elapsed", "cpu_seconds", "rss_bytes", "threads", "handles", "wakeups", "activities"])
+BucketTrend = namedtuple("BucketTrend", ["index", "cpu_seconds", "rss_bytes", "threads", "handles", "wakeups", "activities"])
+
+SOAK_SCHEDULE = ScheduleConfig(
+    enabled=True,
+    windows=[
+        TimeWindow(start="09:00", end="12:00", days=["mon", "tue", "wed", "thu", "fri"]),
+        TimeWindow(start="13:00", end="18:00", days=["mon", "tue", "wed", "thu", "fri"]),
+    ],
+)
+
+
+@dataclass
+class SoakThresholds:
+    max_rss_growth_mb_per_hour: float = 1.0
+    max_thread_growth: int = 0
+    max_handle_growth: int = 4
+    max_cpu_creep_ratio: float = 0.5
+    max_wakeup_creep_ratio: float = 0.1
+    # Absolute slack so near-zero buckets do not fail on timer noise or a schedule transition.
+    cpu_noise_seconds: float = 0.05
+    wakeup_noise: int = 4
+
+
+class CountingClock(SystemClock):
+    """System clock that counts how often the loops wake up."""
+
+    def __init__(self):
+        self.wait_count = 0
+        self._lock = threading.Lock()
+
+    def wait(self, event, timeout):
+        with self._lock:
+            self.wait_count += 1
+        return super().wait(event, timeout)
+
+
+def read_process_resources():
+    """Return ``(rss_bytes, threads, handles)`` for this process; unknown values are None."""
+    if psutil is not None:
+        process = psutil.Process()
+        handles = process.num_handles() if hasattr(process, "num_handles") else process.num_fds()
+        return process.memory_info().rss, process.num_threads(), handles
+
+    rss = handles = None
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as handle:
+            rss = int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        handles = len(os.listdir("/proc/self/fd"))
+    except (OSError, ValueError, AttributeError):
+        pass
+    return rss, threading.active_count(), handles
+
+
+def take_sample(elapsed, wakeups, activities):
+    rss, threads, handles = read_process_resources()
+    return ResourceSample(elapsed, time.process_time(), rss, threads, handles, wakeups, activities)
+
+
+def build_soak_app(clock, interval=60):
+    config = AppConfig(interval=interval, notifications_enabled=False, schedule=SOAK_SCHEDULE)
+    app = KeepAliveApp(config=config, clock=clock, input_backend=FakeInputBackend(clock), logger=create_quiet_logger("alive_forever_soak"))
+    app.icon = FakeTray()
+    return app
+
+
+def run_accelerated(duration_seconds, sample_seconds, start=None, interval=60):
+    clock = SimulatedClock(start or datetime(2026, 4, 6, 0, 0))
+    app = build_soak_app(clock, interval)
+    simulator = AppSimulator(app)
+    simulator.start()
+
+    samples = [take_sample(0.0, 0, 0)]
+    elapsed = 0.0
+    while elapsed < duration_seconds:
+        step = min(sample_seconds, duration_seconds - elapsed)
+        simulator.run_for(step)
+        elapsed += step
+        samples.append(take_sample(elapsed, simulator.steps, len(app.input_backend.events)))
+    return samples
+
+
+def run_realtime(duration_seconds, sample_seconds, interval=60):
+    clock = CountingClock()
+    app = build_soak_app(clock, interval)
+    app.start_time = clock.now()
+    app.start_activity_thread()
+    watchdog_thread = threading.Thread(target=app.watchdog.run, daemon=True)
+    watchdog_thread.start()
+
+    started = time.monotonic()
+    samples = [take_sample(0.0, 0, 0)]
+    try:
+        while True:
+            elapsed = time.monotonic() - started
+            if elapsed >= duration_seconds:
+                break
+            time.sleep(min(sample_seconds, duration_seconds - elapsed))
+            samples.append(take_sample(time.monotonic() - started, clock.wait_count, len(app.input_backend.events)))
+    finally:
+        # Stop the loops without app.shutdown(), which would save this config over the user's.
+        app.shutdown_event.set()
+        app.thread.join(timeout=5)
+        watchdog_thread.join(timeout=5)
+    return samples
+
+
+def summarize_buckets(samples, bucket_seconds):
+    """Fold samples into per-bucket trends: CPU, wakeups and activities used in the bucket, and end-of-bucket RSS/threads/handles."""
+    trends = []
+    bucket_start = samples[0]
+    for index, sample in enumerate(samples[1:], start=1):
+        is_last = index == len(samples) - 1
+        if sample.elapsed - bucket_start.elapsed < bucket_seconds and not is_last:
+            continue
+        trends.append(
+            BucketTrend(
+                len(trends),
+                sample.cpu_seconds - bucket_start.cpu_seconds,
+                sample.rss_bytes,
+                sample.threads,
+                sample.handles,
+                sample.wakeups - bucket_start.wakeups,
+                sample.activities - bucket_start.activities,
+            )
+        )
+        bucket_start = sample
+    return trends
+
+
+def evaluate_trends(trends, thresholds, bucket_seconds):
+    """Return a list of threshold failures. The first bucket is treated as warm-up."""
+    if len(trends) < 3:
+        return []
+
+    baseline, last = trends[1], trends[-1]
+    failures = []
+    hours = (last.index - baseline.index) * bucket_seconds / 3600.0
+    if baseline.rss_bytes is not None and last.rss_bytes is not None:
+        growth = (last.rss_bytes - baseline.rss_bytes) / (1024.0 * 1024.0) / hours
+        if growth > thresholds.max_rss_growth_mb_per_hour:
+            failures.append("RSS grew {0:.2f} MB/hour (limit {1:.2f})".format(growth, thresholds.max_rss_growth_mb_per_hour))
+    if last.threads - baseline.threads > thresholds.max_thread_growth:
+        failures.append("Thread count grew from {0} to {1}".format(baseline.threads, last.threads))
+    if baseline.handles is not None and last.handles is not None and last.handles - baseline.handles > thresholds.max_handle_growth:
+        failures.append("Open handles grew from {0} to {1}".format(baseline.handles, last.handles))
+
+    cpu_limit = baseline.cpu_seconds * (1 + thresholds.max_cpu_creep_ratio) + thresholds.cpu_noise_seconds
+    if last.cpu_seconds > cpu_limit:
+        failures.append("CPU per bucket crept from {0:.3f}s to {1:.3f}s".format(baseline.cpu_seconds, last.cpu_seconds))
+    # Activity itself needs a wakeup; anything beyond that is idle polling, which must stay flat.
+    full_buckets = trends[1:-1] if len(trends) > 3 else trends[1:]
+    idle_wakeups = [trend.wakeups - trend.activities for trend in full_buckets]
+    wakeup_limit = idle_wakeups[0] * (1 + thresholds.max_wakeup_creep_ratio) + thresholds.wakeup_noise
+    if max(idle_wakeups) > wakeup_limit:
+        failures.append("Idle wakeups per bucket crept from {0} to {1}".format(idle_wakeups[0], max(idle_wakeups)))
+    return failures
+
+
+def format_report(trends, failures, mode):
+    lines = ["Soak ({0}): {1} bucket(s)".format(mode, len(trends))]
+    lines.append("{0:>6} {1:>10} {2:>10} {3:>8} {4:>8} {5:>8} {6:>10}".format("bucket", "cpu_s", "rss_mb", "threads", "handles", "wakeups", "activities"))
+    for trend in trends:
+        lines.append(
+            "{0:>6} {1:>10.3f} {2:>10} {3:>8} {4:>8} {5:>8} {6:>10}".format(
+                trend.index,
+                trend.cpu_seconds,
+                "{0:.1f}".format(trend.rss_bytes / (1024.0 * 1024.0)) if trend.rss_bytes is not None else "n/a",
+                trend.threads,
+                trend.handles if trend.handles is not None else "n/a",
+                trend.wakeups,
+                trend.activities,
+            )
+        )
+    if len(trends) < 3:
+        lines.append("SKIP: need at least 3 buckets to judge trends")
+    elif failures:
+        lines.extend("FAIL: {0}".format(failure) for failure in failures)
+    else:
+        lines.append("PASS")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=24 * 7, help="Soak duration in (simulated or real) hours.")
+    parser.add_argument("--realtime", action="store_true", help="Run the real loop threads on the system clock.")
+    parser.add_argument("--bucket-minutes", type=float, default=60, help="Trend bucket length.")
+    parser.add_argument("--sample-seconds", type=float, default=60, help="Sampling period in realtime mode.")
+    parser.add_argument("--interval", type=int, default=60, help="Activity interval for the soak config.")
+    parser.add_argument("--max-rss-growth", type=float, default=SoakThresholds.max_rss_growth_mb_per_hour, help="MB per hour.")
+    parser.add_argument("--max-thread-growth", type=int, default=SoakThresholds.max_thread_growth)
+    parser.add_argument("--max-handle-growth", type=int, default=SoakThresholds.max_handle_growth)
+    parser.add_argument("--max-cpu-creep", type=float, default=SoakThresholds.max_cpu_creep_ratio, help="Allowed CPU-per-bucket increase ratio.")
+    args = parser.parse_args(argv)
+
+    duration = args.hours * 3600
+    bucket_seconds = args.bucket_minutes * 60
+    if args.realtime:
+        samples = run_realtime(duration, args.sample_seconds, args.interval)
+    else:
+        samples = run_accelerated(duration, bucket_seconds, interval=args.interval)
+
+    thresholds = SoakThresholds(
+        max_rss_growth_mb_per_hour=args.max_rss_growth,
+        max_thread_growth=args.max_thread_growth,
+        max_handle_growth=args.max_handle_growth,
+        max_cpu_creep_ratio=args.max_cpu_creep,
+    )
+    trends = summarize_buckets(samples, bucket_seconds)
+    failures = evaluate_trends(trends, thresholds, bucket_seconds)
+    print(format_report(trends, failures, "realtime" if args.realtime else "accelerated"))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,64 @@
+import dataclasses
+import os
+import subprocess
+import sys
 import threading
 import unittest
+from datetime import datetime
 from types import SimpleNamespace
 
 from alive_forever.app import KeepAliveApp
+from alive_forever.core.config import AppConfig, RuntimeStats
+from alive_forever.core.scheduler import ScheduleConfig, TimeWindow
+from alive_forever.core.simulation import AppSimulator, FakeInputBackend, FakeProcessTable, SimulatedClock, create_quiet_logger
+from alive_forever.core.targets import TargetProcessGate
+
+
+# Runs the app for a simulated hour in a fresh interpreter, then loads the Tcl half of Tk on top.
+TK_MEMORY_PROBE = """
+import sys
+from datetime import datetime
+from benchmarks.soak import build_soak_app, read_process_resources
+from alive_forever.core.simulation import AppSimulator, SimulatedClock
+
+simulator = AppSimulator(build_soak_app(SimulatedClock(datetime(2026, 4, 6, 9, 0))))
+simulator.start()
+simulator.run_for(3600)
+idle_rss = read_process_resources()[0]
+tk_loaded = "_tkinter" in sys.modules
+import tkinter
+interpreter = tkinter.Tcl()
+print(tk_loaded, idle_rss, read_process_resources()[0])
+"""
+
+
+class _BlockingInputBackend:
+    """Hangs in its first ``send_activity`` until released, like a stuck ``SendInput``."""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.second_call = threading.Event()
+        self.calls = 0
+
+    def send_activity(self, activity_type):
+        self.calls += 1
+        if self.calls == 1:
+            self.entered.set()
+            self.release.wait(10)
+        else:
+            self.second_call.set()
 
 
 class KeepAliveAppLoopTests(unittest.TestCase):
     def _build_app(self):
         app = KeepAliveApp.__new__(KeepAliveApp)
         app.config = SimpleNamespace(interval=60)
+        app.stats = RuntimeStats()
+        app.cadence_anchor = None
+        app.presence = None
+        app.targets = TargetProcessGate(FakeProcessTable(), None, None)
+        app.effective_cadence = lambda now=None: (60, "Both", None)
         app.shutdown_event = threading.Event()
         return app
 
@@ -17,24 +67,148 @@ class KeepAliveAppLoopTests(unittest.TestCase):
         states = iter(["active", "scheduled_off"])
         app.get_runtime_state = lambda now=None: next(states)
         app.refresh_runtime_state = lambda notify=True: None
-        app.simulate_activity = lambda: self.fail("simulate_activity should not run when schedule turned off")
+        app.simulate_activity = lambda activity_type=None: self.fail("simulate_activity should not run when schedule turned off")
 
         next_run = KeepAliveApp.process_activity_tick(app, 100.0, now_monotonic=100.0)
 
         self.assertEqual(100.0, next_run)
+        self.assertEqual(1, app.stats.skipped_activity_count)
 
     def test_process_activity_tick_runs_when_state_stays_active(self):
         app = self._build_app()
         app.get_runtime_state = lambda now=None: "active"
         app.refresh_runtime_state = lambda notify=True: None
         activity_calls = []
-        app.simulate_activity = lambda: activity_calls.append("called")
+        app.simulate_activity = lambda activity_type=None: activity_calls.append(activity_type)
 
         next_run = KeepAliveApp.process_activity_tick(app, 100.0, now_monotonic=100.0)
 
-        self.assertEqual(["called"], activity_calls)
+        self.assertEqual(["Both"], activity_calls)
         self.assertEqual(160.0, next_run)
 
+    def test_activity_updates_runtime_stats_without_touching_the_config_snapshot(self):
+        clock = SimulatedClock(datetime(2026, 4, 9, 10, 0))
+        config = AppConfig()
+        app = KeepAliveApp(config=config, clock=clock, input_backend=FakeInputBackend(clock), logger=create_quiet_logger(), stats=RuntimeStats(41))
+
+        self.assertTrue(app.simulate_activity())
+
+        self.assertIs(config, app.config)
+        self.assertEqual((1, 42, datetime(2026, 4, 9, 10, 0)), (app.stats.session_activity_count, app.stats.lifetime_activity_count, app.stats.last_activity_at))
+        self.assertEqual({"lifetime_activity_count": 42, "last_activity_at": "2026-04-09T10:00:00", "pause_until": None}, app.stats.to_dict())
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            config.interval = 30
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            config.schedule.enabled = True
+
+
+class ApplyConfigTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = SimulatedClock(datetime(2026, 4, 9, 10, 0))
+        self.config = AppConfig(interval=300, notifications_enabled=False)
+        self.app = KeepAliveApp(config=self.config, clock=self.clock, input_backend=FakeInputBackend(self.clock), logger=create_quiet_logger())
+        self.saves = []
+        self.app.save_config = lambda: self.saves.append(self.app.config)
+        self.simulator = AppSimulator(self.app)
+        self.simulator.step()
+        self.clock.advance(10)
+
+    def test_interval_change_reanchors_the_pending_deadline_on_the_last_activity(self):
+        anchor = self.app.cadence_anchor
+        self.assertEqual(anchor + 300, self.app.next_run)
+
+        self.assertEqual({"interval"}, self.app.apply_config(dataclasses.replace(self.config, interval=30)))
+        self.assertEqual(anchor + 30, self.app.next_run)
+        self.assertEqual(20.0, self.simulator.step())
+
+        self.app.apply_config(dataclasses.replace(self.config, interval=600))
+        self.assertEqual(self.app.cadence_anchor + 600, self.app.next_run)
+
+    def test_unrelated_fields_skip_runtime_work_and_schedule_changes_apply_at_once(self):
+        refreshes = []
+        refresh = self.app.refresh_runtime_state
+        self.app.refresh_runtime_state = lambda notify=True: (refreshes.append(notify), refresh(notify))
+        next_run = self.app.next_run
+
+        self.assertEqual(set(), self.app.apply_config(dataclasses.replace(self.config)))
+        self.assertEqual({"start_minimized"}, self.app.apply_config(dataclasses.replace(self.config, start_minimized=False)))
+        self.assertEqual(([], next_run, 1), (refreshes, self.app.next_run, len(self.saves)))
+
+        schedule = ScheduleConfig(enabled=True, windows=(TimeWindow(start="13:00", end="17:00"),))
+        self.app.apply_config(dataclasses.replace(self.app.config, schedule=schedule))
+        self.assertEqual([False], refreshes)
+        self.assertEqual("scheduled_off", self.app._last_status)
+        self.assertEqual(3 * 3600 - 10, self.app.seconds_until_next_deadline(self.app.next_run))
+
+    def test_stalled_injection_blocks_neither_the_restarted_loop_nor_config_applies(self):
+        backend = _BlockingInputBackend()
+        app = KeepAliveApp(config=AppConfig(interval=10, notifications_enabled=False), input_backend=backend, logger=create_quiet_logger())
+        app.save_config = lambda: None
+        app.start_activity_thread()
+        self.assertTrue(backend.entered.wait(5))
+        stalled_thread = app.thread
+
+        self.assertEqual("stalled", app.watchdog.check(now_monotonic=app.last_heartbeat + 60))
+        try:
+            self.assertTrue(backend.second_call.wait(5))
+            applier = threading.Thread(target=app.apply_config, args=(dataclasses.replace(app.config, interval=20),))
+            applier.start()
+            applier.join(5)
+            self.assertFalse(applier.is_alive())
+            self.assertEqual(app.cadence_anchor + 20, app.next_run)
+        finally:
+            next_run = app.next_run
+            backend.release.set()
+            stalled_thread.join(5)
+            app.shutdown_event.set()
+            app.thread.join(5)
+        # The replaced loop wakes up and exits without publishing its stale deadline.
+        self.assertEqual(next_run, app.next_run)
+
+
+class DeferredTkTests(unittest.TestCase):
+    def _build_app(self):
+        clock = SimulatedClock(datetime(2026, 4, 9, 10, 0))
+        return KeepAliveApp(config=AppConfig(), clock=clock, input_backend=FakeInputBackend(clock), logger=create_quiet_logger())
+
+    def test_open_settings_queues_for_the_main_thread_until_tk_runs(self):
+        app = self._build_app()
+        app._serving_ui = True
+
+        app.open_settings()
+
+        self.assertIsNone(app.root)
+        self.assertEqual(app._show_settings_window, app._ui_requests.get_nowait())
+
+    def test_idle_teardown_waits_for_closed_settings_and_pending_callbacks(self):
+        app = self._build_app()
+        quits = []
+        app.root = SimpleNamespace(quit=lambda: quits.append(True))
+        app.settings_window = SimpleNamespace(is_open=True)
+
+        app._teardown_tk_if_idle()
+        app.settings_window.is_open = False
+        app._ui_pending = 1
+        app._teardown_tk_if_idle()
+        self.assertEqual([], quits)
+
+        app._ui_pending = 0
+        app._teardown_tk_if_idle()
+        self.assertEqual([True], quits)
+        self.assertIsNone(app.root)
+
+    def test_idle_tray_app_never_loads_tk_and_saves_its_memory(self):
+        root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root_dir, os.environ.get("PYTHONPATH")])))
+        output = subprocess.run([sys.executable, "-c", TK_MEMORY_PROBE], cwd=root_dir, env=env, capture_output=True, text=True, check=True).stdout
+        tk_loaded, idle_rss, tcl_rss = output.split()
+        if idle_rss == "None":
+            self.skipTest("process RSS is not readable here")
+
+        self.assertEqual("False", tk_loaded)
+        # Only the Tcl interpreter can load without a display, so this is a lower bound on what Tk costs.
+        self.assertGreater(int(tcl_rss) - int(idle_rss), 2 * 1024 * 1024)
+
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,101 @@
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+from alive_forever.cli import main
+
+
+class ScheduleCliTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.config_path = Path(self.directory.name) / "config.json"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _run(self, *argv, config=None):
+        if config is not None:
+            self.config_path.write_text(json.dumps(config), encoding="utf-8")
+        out = io.StringIO()
+        code = main(["schedule", *argv, "--config", str(self.config_path)], out=out)
+        return code, out.getvalue()
+
+    def _workday_config(self):
+        return {"schedule": {"enabled": True, "windows": [{"start": "09:00", "end": "17:00", "days": ["mon", "tue", "wed", "thu", "fri"]}]}}
+
+    def test_next_prints_requested_number_of_transitions(self):
+        code, output = self._run("next", "-n", "3", "--from", "2026-04-09T12:00", config=self._workday_config())
+
+        self.assertEqual(0, code)
+        self.assertEqual(
+            [
+                "Now: active",
+                "2026-04-09T17:00\tscheduled_off\tNext: Scheduled Off at Thu 17:00",
+                "2026-04-10T09:00\tactive\tNext: Active at Fri 09:00",
+                "2026-04-10T17:00\tscheduled_off\tNext: Scheduled Off at Fri 17:00",
+            ],
+            output.splitlines(),
+        )
+
+    def test_check_reports_invalid_windows_and_time_zone(self):
+        config = self._workday_config()
+        config["schedule"]["timezone"] = "Nowhere/City"
+        config["schedule"]["windows"].append({"start": "25:00", "end": "17:00"})
+
+        code, output = self._run("check", config=config)
+
+        self.assertEqual(1, code)
+        self.assertIn("ERROR schedule.timezone: Unknown time zone: Nowhere/City", output)
+        self.assertIn("ERROR schedule.windows[1]: Time must be in HH:MM format", output)
+
+        config["schedule"]["windows"][1] = {"start": "09:00", "end": "10:00", "days": ["mon"], "rule": "FREQ=WEEKLY;BYDAY=FR"}
+        code, output = self._run("check", config=config)
+        self.assertIn("ERROR schedule.windows[1]: Repeat rule FREQ=WEEKLY;BYDAY=FR never falls on the window's days.", output)
+
+    def test_check_accepts_only_whole_intervals_in_range(self):
+        config = self._workday_config()
+        for interval in (60.0, "45"):
+            config["interval"] = interval
+            self.assertEqual(0, self._run("check", config=config)[0])
+
+        config["interval"] = 301
+        code, output = self._run("check", config=config)
+        self.assertEqual(1, code)
+        self.assertIn("ERROR interval: 301 is outside 10-300 seconds", output)
+
+        # The app reads the interval with int(), so it would run these at another cadence.
+        for interval in (1.5, 60.5, "60.0"):
+            config["interval"] = interval
+            code, output = self._run("check", config=config)
+            self.assertEqual(1, code)
+            self.assertIn("ERROR interval: {0!r} must be a whole number of seconds".format(interval), output)
+
+    def test_csv_streams_intervals_covering_the_range(self):
+        code, output = self._run("csv", "--start", "2026-04-10", "--end", "2026-04-12", config=self._workday_config())
+
+        self.assertEqual(0, code)
+        self.assertEqual(
+            [
+                "start,end,state",
+                "2026-04-10T00:00,2026-04-10T09:00,inactive",
+                "2026-04-10T09:00,2026-04-10T17:00,active",
+                "2026-04-10T17:00,2026-04-12T00:00,inactive",
+            ],
+            output.splitlines(),
+        )
+
+    def test_csv_rejects_a_naive_start_with_an_aware_end(self):
+        self.config_path.write_text(json.dumps(self._workday_config()), encoding="utf-8")
+        errors = io.StringIO()
+        with redirect_stderr(errors), self.assertRaises(SystemExit) as raised:
+            self._run("csv", "--start", "2026-04-10", "--end", "2026-04-12T00:00+02:00")
+
+        self.assertEqual(2, raised.exception.code)
+        self.assertIn("--start and --end must both carry a UTC offset", errors.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
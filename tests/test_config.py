@@ -0,0 +1,26 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from alive_forever.core import config as config_module
+from alive_forever.core.config import AppConfig, load_app_state
+from alive_forever.core.simulation import create_quiet_logger
+
+
+class LoadAppStateTests(unittest.TestCase):
+    def test_a_missing_explicit_config_never_falls_back_to_or_migrates_the_legacy_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            legacy_file = Path(directory) / "legacy.json"
+            legacy_file.write_text('{"interval": 45}', encoding="utf-8")
+            with mock.patch.object(config_module, "CONFIG_FILE", Path(directory) / "config.json"), mock.patch.object(config_module, "LEGACY_CONFIG_FILE", legacy_file):
+                with mock.patch.object(config_module, "save_app_config") as save:
+                    config, _ = load_app_state(create_quiet_logger(), Path(directory) / "missing.json")
+                    self.assertEqual((AppConfig().interval, []), (config.interval, save.call_args_list))
+
+                    self.assertEqual(45, load_app_state(create_quiet_logger())[0].interval)
+                    save.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from alive_forever.system.host import HostPlatform, resolve_app_paths
+
+
+class ResolveAppPathsTests(unittest.TestCase):
+    def test_windows_keeps_everything_under_appdata(self):
+        paths = resolve_app_paths("nt", {"APPDATA": "C:\\Users\\me\\AppData\\Roaming"})
+
+        app_dir = Path("C:\\Users\\me\\AppData\\Roaming") / "AliveForever"
+        self.assertEqual((app_dir, app_dir / "logs", app_dir / "config.json", app_dir / "profiles"), paths[:4])
+
+    def test_posix_follows_xdg_and_ignores_relative_values(self):
+        environ = {"HOME": "/home/me", "XDG_CONFIG_HOME": "/cfg", "XDG_STATE_HOME": "relative/state", "XDG_RUNTIME_DIR": "/run/user/1000"}
+
+        paths = resolve_app_paths("posix", environ)
+
+        self.assertEqual(Path("/cfg/alive-forever/config.json"), paths.config_file)
+        self.assertEqual(Path("/cfg/alive-forever/profiles"), paths.profiles_dir)
+        self.assertEqual(Path("/home/me/.local/state/alive-forever/logs"), paths.log_dir)
+        self.assertEqual(Path("/run/user/1000"), paths.runtime_dir)
+
+
+class HostPlatformTests(unittest.TestCase):
+    def test_a_backend_missing_a_method_fails_when_constructed(self):
+        class IncompletePlatform(HostPlatform):
+            def create_instance_lock(self, name):
+                return None
+
+        with self.assertRaises(TypeError):
+            IncompletePlatform()
+
+
+@unittest.skipIf(os.name == "nt", "fcntl lock files are POSIX only")
+class LockFileInstanceTests(unittest.TestCase):
+    def test_second_instance_is_refused_until_the_first_releases(self):
+        from alive_forever.system.posix import LockFileInstance
+
+        with tempfile.TemporaryDirectory() as directory:
+            first = LockFileInstance("AliveForever.Singleton", Path(directory))
+            second = LockFileInstance("AliveForever.Singleton", Path(directory))
+
+            self.assertTrue(first.acquire())
+            self.assertFalse(second.acquire())
+            first.release()
+            self.assertTrue(second.acquire())
+            self.assertEqual(str(os.getpid()), (Path(directory) / "AliveForever.Singleton.lock").read_text(encoding="ascii"))
+            second.release()
@@ -0,0 +1,108 @@
+import gzip
+import os
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from alive_forever.system.logreader import LogReader
+
+
+def _line(index, level="INFO"):
+    return "2026-04-09 10:{0:02d}:00,000 | {1} | Event {2}\n".format(index % 60, level, index)
+
+
+class LogReaderTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_file = Path(self.directory.name) / "alive_forever.log"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write(self, lines, mode="a", path=None):
+        with open(path or self.log_file, mode, encoding="utf-8") as handle:
+            handle.writelines(lines)
+
+    def test_older_batches_and_repeated_misses_never_decompress_a_rotation_again(self):
+        for stamp, first in (("20260407-120000", 1), ("20260408-120000", 4)):
+            with gzip.open(str(self.log_file) + ".{0}.gz".format(stamp), "wt", encoding="utf-8") as handle:
+                handle.writelines([_line(first, "WARNING"), _line(first + 1), _line(first + 2, "WARNING")])
+        self._write([_line(10)])
+        reader = LogReader(self.log_file)
+
+        with mock.patch("alive_forever.system.logreader.gzip.open", wraps=gzip.open) as opened:
+            texts, cursor = [], None
+            while True:
+                lines, cursor = reader.search(level="WARNING", limit=1, cursor=cursor)
+                texts.extend(line.text.split(" | ")[2] for line in lines)
+                if cursor is None:
+                    break
+            self.assertEqual(["Event 6", "Event 4", "Event 3", "Event 1"], texts)
+            self.assertEqual(2, opened.call_count)
+
+            # With nothing cached, a filter that matches nothing decompresses each rotation only once.
+            reader.GZIP_CACHE_SIZE = 0
+            reader._decompressed.clear()
+            self.assertEqual(([], None), reader.search(text="missing"))
+            self.assertEqual(([], None), reader.search(text="missing"))
+            self.assertEqual(4, opened.call_count)
+
+    def test_search_filters_backwards_into_rotated_gzip_files(self):
+        with gzip.open(str(self.log_file) + ".20260408-120000.gz", "wt", encoding="utf-8") as handle:
+            handle.writelines([_line(1, "ERROR"), _line(2), _line(3, "WARNING")])
+        self._write([_line(10), _line(11, "ERROR"), _line(12), "2026-04-09 10:13:00,000 | INFO | partial"])
+        reader = LogReader(self.log_file)
+
+        lines, cursor = reader.search(level="WARNING", limit=2)
+        self.assertEqual(["Event 11", "Event 3"], [line.text.split(" | ")[2] for line in lines])
+
+        lines, cursor = reader.search(level="WARNING", limit=2, cursor=cursor)
+        self.assertEqual(["Event 1"], [line.text.split(" | ")[2] for line in lines])
+        self.assertIsNone(cursor)
+
+        lines, _ = reader.search(text="event 1")
+        self.assertEqual(["Event 12", "Event 11", "Event 10", "Event 1"], [line.text.split(" | ")[2] for line in lines])
+
+    def test_a_cursor_stays_in_its_file_when_the_log_rotates_between_batches(self):
+        with gzip.open(str(self.log_file) + ".20260408-120000.gz", "wt", encoding="utf-8") as handle:
+            handle.writelines([_line(1), _line(2)])
+        self._write([_line(10), _line(11), _line(12)])
+        reader = LogReader(self.log_file)
+
+        lines, cursor = reader.search(limit=2)
+        self.assertEqual(["Event 12", "Event 11"], [line.text.split(" | ")[2] for line in lines])
+
+        rotated = str(self.log_file) + ".20260409-100000"
+        os.replace(self.log_file, rotated)
+        with open(rotated, "rb") as source, gzip.open(rotated + ".gz", "wb") as target:
+            target.write(source.read())
+        os.remove(rotated)
+        self._write([_line(20), _line(21)], mode="w")
+
+        lines, cursor = reader.search(limit=10, cursor=cursor)
+        self.assertEqual(["Event 10", "Event 2", "Event 1"], [line.text.split(" | ")[2] for line in lines])
+        self.assertIsNone(cursor)
+
+        self.assertEqual(["Event 21"], [line.text.split(" | ")[2] for line in reader.search(limit=1)[0]])
+        os.remove(str(self.log_file) + ".20260408-120000.gz")
+        stale = reader.cursor_before(reader.search(limit=10)[0][-1])
+        os.remove(rotated + ".gz")
+        self.assertEqual(([], None), reader.search(cursor=stale))
+
+    def test_follow_returns_only_new_lines_and_survives_rotation(self):
+        self._write([_line(1)])
+        reader = LogReader(self.log_file)
+        self.assertEqual([], reader.follow())
+
+        self._write([_line(2), _line(3)])
+        self.assertEqual(["Event 2", "Event 3"], [line.text.split(" | ")[2] for line in reader.follow()])
+        self.assertEqual([], reader.follow())
+
+        os.replace(self.log_file, str(self.log_file) + ".20260409-100000")
+        self._write([_line(4)], mode="w")
+        self.assertEqual(["Event 4"], [line.text.split(" | ")[2] for line in reader.follow()])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import gzip
+import logging
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from alive_forever.system.logs import (
+    LOG_MAINTENANCE,
+    ROUTINE_ACTIVITY,
+    CompactingFileHandler,
+    list_rotated_logs,
+    prune_rotated_logs,
+)
+
+
+class CompactingFileHandlerTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_file = Path(self.directory.name) / "alive_forever.log"
+        self.logger = logging.getLogger("alive_forever_test_logs")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+
+    def tearDown(self):
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
+        LOG_MAINTENANCE.join()
+        self.directory.cleanup()
+
+    def _attach(self, **kwargs):
+        handler = CompactingFileHandler(self.log_file, **kwargs)
+        handler.setFormatter(logging.Formatter("%(levelname)s | %(message)s"))
+        self.logger.addHandler(handler)
+        return handler
+
+    def _lines(self):
+        return self.log_file.read_text(encoding="utf-8").splitlines()
+
+    def test_routine_activity_is_folded_and_flushed_before_state_changes(self):
+        handler = self._attach(summary_interval=3600)
+        for index in range(1, 6):
+            self.logger.info("Simulated activity #%s", index, extra=ROUTINE_ACTIVITY)
+        handler.flush()
+        self.assertEqual([], self._lines())
+
+        self.logger.info("State changed to Scheduled Off")
+        self.logger.error("Activity simulation failed")
+
+        lines = self._lines()
+        self.assertEqual(3, len(lines))
+        self.assertRegex(lines[0], r"^INFO \| Activity summary: 5 routine event\(s\) between .* last: Simulated activity #5$")
+        self.assertEqual("INFO | State changed to Scheduled Off", lines[1])
+        self.assertEqual("ERROR | Activity simulation failed", lines[2])
+
+    def test_verbose_mode_writes_every_activity(self):
+        self._attach(summary_interval=0)
+        for index in range(3):
+            self.logger.info("Simulated activity #%s", index, extra=ROUTINE_ACTIVITY)
+        self.assertEqual(3, len(self._lines()))
+
+    def test_rotation_compresses_in_background_and_prunes_by_size(self):
+        self._attach(max_bytes=200, summary_interval=0, max_total_bytes=10 * 1024)
+        for index in range(40):
+            self.logger.info("State changed to %s with some padding text", index)
+        LOG_MAINTENANCE.join()
+
+        rotated = list_rotated_logs(self.log_file)
+        self.assertTrue(rotated)
+        self.assertTrue(all(path.name.endswith(".gz") for path in rotated))
+        with gzip.open(rotated[0], "rt", encoding="utf-8") as handle:
+            self.assertIn("State changed to 0 with some padding text", handle.read())
+
+        old_file = rotated[0]
+        stale = time.time() - 40 * 86400
+        os.utime(old_file, (stale, stale))
+        removed = prune_rotated_logs(self.log_file, max_age_days=30, max_total_bytes=0)
+        self.assertEqual([old_file], removed)
+
+
+if __name__ == "__main__":
+    unittest.main()
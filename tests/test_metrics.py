@@ -0,0 +1,58 @@
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from alive_forever.app import KeepAliveApp
+from alive_forever.core.config import AppConfig
+from alive_forever.core.scheduler import ScheduleConfig, TimeWindow
+from alive_forever.core.simulation import AppSimulator, FakeInputBackend, SimulatedClock, create_quiet_logger
+from alive_forever.system.metrics import METRICS_FILE_NAME
+
+
+class MetricsTextfileExporterTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.clock = SimulatedClock(datetime(2026, 4, 6, 16, 58))
+        schedule = ScheduleConfig(enabled=True, windows=[TimeWindow(start="09:00", end="17:00")])
+        config = AppConfig(schedule=schedule, metrics_textfile_dir=self.directory.name)
+        self.app = KeepAliveApp(config=config, clock=self.clock, input_backend=FakeInputBackend(self.clock), logger=create_quiet_logger())
+        self.path = Path(self.directory.name) / METRICS_FILE_NAME
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_file_is_written_atomically_with_state_counters_and_timestamps(self):
+        AppSimulator(self.app).run_for(30)
+
+        lines = self.path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(["alive_forever.prom"], [path.name for path in Path(self.directory.name).iterdir()])
+        self.assertIn('alive_forever_state{state="active"} 1', lines)
+        self.assertIn('alive_forever_state{state="scheduled_off"} 0', lines)
+        self.assertIn("alive_forever_session_activities_total 1", lines)
+        self.assertIn("alive_forever_skipped_activities_total 0", lines)
+        self.assertIn("alive_forever_next_transition_timestamp_seconds {0!r}".format(datetime(2026, 4, 6, 17, 0).timestamp()), lines)
+        self.assertIn("alive_forever_start_time_seconds {0!r}".format(datetime(2026, 4, 6, 16, 58).timestamp()), lines)
+        self.assertIn("alive_forever_tick_duration_seconds_count 1", lines)
+        self.assertEqual("# EOF", lines[-1])
+
+    def test_unchanged_state_skips_writes_until_something_happens(self):
+        simulator = AppSimulator(self.app).run_for(30)
+        self.assertEqual(1, self.app.metrics.write_count)
+
+        simulator.run_for(20)
+        self.assertEqual(1, self.app.metrics.write_count)
+        self.assertGreater(self.app.metrics.tick_count, 1)
+
+        simulator.run_for(15)
+        self.assertEqual(2, self.app.metrics.write_count)
+        self.assertIn("alive_forever_session_activities_total 2", self.path.read_text(encoding="utf-8"))
+
+        simulator.run_for(120)
+        lines = self.path.read_text(encoding="utf-8").splitlines()
+        self.assertIn('alive_forever_state{state="scheduled_off"} 1', lines)
+        self.assertIn("alive_forever_next_transition_timestamp_seconds {0!r}".format(datetime(2026, 4, 7, 9, 0).timestamp()), lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmarks.micro import CALIBRATION, compare_results, format_report, load_baseline, main, run_benchmarks
+
+
+class MicroBenchmarkTests(unittest.TestCase):
+    def test_comparison_is_relative_to_the_calibration_loop(self):
+        baseline = {"seconds_per_call": {CALIBRATION: 1.0, "steady": 1.0, "regressed": 1.0}}
+        # Twice as slow a machine: steady stays within the threshold, regressed does not.
+        results = {CALIBRATION: 2.0, "steady": 2.4, "regressed": 3.0, "added": 0.5}
+
+        comparisons = compare_results(results, baseline, threshold=0.25)
+
+        self.assertEqual(["ok", "slower", "new"], [comparison.status for comparison in comparisons])
+        self.assertAlmostEqual(1.2, comparisons[0].ratio)
+        self.assertTrue(format_report(results, comparisons).endswith("FAIL: regressed slower than baseline by more than 25%"))
+
+    def test_filtered_run_saves_and_compares_against_its_baseline(self):
+        results = run_benchmarks("describe_schedule", repeat=1, min_sample_seconds=0.001)
+        self.assertEqual([CALIBRATION, "describe_schedule.small", "describe_schedule.large"], list(results))
+        self.assertTrue(all(seconds > 0 for seconds in results.values()))
+
+        with tempfile.TemporaryDirectory() as directory:
+            baseline_file = Path(directory) / "micro.json"
+            arguments = ["--filter", "describe_schedule.small", "--repeat", "1", "--min-sample-ms", "1", "--baseline", str(baseline_file)]
+            self.assertEqual(0, main(arguments + ["--save-baseline"]))
+            self.assertEqual({CALIBRATION, "describe_schedule.small"}, set(load_baseline(baseline_file)["seconds_per_call"]))
+            self.assertEqual(0, main(arguments + ["--threshold", "100"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from datetime import datetime, timezone
+
+from alive_forever.app import KeepAliveApp
+from alive_forever.core.config import AppConfig
+from alive_forever.core.notifications import NotificationDispatcher, parse_quiet_hours
+from alive_forever.core.scheduler import ScheduleConfig
+from alive_forever.core.simulation import AppSimulator, FakeInputBackend, SimulatedClock, create_quiet_logger
+
+
+class NotificationDispatcherTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = SimulatedClock(datetime(2026, 4, 9, 10, 0))
+        self.shown = []
+        self.dispatcher = NotificationDispatcher(lambda title, message: self.shown.append(title), self.clock, create_quiet_logger())
+
+    def test_flapping_pause_resume_from_the_tray_shows_only_the_final_state(self):
+        app = KeepAliveApp(config=AppConfig(), clock=self.clock, input_backend=FakeInputBackend(self.clock), logger=create_quiet_logger())
+        app._set_pause = lambda paused, until=None: setattr(app, "manual_paused", paused)
+        simulator = AppSimulator(app)
+        simulator.step()
+
+        for _ in range(3):
+            app.pause()
+            app.resume()
+        app.pause()
+        self.assertEqual([], simulator.tray.notifications)
+
+        simulator.run_for(60)
+        self.assertEqual(["Manually Paused"], [title for title, _ in simulator.tray.notifications])
+
+        app.resume()
+        app.pause()
+        simulator.run_for(60)
+        self.assertEqual(1, len(simulator.tray.notifications))
+        self.assertEqual(8, app.notifier.coalesced_count)
+
+    def test_messages_are_spaced_by_the_minimum_gap_in_order(self):
+        self.dispatcher.submit("First", "one")
+        self.dispatcher.submit("Second", "two")
+
+        self.assertEqual(2.0, self.dispatcher.seconds_until_due())
+        self.clock.advance(2)
+        self.assertEqual(1, self.dispatcher.deliver_due())
+        self.assertEqual(10.0, self.dispatcher.seconds_until_due())
+        self.clock.advance(10)
+        self.assertEqual(1, self.dispatcher.deliver_due())
+        self.assertEqual((["First", "Second"], None), (self.shown, self.dispatcher.seconds_until_due()))
+
+    def test_quiet_hours_drop_messages_and_may_wrap_past_midnight(self):
+        self.dispatcher.quiet_hours = parse_quiet_hours("09:00-10:01")
+        self.dispatcher.submit("Scheduled Off", "late", kind="state")
+        self.clock.advance(2)
+        self.assertEqual(0, self.dispatcher.deliver_due())
+
+        self.dispatcher.quiet_hours = parse_quiet_hours("22:00-07:00")
+        self.dispatcher.submit("Active", "morning", kind="state")
+        self.clock.advance(2)
+        self.assertEqual(1, self.dispatcher.deliver_due())
+        self.assertEqual((["Active"], 1), (self.shown, self.dispatcher.suppressed_count))
+        for value in ("22:00", "22:00-22:00", "25:00-07:00"):
+            with self.assertRaises(ValueError):
+                parse_quiet_hours(value)
+
+    def test_app_reads_quiet_hours_in_the_schedule_time_zone_and_leaves_the_wait_to_the_dispatcher(self):
+        # 13:00 UTC is 22:00 in Tokyo.
+        clock = SimulatedClock(datetime(2026, 4, 9, 13, 0, tzinfo=timezone.utc))
+        config = AppConfig(interval=300, quiet_hours="21:00-23:00", schedule=ScheduleConfig(timezone="Asia/Tokyo"))
+        app = KeepAliveApp(config=config, clock=clock, input_backend=FakeInputBackend(clock), logger=create_quiet_logger())
+        simulator = AppSimulator(app)
+        simulator.step()
+
+        app.notify("queued", title="Queued")
+        self.assertEqual(300, app.seconds_until_next_deadline(app.next_run))
+        self.assertEqual(2.0, simulator.step())
+        simulator.run_for(5)
+        self.assertEqual(([], 1), (simulator.tray.notifications, app.notifier.suppressed_count))
+
+
+if __name__ == "__main__":
+    unittest.main()
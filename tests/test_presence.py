@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from alive_forever.app import KeepAliveApp
+from alive_forever.core.config import AppConfig, config_from_raw
+from alive_forever.core.simulation import AppSimulator, FakeInputBackend, SimulatedClock, create_quiet_logger
+from alive_forever.system.presence import LogTail, PresenceVerifier
+
+
+def append(path, text):
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(text)
+
+
+class PresenceLogTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_file = Path(self.directory.name) / "logs.txt"
+        self.clock = SimulatedClock(datetime(2026, 4, 9, 10, 0))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_tail_reads_only_new_complete_lines_and_follows_rotation(self):
+        append(self.log_file, "old one\nold two\n")
+        tail = LogTail(self.log_file)
+        self.assertEqual([], tail.read_new_lines())
+
+        append(self.log_file, "first\nsec")
+        self.assertEqual(["first"], tail.read_new_lines())
+        append(self.log_file, "ond\n")
+        self.assertEqual(["second"], tail.read_new_lines())
+
+        os.replace(self.log_file, self.log_file.with_name("logs.1.txt"))
+        append(self.log_file, "after rotation\n")
+        self.assertEqual(["after rotation"], tail.read_new_lines())
+        with open(self.log_file, "w", encoding="utf-8") as handle:
+            handle.write("truncated\n")
+        self.assertEqual(["truncated"], tail.read_new_lines())
+
+    def test_history_sets_the_starting_state_without_confirming_it(self):
+        append(self.log_file, "Thu Apr 09 2026 09:00:00 -- info -- StatusIndicatorStateService: Added Available (current state: Away -> Available)\n")
+        verifier = PresenceVerifier(self.log_file, self.clock, create_quiet_logger())
+        self.assertEqual(([], "Available", None), (verifier.poll(), verifier.status, verifier.lag_seconds()))
+        self.assertFalse(verifier.is_confirmed_present())
+
+        append(self.log_file, "2026-04-09T10:00:05 UserPresenceAction: Setting availability to Away\n")
+        self.clock.advance(5)
+        self.assertEqual(["Away"], [change.status for change in verifier.poll()])
+
+        custom = PresenceVerifier(self.log_file, self.clock, create_quiet_logger(), parser=lambda line: "Busy" if "busy" in line else None)
+        custom.poll()
+        append(self.log_file, "user is busy\n")
+        self.assertEqual(["Busy"], [change.status for change in custom.poll()])
+        self.assertTrue(custom.is_confirmed_present())
+        self.assertIsNone(config_from_raw({"presence_pattern": "(no status group)"}).presence_pattern)
+
+    def test_app_skips_activity_while_present_and_alerts_when_away_despite_activity(self):
+        append(self.log_file, "")
+        config = AppConfig(interval=60, presence_log_path=str(self.log_file))
+        backend = FakeInputBackend(self.clock)
+        app = KeepAliveApp(config=config, clock=self.clock, input_backend=backend, logger=create_quiet_logger())
+        simulator = AppSimulator(app)
+        simulator.step()
+        self.assertEqual(1, len(backend.events))
+
+        append(self.log_file, "availability: Available\n")
+        simulator.run_for(60)
+        self.assertEqual((1, 1), (len(backend.events), app.stats.skipped_activity_count))
+        self.assertTrue(app.describe_presence().startswith("Teams presence: Available (confirmed"))
+
+        simulator.run_for(120)
+        self.assertGreater(len(backend.events), 1)
+        append(self.log_file, "availability: Away\n")
+        simulator.run_for(60)
+        self.assertIn("Presence Not Kept", [title for title, _ in simulator.tray.notifications])
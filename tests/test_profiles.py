@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import alive_forever.core.config as config_module
+from alive_forever.core.config import AppConfig, config_from_raw
+from alive_forever.core.profiles import ProfileLibrary
+from alive_forever.core.scheduler import ScheduleConfig, TimeWindow, compile_schedule
+
+
+class ProfileLibraryTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.profiles_dir = Path(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write(self, name, interval=90, start="08:00"):
+        raw = {"interval": interval, "activity_type": "Both", "schedule": {"enabled": True, "windows": [{"start": start, "end": "16:00", "days": ["mon"]}]}}
+        (self.profiles_dir / (name + ".json")).write_text(json.dumps(raw), encoding="utf-8")
+
+    def test_user_profiles_are_listed_without_parsing_and_loaded_once(self):
+        self._write("On-site")
+        (self.profiles_dir / "Broken.json").write_text("{not json", encoding="utf-8")
+        library = ProfileLibrary(self.profiles_dir)
+
+        self.assertEqual(["Custom", "Always On", "Workday", "Evening", "Stealth", "Broken", "On-site"], library.names())
+        self.assertIsNone(library.get("Broken"))
+        self.assertIsNone(library.get("../config"))
+
+        first = library.get("On-site")
+        self.assertEqual(90, first.interval)
+        self.assertIs(first, library.get("On-site"))
+
+        self._write("On-site", interval=120)
+        os.utime(self.profiles_dir / "On-site.json", ns=(1, 1))
+        reloaded = library.get("On-site")
+        self.assertEqual(120, reloaded.interval)
+        self.assertIs(first.schedule, reloaded.schedule)
+
+        shared_count = len(library._by_hash)
+        self._write("On-site", start="07:00")
+        os.utime(self.profiles_dir / "On-site.json", ns=(2, 2))
+        self.assertEqual("07:00", library.get("On-site").schedule.windows[0].start)
+        self.assertEqual(shared_count, len(library._by_hash))
+        os.remove(self.profiles_dir / "On-site.json")
+        self.assertIsNone(library.get("On-site"))
+        self.assertEqual(shared_count - 1, len(library._by_hash))
+
+    def test_switching_shares_the_compiled_schedule_and_profile_name_survives_reload(self):
+        library = ProfileLibrary(self.profiles_dir)
+        remote = library.save("Remote", 45, "Mouse Jiggle", ScheduleConfig(enabled=True, windows=[TimeWindow(start="10:00", end="18:00")]))
+
+        config = remote.apply_to(AppConfig(start_minimized=False))
+
+        self.assertEqual(("Remote", 45, "Mouse Jiggle", False), (config.profile_name, config.interval, config.activity_type, config.start_minimized))
+        self.assertIs(remote.schedule, config.schedule)
+        with mock.patch("alive_forever.core.scheduler.schedule_cache_key", side_effect=AssertionError("schedule compiled again")):
+            compile_schedule(config.schedule)
+        self.assertIs(library.get("Workday").schedule, library.get("Workday").apply_to(config).schedule)
+        with self.assertRaises(ValueError):
+            library.save("Workday", 60, "Both", ScheduleConfig())
+
+        user_profile_path = config_module.user_profile_path
+        with mock.patch.object(config_module, "user_profile_path", lambda name: user_profile_path(name, self.profiles_dir)):
+            self.assertEqual("Remote", config_from_raw({"profile_name": "Remote"}).profile_name)
+            self.assertEqual("Custom", config_from_raw({"profile_name": "Missing"}).profile_name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import tempfile
+import threading
+import tracemalloc
+import unittest
+from datetime import datetime
+
+from alive_forever.core.profiling import PROFILER_SEES_ALL_THREADS, ProfilingSession
+from alive_forever.core.simulation import SimulatedClock
+
+
+def _busy_work():
+    return sorted(str(index) for index in range(5000))
+
+
+class ProfilingSessionTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.clock = SimulatedClock(datetime(2026, 4, 9, 10, 0))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_threads_attach_until_deadline_then_results_are_written(self):
+        finished = []
+        session = ProfilingSession(self.directory.name, 60, self.clock, top_n=5, on_finished=finished.append).start()
+        self.assertTrue(session.attach_current_thread("activity"))
+
+        def tk_thread():
+            session.attach_current_thread("tk")
+            _busy_work()
+            self.clock.advance(60)
+            session.attach_current_thread("tk")
+
+        _busy_work()
+        worker = threading.Thread(target=tk_thread)
+        worker.start()
+        worker.join()
+        self.assertEqual([], finished)
+
+        self.assertFalse(session.attach_current_thread("activity"))
+        self.assertEqual([session], finished)
+        self.assertFalse(tracemalloc.is_tracing())
+
+        names = sorted(path.name for path in session.output_files)
+        self.assertEqual(["profile-20260409-100000-alloc.txt", "profile-20260409-100000-summary.txt", "profile-20260409-100000.prof"], names)
+        summary = (session.output_dir / "profile-20260409-100000-summary.txt").read_text(encoding="utf-8")
+        self.assertIn("_busy_work", summary)
+
+    def test_stop_ends_the_session_on_the_next_check(self):
+        session = ProfilingSession(self.directory.name, 300, self.clock).start()
+        session.attach_current_thread("activity")
+        self.assertEqual(300, session.seconds_remaining())
+
+        session.stop()
+
+        self.assertFalse(session.attach_current_thread("activity"))
+        self.assertFalse(session.is_running)
+        self.assertEqual(3, len(session.output_files))
+
+    def test_a_thread_that_never_checks_out_is_written_without_after_the_grace_period(self):
+        finished = []
+        session = ProfilingSession(self.directory.name, 60, self.clock, top_n=5, on_finished=finished.append).start()
+        release = threading.Event()
+        attached = threading.Event()
+
+        def hung_loop():
+            session.attach_current_thread("activity")
+            attached.set()
+            release.wait(10)
+
+        worker = threading.Thread(target=hung_loop)
+        worker.start()
+        try:
+            self.assertTrue(attached.wait(5))
+            session.attach_current_thread("tk")
+            _busy_work()
+            self.clock.advance(60)
+            self.assertFalse(session.attach_current_thread("tk"))
+            self.assertFalse(session.finish_overdue())
+            self.assertEqual([], finished)
+
+            self.clock.advance(session.GRACE_SECONDS)
+            self.assertTrue(session.finish_overdue())
+        finally:
+            release.set()
+            worker.join()
+
+        self.assertEqual([session], finished)
+        self.assertFalse(session.finish_overdue(force=True))
+        summary = (session.output_dir / "profile-20260409-100000-summary.txt").read_text(encoding="utf-8")
+        self.assertIn("_busy_work", summary)
+        if not PROFILER_SEES_ALL_THREADS:
+            self.assertIn("Left out, still running without checking in: activity", summary)
+
+    def test_force_writes_at_once_and_includes_threads_that_already_exited(self):
+        session = ProfilingSession(self.directory.name, 300, self.clock).start()
+        worker = threading.Thread(target=lambda: (session.attach_current_thread("activity"), _busy_work()))
+        worker.start()
+        worker.join()
+
+        self.assertTrue(session.finish_overdue(force=True))
+        self.assertFalse(session.is_running)
+        summary = (session.output_dir / "profile-20260409-100000-summary.txt").read_text(encoding="utf-8")
+        self.assertIn("_busy_work", summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,23 @@
 import unittest
-from datetime import datetime
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from zoneinfo import ZoneInfo
 
-from alive_forever.core.scheduler import ScheduleConfig, TimeWindow, get_next_transition, is_schedule_active
+from alive_forever.core.scheduler import (
+    CompiledSchedule,
+    ScheduleConfig,
+    TimeWindow,
+    compile_schedule,
+    format_transition,
+    get_next_transition,
+    is_schedule_active,
+    iter_transitions,
+    timeline_rows,
+)
+
+
+NEW_YORK = ZoneInfo("America/New_York")
 
 
 class ScheduleLogicTests(unittest.TestCase):
@@ -42,6 +58,185 @@ class ScheduleLogicTests(unittest.TestCase):
         self.assertEqual("active", transition[0])
         self.assertEqual(datetime(2026, 4, 9, 13, 0), transition[1])
 
+    def test_iter_transitions_merges_overlaps_and_streams_lazily(self):
+        schedule = ScheduleConfig(
+            enabled=True,
+            windows=[
+                TimeWindow(start="09:00", end="12:00", days=["mon", "tue", "wed", "thu", "fri"]),
+                TimeWindow(start="11:00", end="13:00", days=["thu"]),
+                TimeWindow(start="22:00", end="02:00", days=["fri"]),
+            ],
+        )
+        stream = iter_transitions(schedule, datetime(2026, 4, 9, 10, 0))
+
+        self.assertEqual(
+            [
+                ("scheduled_off", datetime(2026, 4, 9, 13, 0)),
+                ("active", datetime(2026, 4, 10, 9, 0)),
+                ("scheduled_off", datetime(2026, 4, 10, 12, 0)),
+                ("active", datetime(2026, 4, 10, 22, 0)),
+                ("scheduled_off", datetime(2026, 4, 11, 2, 0)),
+                ("active", datetime(2026, 4, 13, 9, 0)),
+            ],
+            [next(stream) for _ in range(6)],
+        )
+        self.assertEqual(12, len(list(iter_transitions(schedule, datetime(2027, 1, 4), datetime(2027, 1, 11)))))
+
+    def test_iter_transitions_respects_end_and_stops_for_full_coverage(self):
+        schedule = ScheduleConfig(enabled=True, windows=[TimeWindow(start="09:00", end="17:00", days=["thu"])])
+        self.assertEqual(
+            [("active", datetime(2026, 4, 9, 9, 0)), ("scheduled_off", datetime(2026, 4, 9, 17, 0))],
+            list(iter_transitions(schedule, datetime(2026, 4, 6), datetime(2026, 4, 13))),
+        )
+
+        always = ScheduleConfig(enabled=True, windows=[TimeWindow(start="00:00", end="12:00"), TimeWindow(start="12:00", end="00:00")])
+        self.assertEqual([], list(iter_transitions(always, datetime(2026, 4, 9))))
+        self.assertIsNone(get_next_transition(always, datetime(2026, 4, 9)))
+
+    def test_compiled_schedule_is_kept_on_the_snapshot_and_shared_by_equal_ones(self):
+        schedule = ScheduleConfig(enabled=True, windows=[TimeWindow(start="09:00", end="17:00")])
+        compiled = compile_schedule(schedule)
+        with mock.patch("alive_forever.core.scheduler.schedule_cache_key", side_effect=AssertionError("content key rebuilt")):
+            self.assertIs(compiled, compile_schedule(schedule))
+
+        twin = ScheduleConfig(enabled=True, windows=[TimeWindow(start="09:00", end="17:00")])
+        self.assertEqual((schedule, hash(schedule)), (twin, hash(twin)))
+        self.assertIs(compiled, compile_schedule(twin))
+        self.assertFalse(compile_schedule(replace(schedule, enabled=False)).enabled)
+
+    def test_timeline_rows_split_overnight_windows_across_days(self):
+        schedule = ScheduleConfig(
+            enabled=True,
+            windows=[
+                TimeWindow(start="22:00", end="06:00", days=["thu"]),
+                TimeWindow(start="09:00", end="12:00", days=["fri"]),
+                TimeWindow(start="11:00", end="13:30", days=["fri"]),
+            ],
+        )
+
+        rows = timeline_rows(schedule, datetime(2026, 4, 9, 8, 0))
+
+        self.assertEqual(7, len(rows))
+        self.assertEqual((datetime(2026, 4, 9).date(), [(1320, 1440)]), rows[0])
+        self.assertEqual((datetime(2026, 4, 10).date(), [(0, 360), (540, 810)]), rows[1])
+        self.assertTrue(all(spans == [] for _, spans in rows[2:]))
+        self.assertEqual([(0, 1440)], timeline_rows(ScheduleConfig(enabled=False), datetime(2026, 4, 9))[3][1])
+
+
+class TimeZoneScheduleTests(unittest.TestCase):
+    def _occurrence(self, schedule, day):
+        start_at, end_at, _ = compile_schedule(schedule).occurrences_for_date(day)[0]
+        return start_at, end_at
+
+    def test_spring_forward_window_is_shorter_and_skipped_start_moves_forward(self):
+        schedule = ScheduleConfig(
+            enabled=True,
+            windows=[TimeWindow(start="01:00", end="05:00"), TimeWindow(start="02:30", end="06:00")],
+            timezone="America/New_York",
+        )
+        occurrences = compile_schedule(schedule).occurrences_for_date(datetime(2026, 3, 8).date())
+        start_at, end_at, _ = occurrences[0]
+        self.assertEqual(timedelta(hours=3), end_at - start_at)
+
+        skipped_start = occurrences[1][0]
+        self.assertEqual(datetime(2026, 3, 8, 7, 30, tzinfo=timezone.utc), skipped_start)
+        self.assertEqual("03:30", skipped_start.astimezone(NEW_YORK).strftime("%H:%M"))
+
+        self.assertTrue(is_schedule_active(schedule, datetime(2026, 3, 8, 6, 59, tzinfo=timezone.utc)))
+        self.assertEqual(
+            ("scheduled_off", datetime(2026, 3, 8, 10, 0, tzinfo=timezone.utc)),
+            get_next_transition(schedule, datetime(2026, 3, 8, 8, 0, tzinfo=timezone.utc)),
+        )
+
+    def test_fall_back_window_is_longer_and_repeated_hour_is_unambiguous(self):
+        schedule = ScheduleConfig(
+            enabled=True,
+            windows=[TimeWindow(start="01:00", end="03:00", days=["sun"]), TimeWindow(start="01:30", end="04:00", days=["mon"])],
+            timezone="America/New_York",
+        )
+        start_at, end_at = self._occurrence(schedule, datetime(2026, 11, 1).date())
+        self.assertEqual(timedelta(hours=3), end_at - start_at)
+        self.assertEqual(datetime(2026, 11, 1, 5, 0, tzinfo=timezone.utc), start_at)
+
+        transition = get_next_transition(schedule, datetime(2026, 11, 1, 4, 0, tzinfo=timezone.utc))
+        self.assertEqual("active", transition[0])
+        self.assertEqual(datetime(2026, 11, 1, 5, 0, tzinfo=timezone.utc), transition[1].astimezone(timezone.utc))
+        self.assertEqual("Next: Active at Sun 01:00 EDT", format_transition(transition))
+        self.assertTrue(is_schedule_active(schedule, datetime(2026, 11, 1, 1, 30, fold=1, tzinfo=NEW_YORK)))
+        self.assertFalse(is_schedule_active(schedule, datetime(2026, 11, 1, 3, 0, tzinfo=NEW_YORK)))
+
+    def test_schedule_is_evaluated_in_its_own_time_zone(self):
+        schedule = ScheduleConfig(enabled=True, windows=[TimeWindow(start="09:00", end="17:00", days=["thu"])], timezone="Europe/Berlin")
+
+        self.assertTrue(is_schedule_active(schedule, datetime(2026, 4, 9, 7, 30, tzinfo=timezone.utc)))
+        self.assertFalse(is_schedule_active(schedule, datetime(2026, 4, 9, 15, 30, tzinfo=timezone.utc)))
+        self.assertEqual("Europe/Berlin", ScheduleConfig.from_raw(schedule.to_dict()).timezone)
+        self.assertIsNone(ScheduleConfig.from_raw({"timezone": "Mars/Olympus"}).timezone)
+
+
+class RuleWindowTests(unittest.TestCase):
+    def test_every_other_friday(self):
+        window = TimeWindow(start="09:00", end="10:00", rule="freq=weekly;interval=2;byday=FR;dtstart=20260410")
+        schedule = ScheduleConfig(enabled=True, windows=[window])
+
+        self.assertEqual("FREQ=WEEKLY;INTERVAL=2;BYDAY=FR;DTSTART=20260410", window.rule)
+        self.assertEqual(
+            [datetime(2026, 4, 10, 9, 0), datetime(2026, 4, 10, 10, 0), datetime(2026, 4, 24, 9, 0), datetime(2026, 4, 24, 10, 0)],
+            [at for _, at in iter_transitions(schedule, datetime(2026, 4, 6), datetime(2026, 5, 1))],
+        )
+        self.assertFalse(is_schedule_active(schedule, datetime(2026, 4, 17, 9, 30)))
+        self.assertEqual(window, ScheduleConfig.from_raw(schedule.to_dict()).windows[0])
+
+    def test_monthly_ordinals_and_invalid_rules(self):
+        schedule = ScheduleConfig(enabled=True, windows=[TimeWindow(start="08:00", end="08:15", days=["mon", "fri"], rule="FREQ=MONTHLY;BYDAY=1MO,-1FR")])
+
+        self.assertEqual(("active", datetime(2026, 5, 29, 8, 0)), get_next_transition(schedule, datetime(2026, 5, 5)))
+        self.assertEqual(("active", datetime(2026, 6, 1, 8, 0)), get_next_transition(schedule, datetime(2026, 5, 30)))
+        for rule in ("FREQ=HOURLY", "FREQ=WEEKLY;INTERVAL=2;BYDAY=FR", "FREQ=WEEKLY;BYDAY=1MO", "FREQ=DAILY;COUNT=3"):
+            with self.assertRaises(ValueError):
+                TimeWindow(start="09:00", end="10:00", rule=rule)
+        raw = {"enabled": True, "windows": [{"start": "09:00", "end": "10:00", "rule": "FREQ=SOMETIMES"}]}
+        self.assertEqual(ScheduleConfig.default().windows, ScheduleConfig.from_raw(raw).windows)
+
+    def test_sparse_and_ending_rules_are_not_mistaken_for_coverage(self):
+        first_ten_days = "FREQ=MONTHLY;BYMONTHDAY=" + ",".join(str(day) for day in range(1, 11))
+        schedule = ScheduleConfig(
+            enabled=True,
+            windows=[TimeWindow(start="00:00", end="12:00", rule=first_ten_days), TimeWindow(start="12:00", end="00:00", rule=first_ten_days)],
+        )
+        self.assertEqual(("scheduled_off", datetime(2026, 4, 11, 0, 0)), get_next_transition(schedule, datetime(2026, 4, 2)))
+
+        leap_day = ScheduleConfig(enabled=True, windows=[TimeWindow(start="09:00", end="17:00", rule="FREQ=YEARLY;BYMONTH=2;BYMONTHDAY=29")])
+        self.assertEqual(("active", datetime(2028, 2, 29, 9, 0)), get_next_transition(leap_day, datetime(2026, 4, 9)))
+
+        ended = ScheduleConfig(enabled=True, windows=[TimeWindow(start="09:00", end="17:00", rule="FREQ=DAILY;UNTIL=20260401")])
+        self.assertIsNone(get_next_transition(ended, datetime(2026, 4, 9)))
+        self.assertFalse(is_schedule_active(ended, datetime(2026, 4, 9, 10, 0)))
+
+    def test_rules_that_never_fall_on_the_window_days_are_rejected_and_end_the_scan(self):
+        with self.assertRaises(ValueError):
+            TimeWindow(start="09:00", end="10:00", days=["mon"], rule="FREQ=WEEKLY;BYDAY=FR")
+        with self.assertRaises(ValueError):
+            TimeWindow(start="09:00", end="10:00", days=["tue"], rule="FREQ=DAILY;INTERVAL=14;DTSTART=20260406")
+        TimeWindow(start="09:00", end="10:00", days=["mon"], rule="FREQ=DAILY;INTERVAL=14;DTSTART=20260406")
+
+        # Compiled anyway, such a window still ends the scan at the rule horizon.
+        window = TimeWindow(start="09:00", end="10:00", days=["fri"], rule="FREQ=WEEKLY;BYDAY=FR")
+        object.__setattr__(window, "days", ("mon",))
+        compiled = CompiledSchedule(ScheduleConfig(enabled=True, windows=[window]))
+        self.assertIsNone(compiled.next_transition(datetime(2026, 4, 9)))
+        self.assertEqual([], list(compiled.iter_intervals(datetime(2026, 4, 9))))
+
+    def test_future_rule_with_back_to_back_windows_still_turns_on(self):
+        daily = "FREQ=DAILY;DTSTART=20260501"
+        schedule = ScheduleConfig(
+            enabled=True,
+            windows=[TimeWindow(start="00:00", end="12:00", rule=daily), TimeWindow(start="12:00", end="00:00", rule=daily)],
+        )
+
+        self.assertEqual(("active", datetime(2026, 5, 1, 0, 0)), get_next_transition(schedule, datetime(2026, 4, 9)))
+        self.assertEqual([("active", datetime(2026, 5, 1, 0, 0))], list(iter_transitions(schedule, datetime(2026, 4, 9))))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
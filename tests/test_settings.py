@@ -1,7 +1,13 @@
+import tempfile
 import tkinter as tk
 import unittest
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
 
-from alive_forever.core.scheduler import DAY_ORDER, TimeWindow
+from alive_forever.core.config import AppConfig
+from alive_forever.core.scheduler import DAY_ORDER, ScheduleConfig, TimeWindow
+from alive_forever.system.logreader import LogReader
 from alive_forever.ui.settings import SettingsWindow
 
 
@@ -17,7 +23,7 @@ class SettingsWindowSaveTests(unittest.TestCase):
     def setUp(self):
         self.root = tk.Tcl()
 
-    def _build_window(self, selection=(0,), start="10:00", end="18:00", selected_days=None):
+    def _build_window(self, selection=(0,), start="10:00", end="18:00", selected_days=None, interval="", activity="App Default", rule=""):
         if selected_days is None:
             selected_days = ["mon"]
 
@@ -25,6 +31,9 @@ class SettingsWindowSaveTests(unittest.TestCase):
         window.draft_windows = [TimeWindow(start="09:00", end="17:00", days=["mon"])]
         window.window_start_var = tk.StringVar(master=self.root, value=start)
         window.window_end_var = tk.StringVar(master=self.root, value=end)
+        window.window_interval_var = tk.StringVar(master=self.root, value=interval)
+        window.window_activity_var = tk.StringVar(master=self.root, value=activity)
+        window.window_rule_var = tk.StringVar(master=self.root, value=rule)
         window.window_day_vars = {
             day: tk.BooleanVar(master=self.root, value=day in selected_days) for day in DAY_ORDER
         }
@@ -32,14 +41,16 @@ class SettingsWindowSaveTests(unittest.TestCase):
         return window
 
     def test_build_schedule_windows_for_save_updates_selected_window(self):
-        window = self._build_window(selection=(0,), start="10:00", end="18:00", selected_days=["mon", "wed"])
+        window = self._build_window(selection=(0,), start="10:00", end="18:00", selected_days=["mon", "wed"], interval="30", activity="Mouse Jiggle")
 
         schedule_windows = window.build_schedule_windows_for_save()
 
         self.assertEqual(1, len(schedule_windows))
         self.assertEqual("10:00", schedule_windows[0].start)
         self.assertEqual("18:00", schedule_windows[0].end)
-        self.assertEqual(["mon", "wed"], schedule_windows[0].days)
+        self.assertEqual(("mon", "wed"), schedule_windows[0].days)
+        self.assertEqual((30, "Mouse Jiggle"), (schedule_windows[0].interval, schedule_windows[0].activity_type))
+        self.assertEqual("Mon, Wed | 10:00-18:00 | every 30s, Mouse Jiggle", schedule_windows[0].label())
 
     def test_build_schedule_windows_for_save_keeps_draft_without_selection(self):
         window = self._build_window(selection=(), start="10:00", end="18:00", selected_days=["mon", "wed"])
@@ -49,7 +60,250 @@ class SettingsWindowSaveTests(unittest.TestCase):
         self.assertEqual(1, len(schedule_windows))
         self.assertEqual("09:00", schedule_windows[0].start)
         self.assertEqual("17:00", schedule_windows[0].end)
-        self.assertEqual(["mon"], schedule_windows[0].days)
+        self.assertEqual(("mon",), schedule_windows[0].days)
+
+
+class _RecordingListbox:
+    def __init__(self):
+        self.rows = []
+        self.selection = ()
+        self.operations = []
+
+    def curselection(self):
+        return self.selection
+
+    def delete(self, first, last=None):
+        self.operations.append(("delete", first, last))
+        if last == tk.END:
+            del self.rows[first:]
+        else:
+            del self.rows[first]
+
+    def insert(self, index, *labels):
+        self.operations.append(("insert", index, len(labels)))
+        position = len(self.rows) if index == tk.END else index
+        self.rows[position:position] = list(labels)
+
+    def selection_clear(self, first, last=None):
+        self.selection = ()
+
+    def selection_set(self, index):
+        self.selection = (index,)
+
+    def see(self, index):
+        pass
+
+
+class SettingsWindowListEditingTests(unittest.TestCase):
+    def setUp(self):
+        self.root = tk.Tcl()
+
+    def _build_window(self, count=150, filter_text=""):
+        window = SettingsWindow.__new__(SettingsWindow)
+        SettingsWindow.__init__(window, SimpleNamespace(now_provider=lambda: datetime(2026, 4, 9, 8, 0)))
+        window._set_draft_windows(
+            [TimeWindow(start="{0:02d}:00".format(index % 24), end="{0:02d}:30".format(index % 24), days=[DAY_ORDER[index % 7]]) for index in range(count)]
+        )
+        window.window_filter_var = tk.StringVar(master=self.root, value=filter_text)
+        window.schedule_enabled_var = tk.BooleanVar(master=self.root, value=True)
+        window.window_start_var = tk.StringVar(master=self.root, value="10:00")
+        window.window_end_var = tk.StringVar(master=self.root, value="11:00")
+        window.window_interval_var = tk.StringVar(master=self.root, value="")
+        window.window_activity_var = tk.StringVar(master=self.root, value="App Default")
+        window.window_rule_var = tk.StringVar(master=self.root, value="")
+        window.window_day_vars = {day: tk.BooleanVar(master=self.root, value=day == "sun") for day in DAY_ORDER}
+        window.schedule_preview_label = SimpleNamespace(config=lambda **kwargs: None)
+        window.windows_listbox = _RecordingListbox()
+        window._populate_windows_list()
+        window.windows_listbox.operations.clear()
+        return window
+
+    def test_update_rewrites_only_the_selected_row(self):
+        window = self._build_window()
+        original = window.draft_windows[0]
+        window.windows_listbox.selection = (5,)
+
+        window._update_window()
+
+        self.assertEqual([("delete", 5, None), ("insert", 5, 1)], window.windows_listbox.operations)
+        self.assertEqual("Sun | 10:00-11:00", window.windows_listbox.rows[5])
+        self.assertIs(original, window.draft_windows[0])
+
+    def test_filter_maps_rows_back_to_draft_windows(self):
+        window = self._build_window(filter_text="sat")
+        self.assertTrue(all(label.startswith("Sat") for label in window.windows_listbox.rows))
+
+        window.windows_listbox.selection = (1,)
+        window._remove_window()
+
+        self.assertEqual(149, len(window.draft_windows))
+        self.assertNotIn("Sat | 12:00-12:30", window._draft_labels)
+        self.assertEqual([index for index, label in enumerate(window._draft_labels) if label.startswith("Sat")], window._visible_indexes)
+
+        window.windows_listbox.selection = (0,)
+        saved = window.build_schedule_windows_for_save()
+        self.assertEqual("10:00", saved[window._visible_indexes[0]].start)
+        self.assertIs(window.draft_windows[1], saved[1])
+
+
+class _PlaceholderStub:
+    def __init__(self, y):
+        self.y = y
+
+    def winfo_y(self):
+        return self.y
+
+
+class _CanvasStub:
+    def __init__(self, top, height):
+        self.top = top
+        self.height = height
+
+    def winfo_height(self):
+        return self.height
+
+    def canvasy(self, y):
+        return self.top + y
+
+
+class _TimerStub:
+    def __init__(self):
+        self.pending = {}
+        self.cancelled = []
+
+    def after(self, delay, callback):
+        job = "after#{0}".format(len(self.pending) + len(self.cancelled))
+        self.pending[job] = (delay, callback)
+        return job
+
+    def after_cancel(self, job):
+        self.cancelled.append(job)
+        del self.pending[job]
+
+
+class SettingsWindowReuseTests(unittest.TestCase):
+    def setUp(self):
+        self.root = tk.Tcl()
+
+    def test_reload_refreshes_bound_variables_from_current_config(self):
+        config = AppConfig(interval=90, schedule=ScheduleConfig(enabled=True, windows=[TimeWindow(start="08:00", end="12:00", days=["tue"])]))
+        app = SimpleNamespace(config=config, is_startup_enabled=lambda: True, now_provider=lambda: datetime(2026, 4, 9, 8, 0))
+        window = SettingsWindow(app)
+        window._create_variables(self.root)
+        window.schedule_preview_label = SimpleNamespace(config=lambda **kwargs: None)
+        window.windows_listbox = _RecordingListbox()
+        window._load_config_values()
+        window.window_filter_var.set("tue")
+        window.interval_var.set("15")
+
+        app.config = AppConfig(interval=120, schedule=ScheduleConfig(enabled=False, windows=[TimeWindow(start="18:00", end="20:00", days=["fri"])]))
+        window._load_config_values()
+
+        self.assertEqual("120", window.interval_var.get())
+        self.assertFalse(window.schedule_enabled_var.get())
+        self.assertEqual("", window.window_filter_var.get())
+        self.assertEqual(["Fri | 18:00-20:00"], window.windows_listbox.rows)
+        self.assertEqual("18:00", window.window_start_var.get())
+        self.assertTrue(window.window_day_vars["fri"].get())
+        self.assertFalse(window.window_day_vars["tue"].get())
+
+    def test_typing_in_the_event_filter_searches_once_after_the_last_keystroke(self):
+        app = SimpleNamespace(config=AppConfig(), is_startup_enabled=lambda: True, now_provider=lambda: datetime(2026, 4, 9, 8, 0))
+        window = SettingsWindow(app)
+        window._create_variables(self.root)
+        window.window = _TimerStub()
+        reloads = []
+        window._reload_events = lambda: reloads.append(window.event_filter_var.get())
+
+        for text in ("w", "wa", "warn"):
+            window.event_filter_var.set(text)
+        self.assertEqual([], reloads)
+        self.assertEqual(2, len(window.window.cancelled))
+        self.assertEqual(1, len(window.window.pending))
+
+        delay, callback = window.window.pending.popitem()[1]
+        callback()
+        self.assertEqual((300, ["warn"]), (delay, reloads))
+
+    def test_followed_events_are_capped_and_load_older_resumes_below_the_last_row(self):
+        with tempfile.TemporaryDirectory() as directory:
+            log_file = Path(directory) / "alive_forever.log"
+
+            def write(*numbers):
+                with open(log_file, "a", encoding="utf-8") as handle:
+                    handle.writelines("2026-04-09 10:00:00,000 | INFO | Event {0}\n".format(number) for number in numbers)
+
+            write(1, 2, 3, 4, 5)
+            window = SettingsWindow(SimpleNamespace())
+            window._create_variables(self.root)
+            window.EVENT_BATCH_SIZE, window.EVENT_LIST_LIMIT = 2, 3
+            window.events_listbox = _RecordingListbox()
+            window.older_events_btn = SimpleNamespace(config=lambda **kwargs: None)
+            window._log_reader = LogReader(log_file)
+            window._reload_events()
+
+            write(6, 7)
+            window._poll_events()
+            self.assertEqual(["Event 7", "Event 6", "Event 5"], [row.split(" | ")[2] for row in window.events_listbox.rows])
+
+            window._load_older_events()
+            self.assertEqual(["Event 7", "Event 6", "Event 5", "Event 4", "Event 3"], [row.split(" | ")[2] for row in window.events_listbox.rows])
+
+    def test_cards_are_built_one_at_a_time_as_they_scroll_into_view(self):
+        window = SettingsWindow(SimpleNamespace())
+        built = []
+        window._content_canvas = _CanvasStub(top=0, height=600)
+        window._pending_sections = [
+            (_PlaceholderStub(500), lambda parent: built.append("schedule")),
+            (_PlaceholderStub(1400), lambda parent: built.append("events")),
+        ]
+
+        window._build_visible_sections()
+        window._build_visible_sections()
+        self.assertEqual(["schedule"], built)
+
+        window._content_canvas.top = 800
+        window._build_visible_sections()
+        self.assertEqual(["schedule", "events"], built)
+        self.assertEqual([], window._pending_sections)
+
+
+class _RecordingCanvas:
+    def __init__(self):
+        self.deleted = []
+
+    def delete(self, tag):
+        self.deleted.append(tag)
+
+    def create_text(self, *args, **kwargs):
+        return 1
+
+    create_line = create_rectangle = create_text
+
+    def find_withtag(self, tag):
+        return ()
+
+    def coords(self, *args):
+        return None
+
+    def tag_raise(self, tag):
+        return None
+
+
+class SettingsWindowTimelineTests(unittest.TestCase):
+    def test_editing_one_window_redraws_only_its_day_rows(self):
+        now = datetime(2026, 4, 9, 8, 0)
+        window = SettingsWindow(SimpleNamespace(now_provider=lambda: now))
+        window.timeline_canvas = _RecordingCanvas()
+        workday = TimeWindow(start="09:00", end="17:00", days=["mon", "tue", "wed", "thu", "fri"])
+        window._update_timeline(ScheduleConfig(enabled=True, windows=[workday]), now)
+        self.assertEqual(["row{0}".format(row) for row in range(7)] + ["transition"], window.timeline_canvas.deleted)
+
+        window.timeline_canvas.deleted.clear()
+        late_friday = TimeWindow(start="22:00", end="02:00", days=["fri"])
+        window._update_timeline(ScheduleConfig(enabled=True, windows=[workday, late_friday]), now)
+
+        self.assertEqual(["row1", "row2", "transition"], window.timeline_canvas.deleted)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,177 @@
+import unittest
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from alive_forever.app import KeepAliveApp
+from alive_forever.core.clock import ClockJump, ClockJumpDetector
+from alive_forever.core.config import AppConfig, RuntimeStats
+from alive_forever.core.scheduler import ScheduleConfig, TimeWindow
+from alive_forever.core.simulation import AppSimulator, FakeInputBackend, SimulatedClock, create_quiet_logger
+
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri"]
+
+
+class AppSimulatorTests(unittest.TestCase):
+    def _build_app(self, start, schedule=None, interval=60, stats=None):
+        clock = SimulatedClock(start)
+        config = AppConfig(interval=interval, schedule=schedule or ScheduleConfig.default())
+        app = KeepAliveApp(
+            config=config,
+            clock=clock,
+            input_backend=FakeInputBackend(clock),
+            logger=create_quiet_logger(),
+            stats=stats,
+        )
+        return app, clock
+
+    def test_full_workweek_runs_with_exact_activity_timestamps(self):
+        schedule = ScheduleConfig(enabled=True, windows=[TimeWindow(start="09:00", end="17:00", days=WEEKDAYS)])
+        app, clock = self._build_app(datetime(2026, 4, 6, 0, 0), schedule=schedule)
+
+        simulator = AppSimulator(app).run_for(7 * 24 * 3600)
+
+        events = app.input_backend.events
+        self.assertEqual(5 * 8 * 60, len(events))
+        self.assertEqual(datetime(2026, 4, 6, 9, 0), events[0][0])
+        self.assertEqual(datetime(2026, 4, 6, 9, 1), events[1][0])
+        self.assertEqual(datetime(2026, 4, 10, 16, 59), events[-1][0])
+        self.assertEqual(datetime(2026, 4, 13, 0, 0), clock.now())
+        self.assertEqual(
+            [
+                (datetime(2026, 4, 6, 0, 0), "scheduled_off"),
+                (datetime(2026, 4, 6, 9, 0), "active"),
+                (datetime(2026, 4, 6, 17, 0), "scheduled_off"),
+            ],
+            simulator.transitions[:3],
+        )
+        self.assertEqual(11, len(simulator.transitions))
+
+    def test_manual_pause_stops_activity_until_resumed(self):
+        app, clock = self._build_app(datetime(2026, 4, 6, 9, 0), interval=30)
+        simulator = AppSimulator(app).run_for(300)
+        self.assertEqual(11, len(app.input_backend.events))
+
+        app.toggle_state()
+        simulator.run_for(600)
+        self.assertEqual(11, len(app.input_backend.events))
+
+        app.toggle_state()
+        simulator.run_for(60)
+
+        self.assertEqual(["active", "manual_paused", "active"], [state for _, state in simulator.transitions])
+        self.assertEqual(datetime(2026, 4, 6, 9, 15), app.input_backend.events[11][0])
+        self.assertEqual(14, len(app.input_backend.events))
+
+    def test_timed_pause_expires_on_its_deadline_and_survives_a_restart(self):
+        app, clock = self._build_app(datetime(2026, 4, 6, 10, 0))
+        saved = []
+        app.save_config = lambda: saved.append(app.stats.to_dict())
+        simulator = AppSimulator(app).run_for(120)
+
+        app.pause_for(30)
+        simulator.run_for(600)
+        self.assertEqual(3, len(app.input_backend.events))
+        self.assertEqual("Alive Forever - Paused (20 min left)", app.get_tray_title())
+        self.assertEqual("Presence activity resumes at Mon 10:32.", app.get_status_presentation()[2])
+
+        restarted, _ = self._build_app(datetime(2026, 4, 6, 10, 12), stats=RuntimeStats.from_raw(saved[-1]))
+        restarted.save_config = lambda: saved.append(restarted.stats.to_dict())
+        self.assertEqual("manual_paused", restarted.get_runtime_state())
+
+        restarted_simulator = AppSimulator(restarted).run_until(datetime(2026, 4, 6, 10, 33))
+        self.assertEqual([datetime(2026, 4, 6, 10, 32), datetime(2026, 4, 6, 10, 33)], [moment for moment, _ in restarted.input_backend.events])
+        self.assertEqual(["manual_paused", "active"], [state for _, state in restarted_simulator.transitions])
+        self.assertIsNone(saved[-1]["pause_until"])
+
+    def test_pause_until_next_transition_and_clock_time(self):
+        schedule = ScheduleConfig(enabled=True, windows=[TimeWindow(start="09:00", end="17:00", days=WEEKDAYS)])
+        app, clock = self._build_app(datetime(2026, 4, 6, 15, 0), schedule=schedule)
+        app.save_config = lambda: None
+
+        self.assertTrue(app.pause_until_next_transition())
+        self.assertEqual(7200, app.pause_seconds_remaining())
+        app.pause_until_clock_time("08:30")
+        self.assertEqual("Paused (17 h 30 min left)", app.get_status_presentation()[0])
+        app.toggle_state()
+        self.assertEqual(("active", None), (app.get_runtime_state(), app.stats.pause_until))
+
+    def test_spring_forward_week_keeps_exact_cadence_in_office_time_zone(self):
+        zone = ZoneInfo("America/New_York")
+        schedule = ScheduleConfig(enabled=True, windows=[TimeWindow(start="01:00", end="04:00")], timezone="America/New_York")
+        app, clock = self._build_app(datetime(2026, 3, 7, 0, 0, tzinfo=zone), schedule=schedule)
+
+        AppSimulator(app).run_until(datetime(2026, 3, 9, 0, 0, tzinfo=zone))
+
+        events = [moment for moment, _ in app.input_backend.events]
+        sunday = [moment for moment in events if moment.day == 8]
+        self.assertEqual(180, len(events) - len(sunday))
+        self.assertEqual(120, len(sunday))
+        self.assertEqual(datetime(2026, 3, 8, 3, 59, tzinfo=zone), sunday[-1])
+        instants = [moment.astimezone(timezone.utc) for moment in sunday]
+        self.assertTrue(all(later - earlier == timedelta(minutes=1) for earlier, later in zip(instants, instants[1:])))
+
+    def test_resume_with_stopped_monotonic_clock_catches_up_per_policy(self):
+        app, clock = self._build_app(datetime(2026, 4, 6, 10, 0), interval=300)
+        simulator = AppSimulator(app).run_for(60)
+        clock.jump(3600)
+        simulator.run_for(0)
+
+        self.assertEqual([datetime(2026, 4, 6, 10, 0), datetime(2026, 4, 6, 11, 1)], [moment for moment, _ in app.input_backend.events])
+        self.assertEqual(ClockJump("wall", 3600.0), app.last_clock_jump[0])
+
+        app, clock = self._build_app(datetime(2026, 4, 6, 10, 0), interval=300)
+        app.config = replace(app.config, resume_catch_up="After One Interval")
+        simulator = AppSimulator(app).run_for(60)
+        clock.jump(-1800)
+        simulator.run_for(0)
+        self.assertEqual(ClockJump("wall", -1800.0), app.last_clock_jump[0])
+        clock.jump(5400)
+        simulator.run_until(datetime(2026, 4, 6, 11, 5, 59))
+        self.assertEqual(1, len(app.input_backend.events))
+        simulator.run_for(1)
+        self.assertEqual(datetime(2026, 4, 6, 11, 6), app.input_backend.events[-1][0])
+
+    def test_overlapping_window_overrides_cadence_and_activity_type_while_active(self):
+        schedule = ScheduleConfig(
+            enabled=True,
+            windows=[
+                TimeWindow(start="09:00", end="17:00", days=WEEKDAYS),
+                TimeWindow(start="10:00", end="11:00", days=WEEKDAYS, interval=30, activity_type="Mouse Jiggle"),
+            ],
+        )
+        self.assertEqual(schedule, ScheduleConfig.from_raw(schedule.to_dict()))
+        app, clock = self._build_app(datetime(2026, 4, 6, 9, 0), schedule=schedule, interval=300)
+
+        AppSimulator(app).run_until(datetime(2026, 4, 6, 12, 0))
+
+        events = app.input_backend.events
+        jiggles = [moment for moment, activity_type in events if activity_type == "Mouse Jiggle"]
+        self.assertEqual(12 + 120 + 13, len(events))
+        self.assertEqual((datetime(2026, 4, 6, 10, 0), datetime(2026, 4, 6, 10, 59, 30), 120), (jiggles[0], jiggles[-1], len(jiggles)))
+        self.assertEqual([datetime(2026, 4, 6, 11, 0), datetime(2026, 4, 6, 11, 5)], [moment for moment, _ in events[132:134]])
+        self.assertEqual((300, "F15 Key (Recommended)", datetime(2026, 4, 6, 17, 0)), app.effective_cadence())
+
+        # Setting the wall clock back out of the override must not reuse the cached 30 s cadence.
+        app, clock = self._build_app(datetime(2026, 4, 6, 10, 30), schedule=schedule, interval=300)
+        self.assertEqual(30, app.effective_cadence()[0])
+        clock.jump(-3600)
+        self.assertEqual((300, "F15 Key (Recommended)", datetime(2026, 4, 6, 10, 0)), app.effective_cadence())
+
+    def test_detector_reports_suspend_when_the_loop_overslept(self):
+        clock = SimulatedClock(datetime(2026, 4, 6, 10, 0))
+        detector = ClockJumpDetector(clock)
+        detector.reset()
+
+        clock.advance(3)
+        self.assertIsNone(detector.check(expected_elapsed=1))
+        clock.advance(600)
+        self.assertEqual(ClockJump("suspend", 599.0), detector.check(expected_elapsed=1))
+        clock.advance(1)
+        clock.jump(2)
+        self.assertIsNone(detector.check(expected_elapsed=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+from benchmarks.soak import BucketTrend, SoakThresholds, evaluate_trends, run_accelerated, summarize_buckets
+
+
+class SoakHarnessTests(unittest.TestCase):
+    def test_accelerated_workday_soak_reports_hourly_buckets_and_passes(self):
+        samples = run_accelerated(12 * 3600, 3600)
+        trends = summarize_buckets(samples, 3600)
+
+        self.assertEqual(12, len(trends))
+        self.assertEqual([0] * 8 + [1, 60, 60, 59], [trend.activities for trend in trends])
+        self.assertEqual([], evaluate_trends(trends, SoakThresholds(max_rss_growth_mb_per_hour=50), 3600))
+
+    def test_growth_and_idle_wakeup_creep_fail_the_soak(self):
+        trends = [
+            BucketTrend(index, 0.01, (30 + index * 4) * 1024 * 1024, 3 + index // 2, 10, 60 + index * 20, 60)
+            for index in range(5)
+        ]
+
+        failures = evaluate_trends(trends, SoakThresholds(), 3600)
+
+        self.assertEqual(3, len(failures))
+        self.assertTrue(failures[0].startswith("RSS grew 4.00 MB/hour"))
+        self.assertEqual("Thread count grew from 3 to 5", failures[1])
+        self.assertEqual("Idle wakeups per bucket crept from 20 to 60", failures[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
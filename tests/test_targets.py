@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from alive_forever.app import KeepAliveApp
+from alive_forever.core.config import AppConfig, config_from_raw
+from alive_forever.core.simulation import AppSimulator, FakeInputBackend, FakeProcessTable, SimulatedClock, create_quiet_logger
+from alive_forever.core.targets import TargetProcessGate
+
+
+class TargetProcessTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = SimulatedClock(datetime(2026, 4, 9, 10, 0))
+
+    def test_app_waits_without_injecting_until_a_target_starts(self):
+        processes = FakeProcessTable(["explorer.exe"])
+        config = AppConfig(interval=60, target_processes=("ms-teams.exe", "Teams.exe"))
+        backend = FakeInputBackend(self.clock)
+        app = KeepAliveApp(config=config, clock=self.clock, input_backend=backend, logger=create_quiet_logger(), process_enumerator=processes)
+        simulator = AppSimulator(app)
+
+        simulator.run_for(600)
+        self.assertEqual([], backend.events)
+        self.assertEqual("no_target", app.get_runtime_state())
+        self.assertEqual("Waiting for Target", app.get_status_presentation()[0])
+        self.assertIs(app.get_icon_image("no_target"), simulator.tray.icon)
+        # One enumeration per TTL while waiting, not one per tick.
+        self.assertLessEqual(processes.calls, 600 // TargetProcessGate.TTL_SECONDS + 1)
+
+        processes.names.add("ms-teams")
+        simulator.run_for(TargetProcessGate.TTL_SECONDS)
+        self.assertEqual(1, len(backend.events))
+        self.assertEqual(["active", "no_target", "active"], [state for _, state in simulator.transitions])
+
+    def test_cached_answer_is_reused_between_activity_deadlines(self):
+        processes = FakeProcessTable(["Teams.exe"])
+        config = AppConfig(interval=10, target_processes=("teams",))
+        backend = FakeInputBackend(self.clock)
+        app = KeepAliveApp(config=config, clock=self.clock, input_backend=backend, logger=create_quiet_logger(), process_enumerator=processes)
+
+        AppSimulator(app).run_for(300)
+        self.assertEqual(31, len(backend.events))
+        self.assertEqual(11, processes.calls)
+        self.assertEqual(("ms-teams.exe", "Teams.exe"), config_from_raw({"target_processes": "ms-teams.exe, Teams.exe,"}).target_processes)
+        self.assertEqual((), config_from_raw({"target_processes": [1, 2]}).target_processes)
+
+    @unittest.skipIf(os.name == "nt", "/proc listing is POSIX only")
+    def test_proc_enumerator_reads_comm_and_falls_back_to_cmdline_for_long_names(self):
+        from alive_forever.system.posix import ProcProcessEnumerator
+
+        with tempfile.TemporaryDirectory() as directory:
+            for pid, comm, cmdline in (("1", "systemd\n", b"/sbin/init\0"), ("42", "teams-insiders-\n", b"/opt/teams/teams-insiders-linux\0--flag\0")):
+                (Path(directory) / pid).mkdir()
+                (Path(directory) / pid / "comm").write_text(comm)
+                (Path(directory) / pid / "cmdline").write_bytes(cmdline)
+            (Path(directory) / "self").mkdir()
+            (Path(directory) / "7").mkdir()
+
+            self.assertEqual({"systemd", "teams-insiders-linux"}, ProcProcessEnumerator(directory).process_names())
+        self.assertIsNone(ProcProcessEnumerator("/no/such/proc").process_names())
@@ -0,0 +1,141 @@
+import threading
+import unittest
+from datetime import datetime
+
+from alive_forever.app import KeepAliveApp
+from alive_forever.core.config import AppConfig
+from alive_forever.core.simulation import AppSimulator, FakeInputBackend, SimulatedClock, create_quiet_logger
+
+
+class ActivityWatchdogTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = SimulatedClock(datetime(2026, 4, 9, 10, 0))
+        self.app = KeepAliveApp(
+            config=AppConfig(),
+            clock=self.clock,
+            input_backend=FakeInputBackend(self.clock),
+            logger=create_quiet_logger(),
+        )
+        self.simulator = AppSimulator(self.app).run_for(120)
+        self.restarts = []
+        self.app.start_activity_thread = lambda: self.restarts.append(self.app.next_run)
+
+    def test_live_loop_with_fresh_heartbeat_is_left_alone(self):
+        self.app.thread = _AliveThread()
+
+        self.assertIsNone(self.app.watchdog.check())
+        self.assertEqual(0, self.app.watchdog.restart_count)
+
+    def test_dead_thread_is_restarted_with_preserved_deadline(self):
+        self.app.thread = threading.Thread(target=lambda: None)
+        next_run = self.app.next_run
+        self.clock.advance(12)
+
+        self.assertEqual("stopped", self.app.watchdog.check())
+        self.assertEqual([next_run], self.restarts)
+        self.assertEqual([12.0], self.app.watchdog.stall_durations)
+
+    def test_stalled_loop_is_restarted_and_surfaced_in_tray(self):
+        self.app.thread = _AliveThread()
+        self.clock.advance(10)
+        self.assertIsNone(self.app.watchdog.check())
+
+        self.clock.advance(45)
+        self.assertEqual("stalled", self.app.watchdog.check())
+
+        status_name, _, detail = self.app.get_status_presentation()
+        self.assertEqual(1, self.app.watchdog.restart_count)
+        self.assertEqual(55.0, self.app.watchdog.longest_stall)
+        self.assertEqual("Active (Recovered)", status_name)
+        self.assertIn("Recovered from a stalled activity loop at 10:02 after 55 seconds", detail)
+        self.clock.advance(self.app.notifier.COALESCE_SECONDS)
+        self.assertEqual(1, self.app.notifier.deliver_due())
+        self.assertEqual(("Activity Recovered", "The activity loop stalled for 55 seconds and was restarted."), self.simulator.tray.notifications[-1])
+
+    def test_giving_up_enters_a_failed_state_with_one_notification(self):
+        self.app.thread = _AliveThread()
+        for _ in range(self.app.watchdog.MAX_CONSECUTIVE_RESTARTS + 3):
+            self.clock.advance(3600)
+            self.app.watchdog.check()
+        for _ in range(self.app.watchdog.MAX_CONSECUTIVE_RESTARTS + 1):
+            self.clock.advance(self.app.notifier.MIN_GAP_SECONDS)
+            self.app.notifier.deliver_due()
+
+        status_name, _, detail = self.app.get_status_presentation()
+        self.assertTrue(self.app.watchdog.gave_up)
+        self.assertEqual(("loop_failed", "Activity Stopped"), (self.app.get_runtime_state(), status_name))
+        self.assertIn("4 restarts did not help", detail)
+        self.assertEqual(1, sum(title == "Activity Stopped" for title, _ in self.simulator.tray.notifications))
+
+        self.app.heartbeat()
+        self.clock.advance(self.app.watchdog.tolerance_seconds)
+        self.app.heartbeat()
+        self.clock.advance(1)
+        self.assertIsNone(self.app.watchdog.check())
+        self.assertEqual("active", self.app.get_runtime_state())
+
+    def test_a_dead_loop_thread_shows_as_stopped_until_restarted(self):
+        self.app.thread = threading.Thread(target=lambda: None)
+        self.app.thread.start()
+        self.app.thread.join()
+
+        self.assertEqual("Activity Stopped", self.app.get_status_presentation()[0])
+        self.app.shutdown_event.set()
+        self.assertNotEqual("loop_failed", self.app.get_runtime_state())
+
+
+class StalledReplacementTests(unittest.TestCase):
+    def test_a_tick_that_stays_blocked_spawns_a_bounded_number_of_loops(self):
+        backend = _HangingInputBackend()
+        app = KeepAliveApp(config=AppConfig(interval=10, notifications_enabled=False), input_backend=backend, logger=create_quiet_logger())
+        watchdog = app.watchdog
+        app.start_activity_thread()
+        threads_before = threading.active_count()
+        try:
+            self.assertTrue(backend.entered.wait(5))
+            now = app.last_heartbeat + 60
+            self.assertEqual("stalled", watchdog.check(now_monotonic=now))
+            self.assertTrue(backend.wait_for_calls(2))
+
+            # The replacement hangs as well; it gets twice the tolerance before the next restart.
+            self.assertIsNone(watchdog.check(now_monotonic=app.last_heartbeat + 45))
+            for _ in range(20):
+                now += 3600
+                watchdog.check(now_monotonic=now)
+
+            self.assertEqual(watchdog.MAX_CONSECUTIVE_RESTARTS, watchdog.restart_count)
+            self.assertTrue(watchdog.gave_up)
+            self.assertEqual(threads_before + watchdog.MAX_CONSECUTIVE_RESTARTS, threading.active_count())
+        finally:
+            backend.release.set()
+            app.shutdown_event.set()
+
+
+class _HangingInputBackend:
+    """Hangs in every ``send_activity`` until released."""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+        self._condition = threading.Condition()
+
+    def send_activity(self, activity_type):
+        with self._condition:
+            self.calls += 1
+            self._condition.notify_all()
+        self.entered.set()
+        self.release.wait(10)
+
+    def wait_for_calls(self, count):
+        with self._condition:
+            return self._condition.wait_for(lambda: self.calls >= count, 5)
+
+
+class _AliveThread:
+    def is_alive(self):
+        return True
+
+
+if __name__ == "__main__":
+    unittest.main()